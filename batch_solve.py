@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# 여러 출전 금지 시나리오를 Streamlit 없이 병렬로 푸는 배치 실행기
+#
+#   python batch_solve.py scenarios.jsonl --processes 2 --output results.jsonl
+#
+# 입력: JSON 배열 또는 JSON Lines. 시나리오 하나는
+#   {"id": "day1-no-T1", "banned_players_by_day": {"1": ["인섹"]}, "time_limit_seconds": 30,
+#    "model_mode": "boolean", "symmetry_breaking": false, "player_data": {...}, "games_per_day": [4, 3, 3]}
+# 형태이고 ("rolling_window_days": N 이 있으면 롤링 호라이즌으로 풂 ("relax_c5": true 면 (C5) 를 벌점으로 완화, 위반은 violations), "stop_criteria": {"no_improvement_seconds": 20, ...} 로 조기 종료,
+# "solver_params": {"linearization_level": 2, ...} 로 CP-SAT 파라미터 지정 - 없으면 튜닝 프로필, "num_alternatives": 3 으로 대안 스케줄
+# (+ "alternative_tolerance", "alternative_min_distance"), "engine": "local_search" 면 NumPy 담금질 (+ "num_processes", "seed"), "diagnose_infeasible": false 면 INFEASIBLE 원인 진단 생략,
+# "roster": "roster.csv" 면 player_data 대신 명단 파일 (JSON / CSV / Parquet, schedule_roster 형식)) id 와 banned_players_by_day 외에는 생략 가능 (선수는 이름, 별명 또는 "별명(이름)" 표시 이름).
+# 출력: 끝난 순서대로 한 줄에 결과 하나씩 JSON Lines 로 기록.
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import schedule_config as config
+import schedule_solver as solver_core
+from schedule_cache import ScheduleCache
+from schedule_rolling import solve_schedule_rolling
+from schedule_local_search import solve_schedule_local_search
+from schedule_roster import load_roster_file
+
+
+def load_scenarios(path):
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        scenarios = json.loads(text)
+    else:
+        scenarios = [json.loads(line) for line in text.splitlines() if line.strip()]
+    for i, scenario in enumerate(scenarios):
+        scenario.setdefault('id', str(i + 1))
+        scenario.setdefault('banned_players_by_day', {})
+    return scenarios
+
+
+def run_scenario(scenario, default_time_limit, num_workers, cache_dir, include_log):
+    # 프로세스 풀 워커에서 실행. 예외도 결과 한 줄로 돌려줌
+    started_at = time.time()
+    row = {'id': scenario['id']}
+    try:
+        if 'roster' in scenario: p_data = load_roster_file(scenario['roster'])
+        elif 'player_data' in scenario: p_data = config.normalize_player_data(scenario['player_data'])
+        else: p_data = config.player_data
+        positions = list(p_data)
+        common = dict(positions=positions, player_data=p_data,
+                      num_teams_per_game=config.num_teams_per_game, players_per_team=len(positions),
+                      banned_players_by_day=scenario['banned_players_by_day'],
+                      time_limit_seconds=scenario.get('time_limit_seconds', default_time_limit),
+                      num_workers=num_workers, games_per_day=scenario.get('games_per_day', config.GAMES_PER_DAY))
+        if 'rolling_window_days' in scenario:
+            result = solve_schedule_rolling(**common, window_days=scenario['rolling_window_days'], relax_c5=scenario.get('relax_c5', False))
+        elif scenario.get('engine', config.ENGINE_CP_SAT) == config.ENGINE_LOCAL_SEARCH:
+            common.pop('num_workers')
+            result = solve_schedule_local_search(**common, symmetry_breaking=scenario.get('symmetry_breaking', False),
+                                                 num_processes=scenario.get('num_processes', 1), seed=scenario.get('seed', 0))
+        else:
+            result = solver_core.solve_schedule(
+                **common,
+                model_mode=scenario.get('model_mode', config.DEFAULT_MODEL_MODE),
+                symmetry_breaking=scenario.get('symmetry_breaking', False),
+                stop_criteria=config.StopCriteria.from_dict(scenario.get('stop_criteria')),
+                solver_params=scenario.get('solver_params'),
+                use_heuristic=scenario.get('use_heuristic', True),
+                num_alternatives=scenario.get('num_alternatives', 1),
+                alternative_tolerance=scenario.get('alternative_tolerance', config.ALTERNATIVE_TOLERANCE),
+                alternative_min_distance=scenario.get('alternative_min_distance', config.ALTERNATIVE_MIN_DISTANCE),
+                diagnose_infeasible=scenario.get('diagnose_infeasible', True),
+                cache=ScheduleCache(cache_dir) if cache_dir else None)
+        row.update(result.to_dict(include_log=include_log))
+    except Exception as e:
+        row.update({'status': 'ERROR', 'error': f"{type(e).__name__}: {e}"})
+    row['num_workers'] = num_workers
+    row['elapsed'] = round(time.time() - started_at, 3)
+    return row
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="출전 금지 시나리오 배치 해 찾기")
+    parser.add_argument('scenarios', help="시나리오 JSON / JSON Lines 파일")
+    parser.add_argument('--processes', type=int, default=None, help="동시에 푸는 시나리오 수 (기본: 코어 수)")
+    parser.add_argument('--workers', type=int, default=None, help="시나리오당 CP-SAT 워커 수 (기본: 코어 수 / 프로세스 수)")
+    parser.add_argument('--time-limit', type=float, default=30, help="시나리오에 time_limit_seconds 가 없을 때 사용")
+    parser.add_argument('--cache-dir', default=None, help="지정하면 스케줄 캐시(SQLite) 사용")
+    parser.add_argument('--include-log', action='store_true', help="결과에 구조화된 실행 로그 포함")
+    parser.add_argument('--output', help="결과 JSON Lines 파일 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    scenarios = load_scenarios(args.scenarios)
+    cores = config.available_cores()
+    processes = max(1, min(args.processes or cores, len(scenarios) or 1))
+    num_workers = args.workers or max(1, cores // processes)
+    print(f"[배치] 시나리오 {len(scenarios)}개 | 코어 {cores}개 | 프로세스 {processes}개 x 워커 {num_workers}개",
+          file=sys.stderr, flush=True)
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [pool.submit(run_scenario, scenario, args.time_limit, num_workers, args.cache_dir, args.include_log)
+                       for scenario in scenarios]
+            for future in as_completed(futures):
+                row = future.result()
+                out.write(json.dumps(row, ensure_ascii=False) + "\n"); out.flush()
+                print(f"[배치] {row['id']}: {row['status']} (목표 값 {row.get('objective')}, {row['elapsed']}초)",
+                      file=sys.stderr, flush=True)
+    finally:
+        if out is not sys.stdout: out.close()
+
+
+if __name__ == '__main__':
+    main()
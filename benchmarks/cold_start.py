@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# 콜드 스타트 회귀 측정: 매번 새 파이썬 프로세스에서
+#   render       - Streamlit 앱 첫 화면 (AppTest) 시간 + 그때 불러온 무거운 모듈
+#   import       - import schedule_solver (OR-Tools/pandas/numpy 포함)
+#   cold         - 프로세스 시작 직후 solve_schedule 첫 개선 해까지 (import 포함, 예열 없음)
+#   warm_thread  - schedule_solver.warm_up() 뒤 같은 프로세스에서 첫 개선 해까지 (스레드 대기열 + prewarm 과 같은 상태)
+#   warm_process - 예열된 작업 프로세스(SolverWorker)에 보낸 해 찾기의 첫 개선 해까지
+#                  (heavy_modules = 해 찾기 전 부모 프로세스가 불러온 모듈. 결과 SolveResult 를 받을 때 schedule_solver 를 import)
+# 를 --repeats 번 재서 중앙값을 낸다.
+#
+#   python benchmarks/cold_start.py --json cold_start.json
+#   python benchmarks/cold_start.py --baseline cold_start.json --tolerance 0.25   # 기준보다 25% 넘게 느리면 종료 코드 1
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+HEAVY_MODULES = ('ortools.sat.python.cp_model', 'pandas', 'numpy', 'pyarrow', 'schedule_solver')
+PROBES = ('render', 'import', 'cold', 'warm_thread', 'warm_process')
+
+
+def solve_kwargs(time_limit):
+    import schedule_config as config
+    return dict(positions=config.positions, player_data=config.player_data, num_teams_per_game=config.num_teams_per_game,
+                players_per_team=config.players_per_team, banned_players_by_day={}, time_limit_seconds=time_limit,
+                templates=False, cache=None)
+
+
+def first_incumbent_seconds(run, control):
+    # run(control) 을 스레드에서 실행하고 control 에 첫 개선 해가 올라온 시점까지의 초
+    import threading
+    started = time.perf_counter(); first = []
+    thread = threading.Thread(target=run, args=(control,), daemon=True); thread.start()
+    while thread.is_alive() and not first:
+        if control.snapshot()[1] is not None: first.append(time.perf_counter() - started)
+        time.sleep(0.005)
+    control.stop(); thread.join()
+    return first[0] if first else None
+
+
+def probe(name, time_limit):
+    # 자식 프로세스에서 실행: 측정값 dict
+    if name == 'render':
+        from streamlit.testing.v1 import AppTest # streamlit 자체 import 는 제외 (서버는 앱보다 먼저 뜸)
+        started = time.perf_counter()
+        os.environ.setdefault('SCHEDULE_PREWARM', '0') # 예열 스레드와 CPU 를 나누지 않게 (첫 화면 자체만 측정)
+        at = AppTest.from_file(os.path.join(ROOT, 'schedule_app.py'), default_timeout=120).run()
+        return {'seconds': time.perf_counter() - started, 'exceptions': len(at.exception),
+                'heavy_modules': [m for m in HEAVY_MODULES if m in sys.modules]}
+    started = time.perf_counter()
+    from schedule_config import SolveControl
+    if name == 'warm_process':
+        from schedule_worker import SolverWorker
+        worker = SolverWorker(); worker.wait_ready()
+        warm_seconds = time.perf_counter() - started; heavy_modules = [m for m in HEAVY_MODULES if m in sys.modules]
+        seconds = first_incumbent_seconds(lambda control: worker.run('schedule_solver:solve_schedule', solve_kwargs(time_limit), control),
+                                          SolveControl())
+        worker.close()
+        return {'seconds': seconds, 'warm_up_seconds': warm_seconds, 'heavy_modules': heavy_modules}
+    import schedule_solver
+    if name == 'import': return {'seconds': time.perf_counter() - started}
+    warm_seconds = schedule_solver.warm_up() if name == 'warm_thread' else 0.0
+    import_seconds = time.perf_counter() - started - warm_seconds
+    seconds = first_incumbent_seconds(lambda control: schedule_solver.solve_schedule(**solve_kwargs(time_limit), control=control),
+                                      SolveControl())
+    if name == 'cold' and seconds is not None: seconds += import_seconds # 프로세스 시작 직후 버튼을 누른 경우 (import 포함)
+    return {'seconds': seconds, 'warm_up_seconds': warm_seconds}
+
+
+def run_probe(name, time_limit):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), '--probe', name, '--time-limit', str(time_limit)],
+                         capture_output=True, text=True, cwd=ROOT, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="콜드 스타트 회귀 측정 (첫 화면 / import / 첫 개선 해)")
+    parser.add_argument('--probes', nargs='+', default=list(PROBES), choices=PROBES)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--time-limit', type=float, default=10)
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument('--baseline', help="비교할 이전 --json 결과")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="기준 대비 허용 증가 비율")
+    parser.add_argument('--probe', choices=PROBES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.probe:
+        print(json.dumps(probe(args.probe, args.time_limit)))
+        return 0
+    report = {}
+    print(f"{'probe':<13} {'median':>8} {'min':>8} {'max':>8}  note")
+    for name in args.probes:
+        runs = [run_probe(name, args.time_limit) for _ in range(args.repeats)]
+        seconds = [run['seconds'] for run in runs if run['seconds'] is not None]
+        row = {'median': round(statistics.median(seconds), 3), 'min': round(min(seconds), 3), 'max': round(max(seconds), 3)} if seconds else \
+              {'median': None, 'min': None, 'max': None}
+        if 'heavy_modules' in runs[-1]: row['heavy_modules'] = runs[-1]['heavy_modules']
+        if 'warm_up_seconds' in runs[-1]: row['warm_up_seconds'] = round(statistics.median(run['warm_up_seconds'] for run in runs), 3)
+        report[name] = row
+        note = f"무거운 모듈: {', '.join(row['heavy_modules']) or '없음'}" if 'heavy_modules' in row else \
+               (f"예열 {row['warm_up_seconds']:.3f}s" if row.get('warm_up_seconds') else "")
+        print(f"{name:<13} {str(row['median']):>8} {str(row['min']):>8} {str(row['max']):>8}  {note}", flush=True)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f: baseline = json.load(f)
+        regressions = [f"{name}: {baseline[name]['median']}s -> {row['median']}s" for name, row in report.items()
+                       if baseline.get(name, {}).get('median') and row['median'] is not None
+                       and row['median'] > baseline[name]['median'] * (1 + args.tolerance)]
+        for line in regressions: print(f"[회귀] {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# 벤치마크용 합성 토너먼트 인스턴스 생성기
+#
+# 포지션 수, 포지션당 선수 수, 1티어 수, 날짜별 게임 수, 출전 금지 밀도를 바꿔 가며
+# schedule_solver.solve_schedule / build_schedule_model 에 그대로 넣을 수 있는 입력을 만든다.
+# 1티어는 순위 1 인 선수이므로 포지션당 최대 1명: 앞쪽 tier1_count 개 포지션만 순위 1 을 가진다.
+import numpy as np
+
+BASE_POSITIONS = ['T', 'J', 'M', 'A', 'S']
+
+
+def make_positions(num_positions):
+    return BASE_POSITIONS[:num_positions] + [f'P{i + 1}' for i in range(len(BASE_POSITIONS), num_positions)]
+
+
+def generate_instance(num_positions=5, players_per_position=5, tier1_count=None, games_per_day=(4, 3, 3),
+                      ban_density=0.0, seed=0, name=None):
+    # ban_density: (비1티어 선수, 날짜) 조합 중 출전 금지로 뽑을 비율. 1티어는 금지하지 않음 (C3 가 바로 불가능해지므로)
+    tier1_count = num_positions if tier1_count is None else tier1_count
+    if not 0 <= tier1_count <= num_positions:
+        raise ValueError(f"1티어 수는 0~{num_positions} 이어야 합니다: {tier1_count}")
+    rng = np.random.default_rng(seed)
+    positions = make_positions(num_positions)
+    player_data = {}
+    for pos_idx, pos in enumerate(positions):
+        first_rank = 1 if pos_idx < tier1_count else 2
+        player_data[pos] = {rank: (f'{pos}{rank}선수', f'{pos}{rank}')
+                            for rank in range(first_rank, first_rank + players_per_position)}
+
+    num_days = len(games_per_day)
+    candidates = [(alias, name) for ranks in player_data.values() for rank, (alias, name) in ranks.items() if rank != 1]
+    banned_players_by_day = {}
+    num_bans = int(round(ban_density * len(candidates) * num_days))
+    if num_bans:
+        for flat in sorted(rng.choice(len(candidates) * num_days, size=num_bans, replace=False).tolist()):
+            day_idx, cand_idx = divmod(flat, len(candidates))
+            alias, p_name = candidates[cand_idx]
+            banned_players_by_day.setdefault(day_idx + 1, set()).add(f"{alias}({p_name})")
+
+    return {
+        'name': name or f"pos{num_positions}x{players_per_position}-t1{tier1_count}-g{'_'.join(map(str, games_per_day))}-ban{ban_density:g}-s{seed}",
+        'params': {'num_positions': num_positions, 'players_per_position': players_per_position, 'tier1_count': tier1_count,
+                   'games_per_day': list(games_per_day), 'ban_density': ban_density, 'seed': seed},
+        'positions': positions, 'player_data': player_data, 'games_per_day': list(games_per_day),
+        'banned_players_by_day': banned_players_by_day,
+    }
+
+
+# 기본 스위트: 현재 운영 인스턴스 + 규모/1티어/출전 금지 밀도를 하나씩 바꾼 변형
+SUITES = {
+    'quick': [
+        dict(name='small-4x4', num_positions=4, players_per_position=4, games_per_day=(2, 2, 2)),
+        dict(name='default', num_positions=5, players_per_position=5, games_per_day=(4, 3, 3)),
+    ],
+    'default': [
+        dict(name='small-4x4', num_positions=4, players_per_position=4, games_per_day=(2, 2, 2)),
+        dict(name='default', num_positions=5, players_per_position=5, games_per_day=(4, 3, 3)),
+        dict(name='default-ban5', num_positions=5, players_per_position=5, games_per_day=(4, 3, 3), ban_density=0.05),
+        dict(name='default-ban10', num_positions=5, players_per_position=5, games_per_day=(4, 3, 3), ban_density=0.10),
+        dict(name='tier1-4', num_positions=5, players_per_position=5, tier1_count=4, games_per_day=(4, 3, 3)),
+        dict(name='two-days', num_positions=5, players_per_position=5, games_per_day=(5, 5)),
+        dict(name='large-6x5', num_positions=6, players_per_position=5, games_per_day=(5, 5, 5)),
+    ],
+    # 다주 이벤트 규모 (30명 / 30게임 / 10일): 롤링 호라이즌 비교용. 포지션당 비1티어 5명 -> 같은 포지션 쌍 15개를
+    # 비1티어끼리 맞붙는 게임 18개 + 1티어 출전 12게임 안에 모두 채울 수 있어 (C5) 를 만족하는 인스턴스
+    # (포지션당 8명이면 비1티어 쌍 21개 > 비1티어 게임 18개라 (C5) 자체가 불가능). 금지 비율 5% 부터는 시드에 따라
+    # 롤링의 1티어 계획 아래에서 (C5) 를 못 지키는 경우가 생겨 2% 로 둠
+    'large': [
+        dict(name='event-5x6', num_positions=5, players_per_position=6, games_per_day=(3,) * 10),
+        dict(name='event-5x6-ban2', num_positions=5, players_per_position=6, games_per_day=(3,) * 10, ban_density=0.02),
+    ],
+}
+
+
+def get_suite(suite_name, seed=0):
+    return [generate_instance(seed=seed, **spec) for spec in SUITES[suite_name]]
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# 구조 모델 템플릿 전/후 모델 빌드 지연 비교
+#
+#   python benchmarks/model_templates.py --suite default --repeats 5 --json template_report.json
+#
+# 인스턴스 x 모델 모드 x 대칭 제거마다 build_schedule_model 을
+#   fresh  - 템플릿 없이 매번 새로 빌드 (기존 방식)
+#   first  - 빈 템플릿 캐시: 새로 빌드 + 템플릿 저장 (첫 실행)
+#   memory - 같은 프로세스의 반복 실행: 메모리 템플릿 복제 + 출전 금지 제약
+#   disk   - 새 프로세스를 흉내 낸 빈 메모리 캐시 + 같은 디스크 폴더: 디스크 템플릿 읽기 + 출전 금지 제약
+# 으로 재고 (fresh / memory 는 --repeats 번의 중앙값), 템플릿으로 만든 모델이 새로 빌드한 모델과 proto 가 같은지도 확인한다.
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import schedule_config as config
+import schedule_solver as solver_core
+from schedule_templates import ModelTemplateCache
+from instances import SUITES, get_suite
+
+
+def timed_build(instance, model_mode, symmetry_breaking, templates):
+    start = time.perf_counter()
+    built = solver_core.build_schedule_model(
+        instance['positions'], instance['player_data'], config.num_teams_per_game, len(instance['positions']),
+        instance['banned_players_by_day'], model_mode=model_mode, symmetry_breaking=symmetry_breaking,
+        games_per_day=instance['games_per_day'], templates=templates)
+    return built, time.perf_counter() - start
+
+
+def proto_text(built):
+    model = built['model'].clone(); model.remove_all_names()
+    return str(model.Proto())
+
+
+def run_instance(instance, model_mode, symmetry_breaking, repeats, template_dir):
+    fresh_builds = [timed_build(instance, model_mode, symmetry_breaking, False) for _ in range(repeats)]
+    templates = ModelTemplateCache(template_dir)
+    first_built, first_seconds = timed_build(instance, model_mode, symmetry_breaking, templates)
+    memory_builds = [timed_build(instance, model_mode, symmetry_breaking, templates) for _ in range(repeats)]
+    time.sleep(1.0) # 백그라운드 디스크 저장 대기
+    disk_built, disk_seconds = timed_build(instance, model_mode, symmetry_breaking, ModelTemplateCache(template_dir))
+    reference = proto_text(fresh_builds[0][0])
+    return {
+        'instance': instance['name'], 'model_mode': model_mode, 'symmetry_breaking': symmetry_breaking,
+        'num_vars': first_built['num_vars'], 'num_constraints': first_built['num_constraints'],
+        'fresh_seconds': round(statistics.median(s for _, s in fresh_builds), 4), 'first_seconds': round(first_seconds, 4),
+        'memory_seconds': round(statistics.median(s for _, s in memory_builds), 4), 'disk_seconds': round(disk_seconds, 4),
+        'identical': proto_text(memory_builds[-1][0]) == reference and proto_text(disk_built) == reference,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="구조 모델 템플릿 전/후 빌드 지연 비교")
+    parser.add_argument('--suite', default='default', choices=list(SUITES))
+    parser.add_argument('--instances', nargs='+', help="이 이름의 인스턴스만 사용")
+    parser.add_argument('--model-modes', nargs='+', default=[config.DEFAULT_MODEL_MODE], choices=list(config.MODEL_MODE_LABELS))
+    parser.add_argument('--symmetry', choices=['off', 'on', 'both'], default='off')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    symmetry_options = {'off': [False], 'on': [True], 'both': [False, True]}[args.symmetry]
+    rows = []
+    print(f"{'instance':<16} {'mode':<8} {'sym':>4} {'vars':>7} {'fresh':>7} {'first':>7} {'memory':>7} {'disk':>7} {'x mem':>6} {'same':>5}")
+    with tempfile.TemporaryDirectory() as template_dir:
+        for instance in get_suite(args.suite):
+            if args.instances and instance['name'] not in args.instances: continue
+            for model_mode in args.model_modes:
+                for symmetry_breaking in symmetry_options:
+                    row = run_instance(instance, model_mode, symmetry_breaking, args.repeats, template_dir)
+                    rows.append(row)
+                    print(f"{row['instance']:<16} {model_mode:<8} {('on' if symmetry_breaking else 'off'):>4} {row['num_vars']:>7} "
+                          f"{row['fresh_seconds']:>7.3f} {row['first_seconds']:>7.3f} {row['memory_seconds']:>7.3f} {row['disk_seconds']:>7.3f} "
+                          f"{row['fresh_seconds'] / row['memory_seconds']:>6.1f} {str(row['identical']):>5}", flush=True)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# 동시 접속 부하: 세션 N 곳이 한꺼번에 "시작" 을 누를 때 직접 실행(기존 앱) vs 서버 대기열(schedule_queue) 비교
+#
+#   python benchmarks/solve_queue.py --sessions 6 --distinct 3 --time-limit 10 --json queue_report.json
+#
+# 세션 i 는 출전 금지 시나리오 i % distinct 를 요청 (distinct < sessions 이면 같은 요청이 겹침).
+#   direct - 세션마다 스레드에서 solve_schedule 을 바로 호출 (워커 수 자동, 같은 요청도 따로 풂)
+#   queue  - SolveScheduler 에 제출 (동시 실행/워커 한도 + 같은 요청 합치기)
+# 세션별 지연(제출 -> 결과), 전체 소요 시간, 0회 매치업 수, 실제로 실행된 해 찾기 수를 기록한다.
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import schedule_config as config
+import schedule_solver as solver_core
+from schedule_queue import SolveScheduler
+from instances import generate_instance
+
+
+def make_requests(sessions, distinct, time_limit, ban_density):
+    scenarios = [generate_instance(ban_density=ban_density, seed=i) for i in range(distinct)]
+    return [dict(positions=inst['positions'], player_data=inst['player_data'],
+                 num_teams_per_game=config.num_teams_per_game, players_per_team=len(inst['positions']),
+                 banned_players_by_day=inst['banned_players_by_day'], time_limit_seconds=time_limit,
+                 games_per_day=inst['games_per_day'], templates=False)
+            for inst in (scenarios[i % distinct] for i in range(sessions))]
+
+
+def run_direct(requests):
+    rows = [None] * len(requests)
+    def session(i):
+        start = time.perf_counter()
+        result = solver_core.solve_schedule(**requests[i])
+        rows[i] = {'latency': time.perf_counter() - start, 'objective': result.objective}
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(len(requests))]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    return rows, len(requests)
+
+
+def run_queue(requests, max_concurrent, max_workers):
+    scheduler = SolveScheduler(max_concurrent=max_concurrent, max_workers=max_workers)
+    tickets = [scheduler.submit(kwargs) for kwargs in requests]
+    rows = [None] * len(tickets)
+    while any(row is None for row in rows):
+        for i, ticket in enumerate(tickets):
+            if rows[i] is None and ticket.done():
+                rows[i] = {'latency': ticket.finished_at - ticket.submitted_at, 'objective': ticket.result.objective}
+        time.sleep(0.05)
+    stats = scheduler.stats()
+    return rows, stats['submitted'] - stats['merged']
+
+
+def summarize(mode, rows, num_solves, makespan):
+    latencies = [row['latency'] for row in rows]; objectives = [row['objective'] for row in rows if row['objective'] is not None]
+    return {'mode': mode, 'solves': num_solves, 'makespan': round(makespan, 2),
+            'latency_median': round(statistics.median(latencies), 2), 'latency_max': round(max(latencies), 2),
+            'found': len(objectives), 'objective_mean': round(statistics.mean(objectives), 1) if objectives else None}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="동시 접속 부하: 직접 실행 vs 서버 대기열")
+    parser.add_argument('--sessions', type=int, default=6)
+    parser.add_argument('--distinct', type=int, default=3, help="서로 다른 요청 수 (나머지 세션은 같은 요청을 반복)")
+    parser.add_argument('--time-limit', type=float, default=10)
+    parser.add_argument('--ban-density', type=float, default=0.05)
+    parser.add_argument('--max-concurrent', type=int, default=None, help="대기열 동시 실행 한도 (기본: 환경 변수 / 코어 수 기준)")
+    parser.add_argument('--max-workers', type=int, default=None)
+    parser.add_argument('--modes', nargs='+', default=['direct', 'queue'], choices=['direct', 'queue'])
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    requests = make_requests(args.sessions, max(1, min(args.distinct, args.sessions)), args.time_limit, args.ban_density)
+    print(f"[부하] 세션 {args.sessions}곳 / 서로 다른 요청 {args.distinct}개 / 시간 제한 {args.time_limit}초 / 코어 {config.available_cores()}개",
+          flush=True)
+    print(f"{'mode':<8} {'solves':>6} {'makespan':>9} {'p50 lat':>8} {'max lat':>8} {'found':>6} {'obj mean':>9}")
+    report = []
+    for mode in args.modes:
+        start = time.perf_counter()
+        if mode == 'direct': rows, num_solves = run_direct(requests)
+        else: rows, num_solves = run_queue(requests, args.max_concurrent, args.max_workers)
+        row = summarize(mode, rows, num_solves, time.perf_counter() - start)
+        report.append(row)
+        print(f"{mode:<8} {row['solves']:>6} {row['makespan']:>9.2f} {row['latency_median']:>8.2f} {row['latency_max']:>8.2f} "
+              f"{row['found']:>6} {str(row['objective_mean']):>9}", flush=True)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+# 스케줄러 성능 벤치마크 스위트
+#
+#   python benchmarks/suite.py --suite default --time-limit 30 --json suite_report.json
+#
+# benchmarks/instances.py 의 합성 인스턴스마다 모델 빌드 모드 x 대칭 제거 설정을 돌려
+# 빌드 시간, 변수/제약 수, 첫 해 발견 시간, 최적 증명 시간, 최종 목표 값/하한, 최대 RSS 를 기록한다.
+# JSON 리포트에는 제약 계열별 빌드 계측(profile)과 CP-SAT 응답 통계(solver_stats)도 함께 남긴다.
+# --rolling-window-days 를 주면 롤링 호라이즌(schedule_rolling) 도 같은 인스턴스로 돌려 비교한다.
+# --local-search-processes 를 주면 NumPy 담금질 엔진(schedule_local_search) 도 같은 시간 제한으로 돌린다 (모드 이름 ls<프로세스 수>).
+# 실행마다 새 프로세스를 써서 최대 RSS 가 이전 실행의 영향을 받지 않게 한다.
+# 스케줄러 성능 변경은 단일 10초 실행이 아니라 이 리포트로 비교한다.
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ortools import __version__ as ortools_version
+from ortools.sat.python import cp_model
+
+import schedule_config as config
+import schedule_solver as solver_core
+from schedule_rolling import solve_schedule_rolling
+from schedule_local_search import solve_schedule_local_search
+from instances import SUITES, get_suite
+
+
+class _TimelineCallback(cp_model.CpSolverSolutionCallback):
+    def __init__(self):
+        super().__init__()
+        self.timeline = []
+
+    def on_solution_callback(self):
+        self.timeline.append((self.WallTime(), self.ObjectiveValue()))
+
+
+def run_config(instance, model_mode, symmetry_breaking, time_limit, workers):
+    # 프로세스 풀 워커(작업당 새 프로세스)에서 실행
+    row = {'instance': instance['name'], **instance['params'], 'model_mode': model_mode,
+           'symmetry_breaking': symmetry_breaking, 'time_limit': time_limit, 'workers': workers}
+    build_start = time.time()
+    built = solver_core.build_schedule_model(
+        instance['positions'], instance['player_data'], config.num_teams_per_game, len(instance['positions']),
+        instance['banned_players_by_day'], model_mode=model_mode, symmetry_breaking=symmetry_breaking,
+        games_per_day=instance['games_per_day'])
+    row['build_seconds'] = round(time.time() - build_start, 3)
+    if built is None:
+        row.update({'status': 'MODEL_INVALID', 'peak_rss_mb': _peak_rss_mb()})
+        return row
+
+    solver = cp_model.CpSolver()
+    solver.parameters.num_search_workers = workers
+    solver.parameters.max_time_in_seconds = float(time_limit)
+    callback = _TimelineCallback()
+    status = solver.Solve(built['model'], callback)
+    found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    row.update({
+        'num_vars': built['num_vars'], 'num_constraints': built['num_constraints'],
+        'status': solver.StatusName(status), 'wall_seconds': round(solver.WallTime(), 3),
+        'first_feasible_seconds': round(callback.timeline[0][0], 3) if callback.timeline else None,
+        'time_to_best_seconds': round(callback.timeline[-1][0], 3) if callback.timeline else None,
+        'time_to_optimal_seconds': round(solver.WallTime(), 3) if status == cp_model.OPTIMAL else None,
+        'num_solutions': len(callback.timeline),
+        'objective': solver.ObjectiveValue() if found else None,
+        'bound': solver.BestObjectiveBound() if found or status == cp_model.UNKNOWN else None,
+        'peak_rss_mb': _peak_rss_mb(),
+        'profile': built['profile'], 'solver_stats': solver_core.get_solver_stats(solver),
+    })
+    return row
+
+
+def run_rolling(instance, window_days, time_limit, workers):
+    # 롤링 호라이즌: 창별 모델 중 가장 큰 모델의 크기와 전체 소요 시간을 기록
+    row = {'instance': instance['name'], **instance['params'], 'model_mode': f'rolling{window_days}',
+           'symmetry_breaking': None, 'time_limit': time_limit, 'workers': workers, 'build_seconds': None}
+    result = solve_schedule_rolling(
+        instance['positions'], instance['player_data'], config.num_teams_per_game, len(instance['positions']),
+        instance['banned_players_by_day'], time_limit, window_days=window_days, num_workers=workers,
+        games_per_day=instance['games_per_day'])
+    row.update({
+        'num_vars': result.num_vars, 'num_constraints': result.num_constraints,
+        'status': result.status_name, 'wall_seconds': round(result.wall_time, 3),
+        'first_feasible_seconds': round(result.wall_time, 3) if result.found else None,
+        'time_to_best_seconds': None, 'time_to_optimal_seconds': None, 'num_solutions': int(result.found),
+        'objective': result.objective, 'bound': None, 'peak_rss_mb': _peak_rss_mb(),
+    })
+    return row
+
+
+def run_local_search(instance, num_processes, time_limit, seed):
+    # 로컬 서치: 개선 타임라인(최선 목표 값 기준)과 이동 통계를 기록
+    row = {'instance': instance['name'], **instance['params'], 'model_mode': f'ls{num_processes}',
+           'symmetry_breaking': None, 'time_limit': time_limit, 'workers': num_processes, 'build_seconds': None}
+    result = solve_schedule_local_search(
+        instance['positions'], instance['player_data'], config.num_teams_per_game, len(instance['positions']),
+        instance['banned_players_by_day'], time_limit, games_per_day=instance['games_per_day'],
+        num_processes=num_processes, seed=seed)
+    timeline = result.timeline or []
+    row.update({
+        'num_vars': None, 'num_constraints': None,
+        'status': result.status_name, 'wall_seconds': round(result.wall_time, 3),
+        'first_feasible_seconds': timeline[0]['elapsed'] if timeline else None,
+        'time_to_best_seconds': timeline[-1]['elapsed'] if timeline else None, 'time_to_optimal_seconds': None,
+        'num_solutions': len(timeline), 'objective': result.objective, 'bound': None, 'peak_rss_mb': _peak_rss_mb(),
+        'solver_stats': result.solver_stats,
+    })
+    return row
+
+
+def _peak_rss_mb():
+    # Linux 의 ru_maxrss 단위는 KB, macOS 는 바이트
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="스케줄러 벤치마크 스위트")
+    parser.add_argument('--suite', default='default', choices=list(SUITES))
+    parser.add_argument('--instances', nargs='+', help="이 이름의 인스턴스만 실행")
+    parser.add_argument('--time-limit', type=float, default=30)
+    parser.add_argument('--model-modes', nargs='+', default=list(config.MODEL_MODE_LABELS),
+                        choices=list(config.MODEL_MODE_LABELS))
+    parser.add_argument('--symmetry', nargs='+', default=['off', 'on'], choices=['off', 'on'])
+    parser.add_argument('--workers', type=int, default=config.available_cores())
+    parser.add_argument('--rolling-window-days', type=int, nargs='*', default=[],
+                        help="롤링 호라이즌 창 크기(일). 지정한 크기마다 롤링 실행을 추가")
+    parser.add_argument('--local-search-processes', type=int, nargs='*', default=[],
+                        help="로컬 서치 병렬 프로세스 수. 지정한 값마다 담금질 엔진 실행을 추가")
+    parser.add_argument('--repeats', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0, help="출전 금지 생성 시드 (반복마다 +1)")
+    parser.add_argument('--json', help="리포트를 저장할 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    jobs = []
+    for repeat in range(args.repeats):
+        for instance in get_suite(args.suite, seed=args.seed + repeat):
+            if args.instances and instance['name'] not in args.instances: continue
+            for model_mode in args.model_modes:
+                for sym in args.symmetry:
+                    jobs.append((repeat, instance, model_mode, sym == 'on'))
+            for window_days in args.rolling_window_days:
+                jobs.append((repeat, instance, window_days, None))
+            for num_processes in args.local_search_processes:
+                jobs.append((repeat, instance, num_processes, 'ls'))
+
+    report = {
+        'meta': {'suite': args.suite, 'time_limit': args.time_limit, 'workers': args.workers, 'repeats': args.repeats,
+                 'seed': args.seed, 'ortools': ortools_version, 'python': platform.python_version(),
+                 'platform': platform.platform(), 'cpu_count': os.cpu_count(),
+                 'available_cores': config.available_cores(),
+                 'started_at': time.strftime('%Y-%m-%dT%H:%M:%S')},
+        'runs': [],
+    }
+    print(f"{'instance':<14} {'mode':>7} {'sym':>4} {'vars':>7} {'cons':>7} {'build':>6} {'status':>9} "
+          f"{'first':>7} {'optimal@':>8} {'obj':>6} {'bound':>6} {'rss MB':>7}")
+    fmt = lambda v: '-' if v is None else v
+    # 작업마다 새 프로세스 (max_tasks_per_child=1) 로 최대 RSS 를 분리, 시간 측정이 겹치지 않도록 순차 실행
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+        for repeat, instance, model_mode, symmetry_breaking in jobs:
+            if symmetry_breaking is None: # 롤링 호라이즌 (model_mode 자리에 창 크기)
+                row = pool.submit(run_rolling, instance, model_mode, args.time_limit, args.workers).result()
+            elif symmetry_breaking == 'ls': # 로컬 서치 (model_mode 자리에 프로세스 수)
+                row = pool.submit(run_local_search, instance, model_mode, args.time_limit, args.seed + repeat).result()
+            else:
+                row = pool.submit(run_config, instance, model_mode, symmetry_breaking, args.time_limit, args.workers).result()
+            row['repeat'] = repeat
+            report['runs'].append(row)
+            sym_text = '-' if symmetry_breaking in (None, 'ls') else ('on' if symmetry_breaking else 'off')
+            print(f"{row['instance']:<14} {row['model_mode']:>7} {sym_text:>4} {fmt(row.get('num_vars')):>7} "
+                  f"{fmt(row.get('num_constraints')):>7} {fmt(row['build_seconds']):>6} {row['status']:>9} "
+                  f"{fmt(row.get('first_feasible_seconds')):>7} {fmt(row.get('time_to_optimal_seconds')):>8} "
+                  f"{fmt(row.get('objective')):>6} {fmt(row.get('bound')):>6} {row['peak_rss_mb']:>7}", flush=True)
+            if args.json:
+                with open(args.json, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
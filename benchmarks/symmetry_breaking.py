@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# 대칭 제거 레이어 전/후 비교 벤치마크 (사이드바 슬라이더 범위 10~300초)
+#
+#   python benchmarks/symmetry_breaking.py --limits 10 30 60 120 300 --json bench_output.json
+#
+# 각 시간 제한마다 대칭 제거 off(자유 날짜 배치) / on(고정 날짜 배치 + 대칭 제거)으로 같은 모델을 풀고
+# 첫 해 발견 시간, 최종 목표 값, 증명된 하한, 최적 증명 시간, 표시 순서 기준 연속 출전 위반 수를 기록한다.
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ortools.sat.python import cp_model
+
+import schedule_config as config
+import schedule_solver as app
+
+
+class _TimelineCallback(cp_model.CpSolverSolutionCallback):
+    def __init__(self):
+        super().__init__()
+        self.timeline = []
+
+    def on_solution_callback(self):
+        self.timeline.append((self.WallTime(), self.ObjectiveValue()))
+
+
+def count_display_order_violations(solution_game_days, solution_assignments, num_games, num_teams, num_positions):
+    # 화면에 표시되는 (날짜, 게임 번호) 순서에서 같은 날 바로 이어지는 두 게임에 모두 나오는 선수 수
+    order = sorted(range(num_games), key=lambda g: (solution_game_days[g], g))
+    players_of = lambda g: {solution_assignments[g, t, p] for t in range(num_teams) for p in range(num_positions)}
+    return sum(len(players_of(g1) & players_of(g2))
+               for g1, g2 in zip(order, order[1:]) if solution_game_days[g1] == solution_game_days[g2])
+
+
+def run_once(time_limit, symmetry_breaking, model_mode, workers, banned_players_by_day):
+    build_start = time.time()
+    built = app.build_schedule_model(config.positions, config.player_data, config.num_teams_per_game, config.players_per_team,
+                                     banned_players_by_day, model_mode=model_mode, symmetry_breaking=symmetry_breaking)
+    build_seconds = time.time() - build_start
+    solver = cp_model.CpSolver()
+    solver.parameters.num_search_workers = workers
+    solver.parameters.max_time_in_seconds = float(time_limit)
+    callback = _TimelineCallback()
+    status = solver.Solve(built['model'], callback)
+
+    row = {
+        'time_limit': time_limit, 'symmetry_breaking': symmetry_breaking, 'model_mode': model_mode,
+        'num_vars': built['num_vars'], 'num_constraints': built['num_constraints'],
+        'build_seconds': round(build_seconds, 3), 'status': solver.StatusName(status),
+        'wall_seconds': round(solver.WallTime(), 2),
+        'first_feasible_seconds': round(callback.timeline[0][0], 2) if callback.timeline else None,
+        'time_to_best_seconds': round(callback.timeline[-1][0], 2) if callback.timeline else None,
+        'time_to_optimal_seconds': round(solver.WallTime(), 2) if status == cp_model.OPTIMAL else None,
+        'objective': None, 'bound': solver.BestObjectiveBound(), 'display_order_violations': None,
+    }
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        num_positions = len(config.positions)
+        keys = [(g, t, p) for g in range(config.NUM_GAMES) for t in range(config.num_teams_per_game) for p in range(num_positions)]
+        assignments = {key: app.get_slot_value(built, solver.Value, key) for key in keys}
+        game_days = [solver.Value(v) for v in built['game_day']]
+        row['objective'] = solver.ObjectiveValue()
+        row['display_order_violations'] = count_display_order_violations(
+            game_days, assignments, config.NUM_GAMES, config.num_teams_per_game, num_positions)
+    return row
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대칭 제거 전/후 time-to-optimal 비교")
+    parser.add_argument('--limits', type=int, nargs='+', default=[10, 30, 60, 120, 300])
+    parser.add_argument('--model-mode', default=config.DEFAULT_MODEL_MODE, choices=list(config.MODEL_MODE_LABELS))
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    rows = []
+    header = f"{'limit':>5} {'sym':>4} {'status':>9} {'first':>7} {'best@':>7} {'optimal@':>8} {'obj':>6} {'bound':>6} {'viol':>5}"
+    print(header)
+    for limit in args.limits:
+        for symmetry_breaking in (False, True):
+            row = run_once(limit, symmetry_breaking, args.model_mode, args.workers, {})
+            rows.append(row)
+            fmt = lambda v: '-' if v is None else v
+            print(f"{limit:>5} {('on' if symmetry_breaking else 'off'):>4} {row['status']:>9} {fmt(row['first_feasible_seconds']):>7} "
+                  f"{fmt(row['time_to_best_seconds']):>7} {fmt(row['time_to_optimal_seconds']):>8} {fmt(row['objective']):>6} "
+                  f"{row['bound']:>6} {fmt(row['display_order_violations']):>5}", flush=True)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
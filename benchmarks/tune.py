@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# CP-SAT 파라미터 자동 튜닝
+#
+#   python benchmarks/tune.py --suite default --time-limit 20 --seeds 3 --output solver_profiles.json
+#
+# benchmarks/instances.py 인스턴스를 크기(선수 수, 게임 수)별로 묶고, 크기마다 좌표 하강으로 파라미터를 하나씩 바꿔 가며
+# (워커 수 -> 탐색 분기 -> 선형화 수준 -> presolve -> probing) 더 좋은 값을 채택한다.
+# 각 설정은 묶음의 모든 인스턴스 x random_seed --seeds 개로 돌려 평균을 비교한다 (시드 하나를 고르면 운에 과적합되므로
+# 시드는 고르지 않고 평가 반복에만 씀). 점수는 (평균 0회 매치업 수, 평균 최종 해 도달 시간) 사전식 비교.
+# 결과는 크기별 프로필로 저장되고 schedule_solver.solve_schedule 이 가장 가까운 크기의 프로필을 읽어 적용한다.
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ortools import __version__ as ortools_version
+from ortools.sat.python import cp_model
+
+import schedule_config as config
+import schedule_solver as solver_core
+from instances import SUITES, get_suite
+from suite import _TimelineCallback
+
+# 좌표 하강 순서대로의 탐색 공간 (첫 값이 CP-SAT 기본값)
+SEARCH_SPACE = [
+    ('num_search_workers', None), # 사용 가능 코어 수 이하의 2의 거듭제곱 (main 에서 채움)
+    ('search_branching', ['AUTOMATIC_SEARCH', 'FIXED_SEARCH', 'PORTFOLIO_SEARCH', 'PSEUDO_COST_SEARCH']),
+    ('linearization_level', [1, 0, 2]),
+    ('cp_model_presolve', [True, False]),
+    ('cp_model_probing_level', [2, 0, 1]),
+]
+
+
+def worker_options(cores):
+    options = [w for w in (1, 2, 4, 8, 16, 32) if w <= cores]
+    return sorted(options, reverse=True)
+
+
+def run_once(built, params, seed, time_limit):
+    solver = cp_model.CpSolver()
+    solver_core.apply_solver_params(solver, params)
+    solver.parameters.num_search_workers = params['num_search_workers']
+    solver.parameters.random_seed = seed
+    solver.parameters.max_time_in_seconds = float(time_limit)
+    callback = _TimelineCallback()
+    status = solver.Solve(built['model'], callback)
+    if status in (cp_model.OPTIMAL, cp_model.INFEASIBLE):
+        seconds = solver.WallTime() # 증명까지 걸린 시간
+    else:
+        seconds = callback.timeline[-1][0] if callback.timeline else float(time_limit)
+    # 해가 없으면 가능한 최대 목표 값(0회 매치업 변수 수)으로 처리. 불가능 증명은 0 (모든 설정이 같은 조건)
+    worst = len(built['never_enemies_vars']) + len(built['never_allies_vars'])
+    objective = solver.ObjectiveValue() if callback.timeline else (0 if status == cp_model.INFEASIBLE else worst)
+    return objective, seconds
+
+
+def evaluate(models, params, seeds, time_limit):
+    runs = [run_once(built, params, seed, time_limit) for built in models for seed in range(1, seeds + 1)]
+    return {'objective': round(sum(r[0] for r in runs) / len(runs), 2), 'seconds': round(sum(r[1] for r in runs) / len(runs), 3)}
+
+
+def score_key(score):
+    return score['objective'], score['seconds']
+
+
+def tune_group(instances, search_space, seeds, time_limit, log):
+    models = [solver_core.build_schedule_model(
+        inst['positions'], inst['player_data'], config.num_teams_per_game, len(inst['positions']),
+        inst['banned_players_by_day'], games_per_day=inst['games_per_day']) for inst in instances]
+    models = [built for built in models if built is not None]
+    best = {name: values[0] for name, values in search_space}
+    best_score = baseline = evaluate(models, best, seeds, time_limit)
+    log(f"  기본값 {best} -> {best_score}")
+    for name, values in search_space:
+        for value in values:
+            if value == best[name]: continue
+            candidate = dict(best, **{name: value})
+            score = evaluate(models, candidate, seeds, time_limit)
+            adopted = score_key(score) < score_key(best_score)
+            log(f"  {name}={value} -> {score}{' (채택)' if adopted else ''}")
+            if adopted: best, best_score = candidate, score
+    return best, best_score, baseline
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CP-SAT 파라미터 자동 튜닝")
+    parser.add_argument('--suite', default='default', choices=list(SUITES))
+    parser.add_argument('--instances', nargs='+', help="이 이름의 인스턴스만 사용")
+    parser.add_argument('--time-limit', type=float, default=20, help="설정 x 인스턴스 x 시드 1회당 시간 제한")
+    parser.add_argument('--seeds', type=int, default=3, help="설정마다 평가할 random_seed 수")
+    parser.add_argument('--params', nargs='+', choices=[name for name, _ in SEARCH_SPACE], help="이 파라미터만 튜닝")
+    parser.add_argument('--output', default=solver_core.SOLVER_PROFILE_PATH, help="프로필 파일 (같은 크기의 기존 프로필은 교체)")
+    args = parser.parse_args(argv)
+
+    cores = config.available_cores()
+    search_space = []
+    for name, values in SEARCH_SPACE:
+        tuned = not args.params or name in args.params
+        if name == 'num_search_workers': values = worker_options(cores) if tuned else [cores] # 튜닝하지 않으면 코어 수로 고정
+        elif not tuned: continue
+        search_space.append((name, values))
+
+    groups = {}
+    for instance in get_suite(args.suite):
+        if args.instances and instance['name'] not in args.instances: continue
+        num_players = sum(len(ranks) for ranks in instance['player_data'].values())
+        groups.setdefault((num_players, sum(instance['games_per_day'])), []).append(instance)
+
+    log = lambda msg: print(msg, flush=True)
+    log(f"[튜닝] 크기 {len(groups)}개 | 코어 {cores}개 | 시간 제한 {args.time_limit}초 x 시드 {args.seeds}개")
+    new_profiles = []
+    for (num_players, num_games), instances in sorted(groups.items()):
+        log(f"\n[튜닝] {num_players}명 / {num_games}게임: {[inst['name'] for inst in instances]}")
+        tune_start = time.time()
+        params, score, baseline = tune_group(instances, search_space, args.seeds, args.time_limit, log)
+        log(f"[튜닝 완료] {params} -> {score} (기본값 {baseline}, {time.time() - tune_start:.0f}초)")
+        new_profiles.append({'num_players': num_players, 'num_games': num_games, 'instances': [inst['name'] for inst in instances],
+                             'params': params, 'score': score, 'baseline': baseline})
+
+    # 기존 파일과 병합: 같은 크기는 새 결과로 교체
+    try:
+        with open(args.output, encoding='utf-8') as f: profiles = json.load(f).get('profiles', [])
+    except FileNotFoundError:
+        profiles = []
+    tuned_sizes = {(prof['num_players'], prof['num_games']) for prof in new_profiles}
+    profiles = [prof for prof in profiles if (prof['num_players'], prof['num_games']) not in tuned_sizes] + new_profiles
+    report = {
+        'meta': {'suite': args.suite, 'time_limit': args.time_limit, 'seeds': args.seeds, 'available_cores': cores,
+                 'ortools': ortools_version, 'tuned_at': time.strftime('%Y-%m-%dT%H:%M:%S')},
+        'profiles': sorted(profiles, key=lambda prof: (prof['num_players'], prof['num_games'])),
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    log(f"\n[튜닝] 프로필 {len(new_profiles)}개 저장: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
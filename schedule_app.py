@@ -1,453 +1,299 @@
 # -*- coding: utf-8 -*-
 import streamlit as st
-import pandas as pd
 import time
+import json
 from collections import defaultdict
-from ortools.sat.python import cp_model
-from itertools import combinations
-import numpy as np
+from schedule_cache import ScheduleCache
 
 st.set_page_config(layout="wide")
 
-# --- 고정 설정 및 데이터 ---
-NUM_DAYS = 3
-GAMES_PER_DAY = [4, 3, 3]
-NUM_GAMES = sum(GAMES_PER_DAY)
-EXACT_TIER1_PER_TEAM_FIXED = 1
-MIN_ENEMY_SAME_POS_FIXED = 1
-
-positions = ['T', 'J', 'M', 'A', 'S']
-players_per_team = len(positions)
-num_teams_per_game = 2
-
-player_data = {
-    'T': {1: ('인섹', 'T1'), 2: ('얍얍', 'T2'), 3: ('뽀융쨩', 'T3'), 4: ('룩삼', 'T4'), 5: ('강소연', 'T5')},
-    'J': {1: ('소우릎', 'J1'), 2: ('꼴랑이', 'J2'), 3: ('네클릿', 'J3'), 4: ('휘용', 'J4'), 5: ('고수달', 'J5')},
-    'M': {1: ('갱맘', 'M1'), 2: ('실프', 'M2'), 3: ('헤징', 'M3'), 4: ('젤리', 'M4'), 5: ('명훈', 'M5')},
-    'A': {1: ('크캣', 'A1'), 2: ('따효니', 'A2'), 3: ('플러리', 'A3'), 4: ('모카형', 'A4'), 5: ('러너', 'A5')},
-    'S': {1: ('라콩', 'S1'), 2: ('눈꽃', 'S2'), 3: ('던', 'S3'), 4: ('루루카', 'S4'), 5: ('감규리', 'S5')},
-}
-
-@st.cache_data
-def process_player_data(p_data):
-    players = []; player_alias = {}; player_pos = {}; player_rank = {}
-    pos_players = defaultdict(list); tier1_players = []
-    player_to_id = {}; id_to_player = {}; pid_counter = 0; all_player_names = []
-    display_player_options = []
-    display_to_name_map = {}
-    name_to_display_map = {}
-
-    for pos, ranks in p_data.items():
-        for rank, (alias, name) in ranks.items():
-            players.append(name); player_alias[name] = alias; player_pos[name] = pos
-            player_rank[name] = rank; pos_players[pos].append(name); all_player_names.append(name)
-            display_text = f"{alias}({name})"
-            display_player_options.append(display_text)
-            display_to_name_map[display_text] = name
-            name_to_display_map[name] = display_text
-            if rank == 1: tier1_players.append(name)
-            player_to_id[name] = pid_counter; id_to_player[pid_counter] = name; pid_counter += 1
-
-    num_players = len(players); player_ids = list(range(num_players))
-    non_tier1_players = [p for p in players if p not in tier1_players]
-    return (players, player_alias, player_pos, player_rank, pos_players,
-            tier1_players, player_to_id, id_to_player, num_players,
-            player_ids, sorted(all_player_names), non_tier1_players,
-            sorted(display_player_options), display_to_name_map, name_to_display_map)
-
-(players, player_alias, player_pos, player_rank, pos_players,
- tier1_players, player_to_id, id_to_player, num_players,
- player_ids, all_player_names, non_tier1_players,
- display_player_options, display_to_name_map, name_to_display_map) = process_player_data(player_data)
-
-
-def get_player_info(p_id):
-    name = id_to_player.get(p_id, "Unknown")
-    if name == "Unknown": return "Unknown", "Unk", "N/A", -1
-    return name, player_alias.get(name,"?"), player_pos.get(name,"?"), player_rank.get(name,-1)
-
-# --- OR-Tools 스케줄링 로직 ---
-def solve_schedule(positions, player_data,
-                   num_teams_per_game, players_per_team,
-                   banned_players_by_day,
-                   time_limit_seconds):
-    num_games = NUM_GAMES; num_days = NUM_DAYS
-    exact_tier1_per_team = EXACT_TIER1_PER_TEAM_FIXED
-    min_enemy_same_pos_diff_rank = MIN_ENEMY_SAME_POS_FIXED
-
-    (players_f, player_alias_f, player_pos_f, player_rank_f, pos_players_f, tier1_players_f,
-     player_to_id_f, id_to_player_f, num_players_f, player_ids_f, _, non_tier1_players_f,
-     _, display_to_name_map_f, _) = process_player_data(player_data)
-    tier1_player_ids_f = {player_to_id_f[p] for p in tier1_players_f}
-    non_tier1_player_ids_f = {player_to_id_f[p] for p in non_tier1_players_f}
-
-    status_messages = []; status_area = st.empty()
-    def update_status(msg): status_messages.append(msg); status_area.text("\n".join(status_messages))
-
-    update_status(f"\n=== {num_games} 게임 스케줄 생성 시작 (0회 매치업 최소화, 시간 제한: {time_limit_seconds}초) ===")
-    start_time = time.time(); model = cp_model.CpModel()
-
-    # --- 선수 ID 집합 생성 ---
-    update_status("[계산] 선수 ID 집합 생성 중...");
-    banned_player_ids_by_day = defaultdict(set)
-    for day, banned_names_display in banned_players_by_day.items():
-        day_idx = day - 1
-        if 0 <= day_idx < num_days:
-            banned_names_actual = {display_to_name_map_f.get(disp_name) for disp_name in banned_names_display}
-            banned_player_ids_by_day[day_idx] = {player_to_id_f[p] for p in banned_names_actual if p in player_to_id_f}
-    pos_player_ids = defaultdict(list); [pos_player_ids[pos].append(player_to_id_f[p]) for pos, p_list in pos_players_f.items() for p in p_list]
-    update_status("[계산] 선수 ID 집합 생성 완료.")
-
-    # --- 비1티어 목표 경기 수 계산 ---
-    total_non_tier1_slots = num_games * num_teams_per_game * (players_per_team - 1)
-    num_non_tier1_players = len(non_tier1_player_ids_f)
-    target_play_count_non_tier1 = -1
-    if num_non_tier1_players > 0 and total_non_tier1_slots % num_non_tier1_players == 0:
-         target_play_count_non_tier1 = total_non_tier1_slots // num_non_tier1_players
-         update_status(f"[계산] 비1티어 목표 경기 수: {target_play_count_non_tier1}")
-    elif num_non_tier1_players > 0:
-         msg = f"[경고] 비1티어 선수({num_non_tier1_players}명) 수로 총 슬롯({total_non_tier1_slots}개)을 나눌 수 없어 동일 경기 수 제약 제외됨."
-         update_status(msg)
+# --- 설정/명단 (schedule_config.py) ---
+# 첫 화면은 OR-Tools/pandas/numpy 없이 그림. 솔버 스택(schedule_solver 등)은 대기열이 백그라운드로 예열하고,
+# 결과 표시/불러오기/모델 비교처럼 실제로 필요한 곳에서만 import (이미 불러온 모듈이면 비용 없음).
+# 명단은 실행마다 다를 수 있어 전역으로 두지 않고 roster = (player_data, positions) 로 헬퍼에 넘김
+from schedule_config import (
+    NUM_DAYS, GAMES_PER_DAY, NUM_GAMES, num_teams_per_game, player_data as default_player_data,
+    process_player_data,
+    MODEL_MODE_LABELS, StopCriteria, precheck_bans, ALTERNATIVE_TOLERANCE, ALTERNATIVE_MIN_DISTANCE,
+    ENGINE_LABELS, ENGINE_LOCAL_SEARCH, available_cores, DEFAULT_WINDOW_DAYS,
+)
+from schedule_templates import get_default_templates
+from schedule_roster import ROSTER_COLUMNS, load_roster, dump_roster, roster_format_of, roster_key
+from schedule_queue import get_default_scheduler
+
+LIVE_LOG_LINES = 12 # 해 찾는 동안 보여 줄 실행 로그 줄 수
+
+
+def build_schedule_display_df(final_schedule, final_assignments, roster):
+    # 게임별 행 + 날짜가 바뀔 때 빈 구분 행을 넣은 표시용 DataFrame. 배정 배열(게임 x 팀 x 포지션)을 별명 배열로 한 번에 인덱싱
+    import numpy as np
+    import pandas as pd
+    from schedule_roster import get_player_index
+    from schedule_validate import grid_from_assignments, team_label
+    player_data, positions = roster
+    team_cols = [[f"Team {team_label(t)} ({pos})" for pos in positions] for t in range(num_teams_per_game)]
+    column_order = ['Day'] + [col for t, cols in enumerate(team_cols) for col in (['vs'] if t else []) + cols]
+    if not final_schedule:
+        return pd.DataFrame(columns=column_order)
+
+    index = get_player_index(player_data, positions)
+    games = sorted(final_schedule, key=lambda g: (final_schedule[g]['day'], final_schedule[g]['game_id']))
+    days = np.array([final_schedule[g]['day'] for g in games])
+    grid = grid_from_assignments(final_assignments, max(games) + 1, num_teams_per_game, len(positions))[games]
+    labels = np.array([alias or "-" for alias in index.aliases] + ["-"], dtype=object) # 마지막 칸 = 빈 슬롯 / 모르는 선수
+    cells = labels[np.where((grid >= 0) & (grid < index.num_players), grid, index.num_players)]
+    blocks = [days.astype(str).astype(object)[:, None]] # Day 도 문자열 (구분 행의 '' 와 한 열에 섞여도 Arrow 변환 가능)
+    for t in range(num_teams_per_game):
+        if t: blocks.append(np.full((len(games), 1), 'vs', dtype=object))
+        blocks.append(cells[:, t, :])
+    rows = np.insert(np.hstack(blocks), np.flatnonzero(np.diff(days)) + 1, '', axis=0)
+    return pd.DataFrame(rows, columns=column_order)
+
+
+def highlight_changes(display_df, base_df):
+    # base_df 와 다른 칸만 배경색 (Styler.apply(axis=None) 용)
+    import numpy as np
+    import pandas as pd
+    return pd.DataFrame(np.where(display_df.values != base_df.values, 'background-color: #fff3b0', ''),
+                        index=display_df.index, columns=display_df.columns)
+
+
+def matrix_heatmap(counts, names, title):
+    # 선수 x 선수 만남 횟수 히트맵의 Vega-Lite 스펙 (Altair 는 Streamlit 에 포함). 0 칸이 가장 옅은 색.
+    # 차트 객체 대신 스펙 dict 를 저장해 rerun 마다 Altair 직렬화(차트당 수십 ms)를 반복하지 않음
+    import altair as alt
+    import numpy as np
+    import pandas as pd
+    rows, cols = np.divmod(np.arange(counts.size), len(names)); names = np.asarray(names, dtype=object)
+    frame = pd.DataFrame({'선수 1': names[rows], '선수 2': names[cols], '횟수': counts.ravel()})
+    return alt.Chart(frame, title=title).mark_rect().encode(
+        x=alt.X('선수 2:N', sort=list(names), title=None), y=alt.Y('선수 1:N', sort=list(names), title=None),
+        color=alt.Color('횟수:Q', scale=alt.Scale(scheme='blues')), tooltip=['선수 1', '선수 2', '횟수']).to_dict()
+
+
+def timeline_chart(timeline):
+    # 목표 값 / 하한 타임라인의 Vega-Lite 스펙 (st.line_chart 는 rerun 마다 Altair 차트를 새로 만들어 200ms 가까이 걸림)
+    import altair as alt
+    import pandas as pd
+    frame = pd.DataFrame(timeline).rename(columns={'objective': '목표 값', 'bound': '하한'})
+    frame = frame.melt('elapsed', var_name='구분', value_name='값').dropna()
+    return alt.Chart(frame).mark_line(interpolate='step-after').encode(
+        x=alt.X('elapsed:Q', title="경과 시간(초)"), y=alt.Y('값:Q', title="0회 매치업 수", scale=alt.Scale(zero=False)),
+        color=alt.Color('구분:N', title=None), tooltip=['구분', 'elapsed', '값']).to_dict()
+
+
+def make_schedule_analytics(report, game_days, assignments, roster):
+    # 검증 결과의 만남 행렬 -> 아군/적군 히트맵, 선수별 날짜별 출전 수, 목표가 남긴 0회 쌍 목록 (구조가 잘못된 스케줄이면 None)
+    import pandas as pd
+    from schedule_roster import get_player_index
+    from schedule_validate import grid_from_assignments, plays_per_day, zero_matchup_pairs
+    if report.enemy_counts is None: return None
+    player_data, positions = roster
+    index = get_player_index(player_data, positions)
+    names = [f"{alias}({name})" for alias, name in zip(index.aliases, index.names)]
+    grid = grid_from_assignments(assignments, len(game_days), num_teams_per_game, len(positions))
+    per_day = plays_per_day(grid, game_days, index.num_players, NUM_DAYS)
+    games_per_day = pd.DataFrame(per_day, index=names, columns=[f"{d + 1}일차" for d in range(NUM_DAYS)])
+    games_per_day.insert(0, '포지션', [positions[pi] for pi in index.pos_of.tolist()])
+    games_per_day['합계'] = per_day.sum(axis=1)
+    never_enemies, never_allies = zero_matchup_pairs(index, report.ally_counts, report.enemy_counts)
+    zero_pairs = pd.DataFrame([
+        {'구분': kind, '선수 1': names[i], '선수 2': names[j],
+         '적군 만남': int(report.enemy_counts[i, j]), '아군 만남': int(report.ally_counts[i, j])}
+        for kind, ks in (('적군 0회', never_enemies), ('아군 0회', never_allies))
+        for i, j in zip(index.pair_i[ks].tolist(), index.pair_j[ks].tolist())
+    ], columns=['구분', '선수 1', '선수 2', '적군 만남', '아군 만남'])
+    return {'zero_pairs': zero_pairs, 'games_per_day': games_per_day,
+            'heatmaps': [matrix_heatmap(report.enemy_counts, names, "적군 만남 횟수"), matrix_heatmap(report.ally_counts, names, "아군 만남 횟수")]}
+
+
+def show_validation_report(report, analytics=None):
+    # schedule_validate 검증 결과: 통과 한 줄 또는 위반 목록 + (있으면) 0회 쌍 / 만남 히트맵 / 날짜별 출전 수
+    import pandas as pd
+    if report.valid:
+        st.caption(f"✅ 검증: 하드 제약 위반 없음 | 0회 매치업 {report.objective}개 (적군 {report.never_enemies}, 아군 {report.never_allies}) "
+                   f"| {report.seconds * 1000:.2f}ms")
     else:
-         msg = "[경고] 비1티어 선수가 없어 동일 경기 수 제약 제외됨."
-         update_status(msg)
-
-    # --- 모델 변수 생성 ---
-    update_status("[모델 생성] 변수 생성 중..."); pos_indices = list(range(len(positions))); pos_map = {pos: i for i, pos in enumerate(positions)}
-    assignment = {}; valid_model = True
-    for g in range(num_games):
-        for t in range(num_teams_per_game):
-            for p_idx in pos_indices:
-                pos = positions[p_idx]; allowed_player_ids_for_pos = pos_player_ids.get(pos); var_key = (g, t, p_idx)
-                if not allowed_player_ids_for_pos: msg = f"[오류] '{pos}' 선수 없음!"; update_status(msg); valid_model = False; break
-                domain = cp_model.Domain.FromValues(allowed_player_ids_for_pos)
-                assignment[var_key] = model.NewIntVarFromDomain(domain, f'assign_g{g}_t{t}_p{pos}')
-            if not valid_model: break
-        if not valid_model: break
-    if not valid_model: return None, None, status_messages, cp_model.MODEL_INVALID
-    update_status(f"[모델 생성] assignment 변수 {len(assignment)}개 생성.")
-
-    player_in_game = {}; [player_in_game.setdefault((p_id, g), model.NewBoolVar(f'p{p_id}_in_g{g}')) for p_id in player_ids_f for g in range(num_games)]
-    update_status(f"[모델 생성] player_in_game 변수 {len(player_in_game)}개 생성.")
-    game_day = [model.NewIntVar(0, num_days - 1, f'game_day_{g}') for g in range(num_games)]
-    update_status(f"[모델 생성] game_day 변수 {len(game_day)}개 생성.")
-
-    # --- 변수 연결 제약 ---
-    update_status("[모델 생성] 변수 연결 제약 추가 중...");
-    for p_id in player_ids_f:
-        name = id_to_player_f.get(p_id)
-        p_pos = player_pos_f.get(name) if name else None
-        p_pos_idx = pos_map.get(p_pos) if p_pos else None
-        if p_pos_idx is None: continue
-        for g in range(num_games):
-            presence_indicators = []
-            for t in range(num_teams_per_game):
-                 key = (g, t, p_pos_idx)
-                 if key in assignment:
-                     indicator = model.NewBoolVar(f'ind_p{p_id}_g{g}_t{t}_pos{p_pos_idx}')
-                     model.Add(assignment[key] == p_id).OnlyEnforceIf(indicator); model.Add(assignment[key] != p_id).OnlyEnforceIf(indicator.Not()); presence_indicators.append(indicator)
-            if (p_id, g) in player_in_game and presence_indicators:
-                model.Add(sum(presence_indicators) >= 1).OnlyEnforceIf(player_in_game[p_id, g]);
-                model.Add(sum(presence_indicators) == 0).OnlyEnforceIf(player_in_game[p_id, g].Not())
-            elif (p_id, g) in player_in_game:
-                 model.Add(player_in_game[p_id, g] == 0)
-    update_status("[모델 생성] 변수 연결 제약 추가 완료.")
-
-    # --- 주요 제약 조건 추가 ---
-    update_status("\n--- 주요 제약 조건 추가 시작 ---"); constraint_count = 0
-    # (C2) 게임 내 중복 금지
-    update_status("[제약 추가 중] (C2) 게임 내 중복 금지..."); count_c2 = 0
-    for g in range(num_games):
-        players_in_game_g = [assignment[g, t, p_idx] for t in range(num_teams_per_game) for p_idx in pos_indices if (g,t,p_idx) in assignment]
-        if len(players_in_game_g) > 1: model.AddAllDifferent(players_in_game_g); count_c2 += 1
-    constraint_count += count_c2; update_status(f"[제약 추가 완료] (C2) {count_c2}개 추가.")
-
-    # (C3) 팀당 1티어 선수 수
-    update_status("[제약 추가 중] (C3) 팀당 1티어 선수 수..."); count_c3 = 0
-    for g in range(num_games):
-        for t in range(num_teams_per_game):
-            is_tier1_flags = []
-            for p_idx in pos_indices:
-                 key = (g, t, p_idx); pos = positions[p_idx]
-                 if key not in assignment: continue
-                 is_t1 = model.NewBoolVar(f'isT1_g{g}_t{t}_p{p_idx}'); pos_tier1_ids = [p_id for p_id in pos_player_ids.get(pos, []) if p_id in tier1_player_ids_f]
-                 if not pos_tier1_ids: model.Add(is_t1 == 0)
-                 else:
-                     t1_matches = []
-                     for t1_id in pos_tier1_ids:
-                         match = model.NewBoolVar(f'm_g{g}_t{t}_p{p_idx}_{t1_id}')
-                         model.Add(assignment[key] == t1_id).OnlyEnforceIf(match); model.Add(assignment[key] != t1_id).OnlyEnforceIf(match.Not()); t1_matches.append(match)
-                     model.AddBoolOr(t1_matches).OnlyEnforceIf(is_t1)
-                     model.Add(sum(t1_matches) == 0).OnlyEnforceIf(is_t1.Not())
-                 is_tier1_flags.append(is_t1);
-            if is_tier1_flags: model.Add(sum(is_tier1_flags) == exact_tier1_per_team); count_c3 += 1
-    constraint_count += count_c3; update_status(f"[제약 추가 완료] (C3) {count_c3}개 팀 제약 추가.")
-
-    # --- 아군/적군 보조 변수 생성 ---
-    update_status("[모델 생성] 아군/적군 조건용 변수 생성 중..."); are_enemies = {}; are_allies = {}
-    for g in range(num_games):
-        for i, p1_id in enumerate(player_ids_f):
-            for j in range(i + 1, num_players_f):
-                p2_id = player_ids_f[j];
-                id1, id2 = min(p1_id, p2_id), max(p1_id, p2_id)
-
-                p1_plays = player_in_game.get((p1_id, g), 0); p2_plays = player_in_game.get((p2_id, g), 0)
-                both_play = model.NewBoolVar(f'both_{id1}_{id2}_g{g}');
-                enemies_var = model.NewBoolVar(f'enemy_{id1}_{id2}_g{g}');
-                allies_var = model.NewBoolVar(f'ally_{id1}_{id2}_g{g}')
-                are_enemies[id1, id2, g] = enemies_var
-                are_allies[id1, id2, g] = allies_var
-
-                p1_lit = p1_plays if isinstance(p1_plays, cp_model.IntVar) else model.NewConstant(p1_plays);
-                p2_lit = p2_plays if isinstance(p2_plays, cp_model.IntVar) else model.NewConstant(p2_plays)
-
-                if isinstance(p1_lit, cp_model.IntVar) and isinstance(p2_lit, cp_model.IntVar):
-                    model.AddBoolAnd([p1_lit, p2_lit]).OnlyEnforceIf(both_play);
-                    model.AddBoolOr([p1_lit.Not(), p2_lit.Not()]).OnlyEnforceIf(both_play.Not())
-                elif p1_lit == 0 or p2_lit == 0: model.Add(both_play == 0)
-                else: model.Add(both_play == 1)
-
-                model.Add(enemies_var == 0).OnlyEnforceIf(both_play.Not())
-                model.Add(allies_var == 0).OnlyEnforceIf(both_play.Not())
-
-                p1_name = id_to_player_f.get(p1_id); p2_name = id_to_player_f.get(p2_id);
-                if not p1_name or not p2_name: continue
-                p1_pos = player_pos_f.get(p1_name); p2_pos = player_pos_f.get(p2_name);
-                if not p1_pos or not p2_pos: continue
-                p1_pos_idx = pos_map.get(p1_pos); p2_pos_idx = pos_map.get(p2_pos);
-                if p1_pos_idx is None or p2_pos_idx is None: continue
-
-                # 아군 조건
-                if p1_pos != p2_pos:
-                    same_team_indicators = [];
-                    for t in range(num_teams_per_game):
-                        key1 = (g, t, p1_pos_idx); key2 = (g, t, p2_pos_idx);
-                        if key1 in assignment and key2 in assignment:
-                            p1_on_t = model.NewBoolVar(f'p1_t{t}_{g}_{id1}'); model.Add(assignment[key1] == p1_id).OnlyEnforceIf(p1_on_t); model.Add(assignment[key1] != p1_id).OnlyEnforceIf(p1_on_t.Not())
-                            p2_on_t = model.NewBoolVar(f'p2_t{t}_{g}_{id2}'); model.Add(assignment[key2] == p2_id).OnlyEnforceIf(p2_on_t); model.Add(assignment[key2] != p2_id).OnlyEnforceIf(p2_on_t.Not())
-                            same_t = model.NewBoolVar(f'same_t{t}_{id1}_{id2}_g{g}'); model.AddBoolAnd([p1_on_t, p2_on_t]).OnlyEnforceIf(same_t); model.AddBoolOr([p1_on_t.Not(), p2_on_t.Not()]).OnlyEnforceIf(same_t.Not())
-                            same_team_indicators.append(same_t)
-                    if same_team_indicators:
-                        model.AddBoolOr(same_team_indicators).OnlyEnforceIf(allies_var)
-                        model.Add(sum(same_team_indicators) == 0).OnlyEnforceIf(allies_var.Not())
-                    else: model.Add(allies_var == 0)
-                else: model.Add(allies_var == 0)
-
-                # 적군 조건
-                if num_teams_per_game == 2:
-                    key1_t0=(g,0,p1_pos_idx); key1_t1=(g,1,p1_pos_idx);
-                    key2_t0=(g,0,p2_pos_idx); key2_t1=(g,1,p2_pos_idx);
-                    if key1_t0 in assignment and key1_t1 in assignment and key2_t0 in assignment and key2_t1 in assignment:
-                        p1_t0 = model.NewBoolVar(f'p1_t0_{g}_{id1}'); model.Add(assignment[key1_t0]==p1_id).OnlyEnforceIf(p1_t0); model.Add(assignment[key1_t0]!=p1_id).OnlyEnforceIf(p1_t0.Not())
-                        p1_t1 = model.NewBoolVar(f'p1_t1_{g}_{id1}'); model.Add(assignment[key1_t1]==p1_id).OnlyEnforceIf(p1_t1); model.Add(assignment[key1_t1]!=p1_id).OnlyEnforceIf(p1_t1.Not())
-                        p2_t0 = model.NewBoolVar(f'p2_t0_{g}_{id2}'); model.Add(assignment[key2_t0]==p2_id).OnlyEnforceIf(p2_t0); model.Add(assignment[key2_t0]!=p2_id).OnlyEnforceIf(p2_t0.Not())
-                        p2_t1 = model.NewBoolVar(f'p2_t1_{g}_{id2}'); model.Add(assignment[key2_t1]==p2_id).OnlyEnforceIf(p2_t1); model.Add(assignment[key2_t1]!=p2_id).OnlyEnforceIf(p2_t1.Not())
-                        diff_c1 = model.NewBoolVar(f'diff1_{id1}_{id2}_g{g}'); model.AddBoolAnd([p1_t0, p2_t1]).OnlyEnforceIf(diff_c1); model.AddBoolOr([p1_t0.Not(), p2_t1.Not()]).OnlyEnforceIf(diff_c1.Not())
-                        diff_c2 = model.NewBoolVar(f'diff2_{id1}_{id2}_g{g}'); model.AddBoolAnd([p1_t1, p2_t0]).OnlyEnforceIf(diff_c2); model.AddBoolOr([p1_t1.Not(), p2_t0.Not()]).OnlyEnforceIf(diff_c2.Not())
-                        model.AddBoolOr([diff_c1, diff_c2]).OnlyEnforceIf(enemies_var);
-                        model.Add(sum([diff_c1, diff_c2]) == 0).OnlyEnforceIf(enemies_var.Not())
-                    else: model.Add(enemies_var == 0)
-                else: model.Add(enemies_var == 0)
-
-                model.AddImplication(enemies_var, both_play)
-                model.AddImplication(allies_var, both_play)
-                model.Add(allies_var + enemies_var <= 1)
-    update_status("[모델 생성] 아군/적군 조건용 변수 생성 완료.")
-
-    # (NEW) 1티어 맞대결 1번
-    update_status("[제약 추가 중] (NEW) 1티어 맞대결 정확히 1번씩 발생..."); count_t1_match = 0
-    tier1_pairs = list(combinations(tier1_player_ids_f, 2))
-    if len(tier1_pairs) != 10: update_status(f"[경고] 1티어 조합 수 10 아님: {len(tier1_pairs)}");
-    for p1_id, p2_id in tier1_pairs:
-        id1, id2 = min(p1_id, p2_id), max(p1_id, p2_id)
-        enemy_vars = [are_enemies.get((id1, id2, g), 0) for g in range(num_games)]
-        valid_enemy_vars = [v for v in enemy_vars if isinstance(v, cp_model.IntVar)]
-        if valid_enemy_vars: model.Add(sum(valid_enemy_vars) == 1); count_t1_match += 1
-    constraint_count += count_t1_match; update_status(f"[제약 추가 완료] (NEW) 1티어 맞대결 제약 {count_t1_match}개 추가.")
-
-    # (C5) 같은 포지션 간 최소 적군 조건
-    update_status("[제약 추가 중] (C5) 같은 포지션 간 최소 적군 조건 (1회 고정)..."); count_c5 = 0
-    for pos in positions:
-        pos_p_ids = sorted(pos_player_ids.get(pos, []))
-        for i, p1_id in enumerate(pos_p_ids):
-            for j in range(i + 1, len(pos_p_ids)):
-                p2_id = pos_p_ids[j];
-                id1, id2 = min(p1_id, p2_id), max(p1_id, p2_id)
-                enemy_vars = [are_enemies.get((id1, id2, g), 0) for g in range(num_games)];
-                valid_enemy_vars = [v for v in enemy_vars if isinstance(v, cp_model.IntVar)]
-                if valid_enemy_vars: model.Add(sum(valid_enemy_vars) >= min_enemy_same_pos_diff_rank); count_c5 += 1
-    constraint_count += count_c5; update_status(f"[제약 추가 완료] (C5) {count_c5}개 추가.")
-
-    # (C8) 비1티어 선수 동일 경기 수
-    if target_play_count_non_tier1 != -1:
-        update_status(f"[제약 추가 중] (C8) 비1티어 선수 동일 경기 수 ({target_play_count_non_tier1}회)..."); count_c8 = 0
-        for p_id in non_tier1_player_ids_f:
-            play_count_vars = [player_in_game.get((p_id, g), 0) for g in range(num_games)]
-            valid_play_vars = [v for v in play_count_vars if isinstance(v, cp_model.IntVar)]
-            if valid_play_vars: model.Add(sum(valid_play_vars) == target_play_count_non_tier1); count_c8 += 1
-        constraint_count += count_c8; update_status(f"[제약 추가 완료] (C8) {count_c8}개 추가.")
-    else:
-         update_status(f"[제약 제외됨] (C8) 비1티어 선수 동일 경기 수 제약 조건 제외됨.")
-
-    # (NEW) 날짜별 게임 수 균등 분배
-    update_status("[제약 추가 중] (NEW) 날짜별 게임 수 균등 분배 (3~4 게임)..."); count_day_bal = 0
-    game_on_day_vars = [[model.NewBoolVar(f'g{g}_on_d{d}') for g in range(num_games)] for d in range(num_days)]
-    for g in range(num_games):
-        for d in range(num_days):
-            model.Add(game_day[g] == d).OnlyEnforceIf(game_on_day_vars[d][g]); model.Add(game_day[g] != d).OnlyEnforceIf(game_on_day_vars[d][g].Not()); count_day_bal += 2
-        model.Add(sum(game_on_day_vars[d][g] for d in range(num_days)) == 1); count_day_bal += 1
-    for d in range(num_days):
-        games_this_day = [game_on_day_vars[d][g] for g in range(num_games)]
-        model.Add(sum(games_this_day) >= 3); model.Add(sum(games_this_day) <= 4); count_day_bal += 2
-    model.Add(sum(game_on_day_vars[0][g] for g in range(num_games)) == 4)
-    count_day_bal += 1
-    constraint_count += count_day_bal; update_status(f"[제약 추가 완료] (NEW) 날짜 균등 분배 제약 약 {count_day_bal}개 추가.")
-
-    # (C7)호 특정 날짜 출전 금지
-    update_status("[제약 추가 중] (C7) 특정 날짜 출전 금지..."); count_c7 = 0
-    for day_idx, banned_ids in banned_player_ids_by_day.items():
-        if banned_ids:
-            for p_id in banned_ids:
-                for g in range(num_games):
-                    if (p_id, g) in player_in_game:
-                        player_plays_var = player_in_game[p_id, g]
-                        if isinstance(player_plays_var, cp_model.IntVar):
-                             model.AddImplication(game_on_day_vars[day_idx][g], player_plays_var.Not()); count_c7 += 1
-    if count_c7 > 0: constraint_count += count_c7; update_status(f"[제약 추가 완료] (C7) {count_c7}개 추가.")
-    else: update_status("[제약 추가 완료] (C7) 해당 제약 없음.")
-
-    # <<< --- NEW: 동일 날짜 연속 경기 출전 금지 제약 조건 추가 --- >>>
-    update_status("[제약 추가 중] (NEW) 동일 날짜 연속 경기 출전 금지..."); count_consecutive = 0
-    # 인접한 두 게임이 같은 날짜인지 나타내는 변수 미리 생성
-    same_day_vars = {}
-    for g in range(num_games - 1):
-        var = model.NewBoolVar(f'same_day_{g}_{g+1}')
-        # game_day 변수를 사용하여 g와 g+1이 같은 날인지 확인
-        model.Add(game_day[g] == game_day[g+1]).OnlyEnforceIf(var)
-        model.Add(game_day[g] != game_day[g+1]).OnlyEnforceIf(var.Not())
-        same_day_vars[g] = var
-        count_consecutive += 2 # 변수 정의 제약 2개
-
-    # 모든 선수와 인접 게임 쌍에 대해 제약 적용
-    for p_id in player_ids_f:
-        for g in range(num_games - 1):
-            p_plays_g = player_in_game.get((p_id, g))
-            p_plays_gplus1 = player_in_game.get((p_id, g + 1))
-            same_day_g_gplus1 = same_day_vars[g]
-
-            # player_in_game 변수가 모델에 실제로 존재하는지 확인 (이론상 항상 존재)
-            if isinstance(p_plays_g, cp_model.IntVar) and isinstance(p_plays_gplus1, cp_model.IntVar):
-                # 제약: p_plays_g + p_plays_gplus1 + same_day_g_gplus1 <= 2
-                # 즉, 세 변수가 동시에 1이 될 수 없음 (같은 날 연속 출전 금지)
-                model.Add(p_plays_g + p_plays_gplus1 + same_day_g_gplus1 <= 2)
-                count_consecutive += 1
-            # else: player_in_game 변수가 없거나 상수로 고정된 경우 (예: 밴) - 제약 추가 불필요
-
-    constraint_count += count_consecutive
-    update_status(f"[제약 추가 완료] (NEW) 동일 날짜 연속 경기 금지 제약 약 {count_consecutive}개 추가.")
-    # <<< --- 연속 경기 금지 제약 조건 추가 완료 --- >>>
-
-
-    # --- 최적화 목표 설정 ---
-    update_status("[최적화 목표 설정] 0회 매치업 최소화...")
-    never_enemies_vars = []
-    never_allies_vars = []
-    zero_matchups_count = 0
-    for i, p1_id in enumerate(player_ids_f):
-        for j in range(i + 1, num_players_f):
-            p2_id = player_ids_f[j]
-            id1, id2 = min(p1_id, p2_id), max(p1_id, p2_id)
-
-            # 적군 0회 변수
-            total_enemies_vars = [are_enemies.get((id1, id2, g), 0) for g in range(num_games)]
-            valid_enemy_vars = [v for v in total_enemies_vars if isinstance(v, cp_model.IntVar)]
-            if valid_enemy_vars:
-                 total_enemies = model.NewIntVar(0, num_games, f'total_enemies_{id1}_{id2}')
-                 model.Add(total_enemies == sum(valid_enemy_vars))
-                 never_enemy = model.NewBoolVar(f'never_enemy_{id1}_{id2}')
-                 model.Add(total_enemies == 0).OnlyEnforceIf(never_enemy)
-                 model.Add(total_enemies >= 1).OnlyEnforceIf(never_enemy.Not())
-                 never_enemies_vars.append(never_enemy)
-                 zero_matchups_count += 1
-
-            # 아군 0회 변수
-            p1_name = id_to_player_f.get(p1_id); p2_name = id_to_player_f.get(p2_id)
-            if p1_name and p2_name:
-                p1_pos = player_pos_f.get(p1_name); p2_pos = player_pos_f.get(p2_name)
-                is_p1_t1 = p1_id in tier1_player_ids_f; is_p2_t1 = p2_id in tier1_player_ids_f
-
-                if p1_pos and p2_pos and p1_pos != p2_pos and not (is_p1_t1 and is_p2_t1):
-                    total_allies_vars = [are_allies.get((id1, id2, g), 0) for g in range(num_games)]
-                    valid_ally_vars = [v for v in total_allies_vars if isinstance(v, cp_model.IntVar)]
-                    if valid_ally_vars:
-                         total_allies = model.NewIntVar(0, num_games, f'total_allies_{id1}_{id2}')
-                         model.Add(total_allies == sum(valid_ally_vars))
-                         never_ally = model.NewBoolVar(f'never_ally_{id1}_{id2}')
-                         model.Add(total_allies == 0).OnlyEnforceIf(never_ally)
-                         model.Add(total_allies >= 1).OnlyEnforceIf(never_ally.Not())
-                         never_allies_vars.append(never_ally)
-                         zero_matchups_count += 1
-
-    model.Minimize(sum(never_enemies_vars) + sum(never_allies_vars))
-    update_status(f"[최적화 목표 설정 완료] 총 {zero_matchups_count}개의 0회 매치업 변수 고려.")
-
-    # --- 솔버 실행 ---
-    update_status(f"\n--- 총 약 {constraint_count}개의 주요 제약 추가 완료 ---")
-    update_status("\n[솔버 실행] CP-SAT 솔버 해 찾기 시작..."); solver = cp_model.CpSolver()
-    solver.parameters.num_search_workers = 8; update_status(f"[솔버 설정] 병렬 워커 수: {solver.parameters.num_search_workers}")
-    solver.parameters.max_time_in_seconds = float(time_limit_seconds)
-    update_status(f"[솔버 설정] 최대 실행 시간: {time_limit_seconds}초")
-
-    status = cp_model.UNKNOWN
-    try:
-        spinner_message = f'CP-SAT 솔버가 해를 찾고 있습니다... (최대 {time_limit_seconds}초)'
-        with st.spinner(spinner_message):
-            status = solver.Solve(model)
-    except Exception as e:
-        update_status(f"[솔버 오류] {e}");
-        return None, None, status_messages, cp_model.UNKNOWN
-
-    end_time = time.time();
-    update_status(f"\n[솔버 실행 완료] 소요 시간: {solver.WallTime():.2f}초 (요청 시간 제한: {time_limit_seconds}초)")
-    update_status(f"[솔버 상태] 결과: {solver.StatusName(status)}")
-    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-        objective_value = solver.ObjectiveValue()
-        update_status(f"[솔버 결과] 목표 값 (0회 매치업 수): {objective_value}")
-    elif status == cp_model.INFEASIBLE:
-         update_status("[솔버 결과] 모델이 비현실적입니다 (제약 조건을 만족하는 해 없음). 제약 조건을 확인하거나 완화해 보세요.")
-    elif status == cp_model.MODEL_INVALID:
-         update_status("[솔버 결과] 모델 정의에 오류가 있습니다.")
-
-    # --- 결과 처리 ---
-    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-        update_status(f"[결과 처리] 성공! 스케줄 데이터 추출 중..."); schedule = {}; solution_assignments = {}; extraction_ok = True
+        st.error(f"검증: 하드 제약 위반 {len(report.violations)}건")
+        st.dataframe(pd.DataFrame(report.violations, columns=['규칙', '내용']), hide_index=True, use_container_width=True)
+        if report.objective is not None: st.caption(f"0회 매치업 {report.objective}개 (적군 {report.never_enemies}, 아군 {report.never_allies})")
+    if analytics is not None:
+        tabs = st.tabs([f"0회 매치업 쌍 ({len(analytics['zero_pairs'])})", "적군 만남 히트맵", "아군 만남 히트맵", "날짜별 출전 수"])
+        with tabs[0]:
+            st.caption("목표가 채우지 못한 쌍: 한 번도 적으로 만나지 않은 쌍 + 한 번도 같은 팀이 되지 않은 쌍 (같은 포지션 / 1티어끼리는 아군 대상 아님)")
+            st.dataframe(analytics['zero_pairs'], hide_index=True, use_container_width=True)
+        for tab, spec in zip(tabs[1:3], analytics['heatmaps']):
+            with tab: st.vega_lite_chart(spec, use_container_width=True)
+        with tabs[3]: st.dataframe(analytics['games_per_day'], use_container_width=True)
+
+
+def make_schedule_downloads(game_days, assignments, objective, roster):
+    # 스케줄 내보내기 바이트 [(형식, MIME, 데이터)] (JSON / CSV / Parquet, Parquet 엔진이 없으면 생략)
+    from schedule_solver import export_schedule
+    player_data, positions = roster; downloads = []
+    for fmt, mime in (('json', 'application/json'), ('csv', 'text/csv'), ('parquet', 'application/octet-stream')):
         try:
-            solution_game_days = [solver.Value(game_day[g]) for g in range(num_games)]
-            for g in range(num_games):
-                day_num = solution_game_days[g] + 1
-                schedule[g] = {'day': day_num, 'teams': [[] for _ in range(num_teams_per_game)], 'game_id': g + 1}
-                for t in range(num_teams_per_game):
-                    for p_idx in pos_indices:
-                        key = (g, t, p_idx)
-                        if key in assignment:
-                            player_id = solver.Value(assignment[key])
-                            solution_assignments[key] = player_id
-                        else:
-                             solution_assignments[key] = -1
-                             extraction_ok = False
-                             update_status(f"[결과 오류] 키 없음: g={g},t={t},p={p_idx}")
-
-            if extraction_ok: update_status("[결과 처리] 스케줄 데이터 추출 완료.")
-            else: pass
-
-            return schedule, solution_assignments, status_messages, status
-        except Exception as e:
-             update_status(f"[결과 처리 오류] 값 추출 중 예외 발생: {e}")
-             return None, None, status_messages, status
+            downloads.append((fmt, mime, export_schedule(fmt, positions, player_data, num_teams_per_game, game_days, assignments, objective)))
+        except ImportError: # Parquet 엔진(pyarrow) 없음
+            continue
+    return downloads
 
-    else:
-        update_status(f"[결과 처리] 실패.")
-        return None, None, status_messages, status
+
+def show_schedule_downloads(downloads, key):
+    for col, (fmt, mime, data) in zip(st.columns(3), downloads):
+        col.download_button(f"{fmt.upper()} 다운로드", data=data, file_name=f"schedule.{fmt}", mime=mime, key=f"{key}_{fmt}")
+
+
+def session_memo(name, key, compute):
+    # st.session_state[name] 에 (key, 값) 하나만 기억: 같은 key 로 다시 그리면 계산 없이 재사용
+    cached = st.session_state.get(name)
+    if cached is None or cached[0] != key:
+        cached = st.session_state[name] = (key, compute())
+    return cached[1]
+
+
+def make_uploaded_schedule_view(uploaded_file, banned_players_by_day, roster):
+    # 불러온 스케줄 파일 -> 날짜/배정 + 표시용 표 + 검증 결과/분석 (읽지 못하면 {'error': 메시지})
+    from schedule_solver import validate_schedule, import_schedule, make_schedule_dict
+    from schedule_validate import schedule_format_of
+    player_data, positions = roster
+    try:
+        game_days, assignments = import_schedule(schedule_format_of(uploaded_file.name), uploaded_file.getvalue(), positions, player_data,
+                                                 num_teams_per_game=num_teams_per_game)
+    except Exception as e:
+        return {'error': str(e)}
+    report = validate_schedule(positions, player_data, num_teams_per_game, len(positions), banned_players_by_day, game_days, assignments)
+    return {'game_days': game_days, 'assignments': assignments, 'report': report,
+            'display_df': build_schedule_display_df(make_schedule_dict(game_days, num_teams_per_game), assignments, roster),
+            'analytics': make_schedule_analytics(report, game_days, assignments, roster)}
+
+
+def result_message(result, stop_requested):
+    # 끝난 작업의 상태 -> (st 함수 이름, 문구)
+    from ortools.sat.python import cp_model
+    status = result.status; core = result.infeasibility_core
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) and result.changed_slots is not None: # 수리 작업: 처음부터 푼 최적 스케줄과 구분
+        if status == cp_model.OPTIMAL:
+            return 'success', "수리 완료! 게임 날짜를 유지한 채 모든 게임을 다시 배정해 변경이 가장 적은 스케줄을 찾았습니다."
+        return 'success', "수리 완료! 새 출전 금지에 걸린 게임 주변만 다시 배정했습니다. (기존 스케줄 유지 우선, 처음부터 푼 최적 스케줄은 아닐 수 있습니다)"
+    if status == cp_model.OPTIMAL:
+        return 'success', "성공! 최적 스케줄 발견!"
+    if status == cp_model.FEASIBLE and result.violations:
+        return 'warning', f"완화를 허용한 규칙 위반 {len(result.violations)}건이 있는 스케줄입니다. 아래 검증 결과에서 위반 쌍을 확인하세요."
+    if status == cp_model.FEASIBLE and stop_requested:
+        return 'success', "사용자 요청으로 중단했습니다. 지금까지 찾은 최선의 스케줄을 표시합니다."
+    if status == cp_model.FEASIBLE and result.stop_reason:
+        return 'success', f"성공! 조기 종료 조건 충족으로 실행 가능한 스케줄 반환. (⏱️ {result.stop_reason})"
+    if status == cp_model.FEASIBLE:
+        return 'success', "성공! 실행 가능한 스케줄 발견! (시간 제한 도달, 최적해가 아닐 수 있습니다)"
+    if status == cp_model.INFEASIBLE and result.precheck_issues:
+        return 'error', "실패: 출전 금지 사전 점검에서 불가능이 확인되었습니다. (INFEASIBLE)\n\n" + "\n".join(f"- {issue}" for issue in result.precheck_issues)
+    if status == cp_model.INFEASIBLE and core and core['status'] == 'conflict':
+        return 'error', ("실패: 제약 조건을 모두 만족하는 스케줄을 찾을 수 없습니다. (INFEASIBLE)\n\n"
+                         f"다음 출전 금지/규칙이 함께 충돌합니다 ({'하나만 풀어도 해가 생김' if core['minimal'] else '시간 제한으로 최소화가 끝나지 않음'}, "
+                         f"진단 {core['seconds']:.1f}초):\n\n" + "\n".join(f"- {item['label']}" for item in core['items']))
+    if status == cp_model.INFEASIBLE and core and core['status'] == 'structural':
+        return 'error', "실패: 출전 금지와 무관하게 기본 규칙(포지션/1티어 구성) 자체로 스케줄을 만들 수 없습니다. (INFEASIBLE)"
+    if status == cp_model.INFEASIBLE:
+        return 'error', "실패: 제약 조건을 모두 만족하는 스케줄을 찾을 수 없습니다. (INFEASIBLE) 연속 경기 금지 조건이 너무 엄격할 수 있습니다."
+    if status == cp_model.MODEL_INVALID:
+        return 'error', "실패: 모델 정의에 오류가 있습니다. (MODEL_INVALID)"
+    if stop_requested:
+        return 'warning', "사용자 요청으로 중단했습니다. 중단 전까지 실행 가능한 스케줄을 찾지 못했습니다."
+    return 'error', f"실패: 스케줄을 찾지 못했습니다. (상태: {result.status_name})"
+
+
+def job_roster(job):
+    # 작업을 시작할 때의 명단 (도중에 명단을 바꿔도 선수 ID 가 어긋나지 않게 결과/진행 표시는 이 명단 기준)
+    return job.solve_kwargs['player_data'], job.solve_kwargs['positions']
+
+
+def make_result_view(job):
+    # 끝난 작업 -> 결과 화면에 필요한 것 전부 (상태 문구, 표시용 표, 검증/분석, 내려받기 바이트).
+    # 세션에 저장해 두고 이후 rerun (다른 위젯 조작, 내려받기 클릭 등) 에서는 그리기만 함
+    import pandas as pd
+    from schedule_solver import make_schedule_dict, validate_schedule
+    if job.error is not None:
+        raise job.error
+    result = job.result; job_bans = job.solve_kwargs['banned_players_by_day']
+    roster = job_roster(job); player_data, positions = roster
+    view = {
+        'result': result, 'bans': job_bans, 'roster': roster,
+        'notes': [f"{NUM_GAMES} 게임 스케줄 생성 시도 (0회 매치업 최소화 목표, 최대 {job.solve_kwargs['time_limit_seconds']}초)...",
+                  f"실행 완료. (실제 소요 시간: {job.finished_at - job.started_at:.2f}초 / 요청 시간 제한: {job.solve_kwargs['time_limit_seconds']}초)"],
+        'message': result_message(result, job.stop_requested), 'final': None, 'alternatives': None, # 중단 = 이 세션의 중단 요청
+        'timeline': timeline_chart(result.timeline) if result.timeline else None,
+    }
+    if result.found and result.schedule and result.solution_assignments:
+        report = validate_schedule(positions, player_data, num_teams_per_game, len(positions), job_bans, result.game_days, result.solution_assignments)
+        view['final'] = {'display_df': build_schedule_display_df(result.schedule, result.solution_assignments, roster), 'report': report,
+                         'analytics': make_schedule_analytics(report, result.game_days, result.solution_assignments, roster),
+                         'downloads': make_schedule_downloads(result.game_days, result.solution_assignments, result.objective, roster)}
+    if result.found and result.alternatives and len(result.alternatives) > 1:
+        alternatives = result.alternatives
+        view['alternatives'] = {
+            'summary': pd.DataFrame([{'스케줄': f"#{i + 1}", '0회 매치업': alt['objective'], '#1 과 다른 슬롯 수': alt['distance']}
+                                     for i, alt in enumerate(alternatives)]),
+            'labels': [f"#{i + 1} (0회 매치업 {alt['objective']})" for i, alt in enumerate(alternatives)],
+            'dfs': [build_schedule_display_df(make_schedule_dict(alt['game_days'], num_teams_per_game), alt['solution_assignments'], roster)
+                    for alt in alternatives],
+        }
+    return view
+
+
+def show_result_view(view):
+    # make_result_view 결과 그리기 (계산 없음)
+    import pandas as pd
+    result = view['result']
+    for note in view['notes']: st.info(note)
+    level, text = view['message']
+    getattr(st, level)(text)
+    final = view['final']
+    if final is not None:
+        if result.changed_slots is not None: # 수리 작업
+            st.info(f"🔧 수리 결과: 전체 {len(result.solution_assignments)}개 슬롯 중 {result.changed_slots}개 변경.")
+        st.header(f"📊 최종 스케줄 ({NUM_GAMES} 게임)")
+        if not final['display_df'].empty:
+            st.dataframe(final['display_df'], hide_index=True, use_container_width=True)
+        else:
+            st.warning("스케줄 데이터 생성 중 문제가 발생했습니다.")
+        show_validation_report(final['report'], final['analytics'])
+        show_schedule_downloads(final['downloads'], key="download_final")
+
+    alternatives = view['alternatives']
+    if alternatives is not None:
+        alt_dfs = alternatives['dfs']
+        st.header(f"🔀 대안 스케줄 {len(alt_dfs)}개")
+        st.dataframe(alternatives['summary'], hide_index=True)
+        for i, tab in enumerate(st.tabs(alternatives['labels'])):
+            with tab:
+                if i and alt_dfs[i].shape == alt_dfs[0].shape:
+                    st.caption("#1 과 다른 칸을 노란색으로 표시합니다.")
+                    st.dataframe(alt_dfs[i].style.apply(highlight_changes, base_df=alt_dfs[0], axis=None).hide(axis="index"),
+                                 use_container_width=True)
+                else:
+                    st.dataframe(alt_dfs[i], hide_index=True, use_container_width=True)
+
+    if view['timeline'] is not None:
+        with st.expander("목표 값 / 하한 타임라인", expanded=True):
+            st.vega_lite_chart(view['timeline'], use_container_width=True)
+
+    if result.profile or result.solver_stats:
+        with st.expander("빌드 / 솔버 계측"):
+            if result.profile:
+                st.dataframe(pd.DataFrame(result.profile).rename(columns={
+                    'family': '제약 계열', 'label': '구간', 'seconds': '시간(초)', 'vars': '변수 +', 'constraints': '제약 +'}),
+                    use_container_width=True, hide_index=True)
+            if result.solver_stats:
+                st.dataframe(pd.DataFrame([{'항목': k, '값': str(v)} for k, v in result.solver_stats.items()]),
+                             use_container_width=True, hide_index=True)
+            st.download_button("계측 JSON 다운로드", file_name="solve_instrumentation.json", mime="application/json",
+                               data=json.dumps({'profile': result.profile, 'solver_stats': result.solver_stats,
+                                                'timeline': result.timeline, 'stop_reason': result.stop_reason,
+                                                'log': result.log}, ensure_ascii=False, indent=2))
+
+    with st.expander("상세 실행 로그 보기"):
+        st.text("\n".join(result.status_messages))
 
 
 # --- Streamlit UI (변경 없음) ---
@@ -455,11 +301,109 @@ st.title("🎮 선수 팀 배정 스케줄 생성기 (10 게임 고정)")
 st.caption(f"총 {NUM_GAMES} 게임 ({NUM_DAYS}일 자동 분배, 1일 3~4게임) | 1티어 1회씩 맞대결 | 동포지션 적군 1회 고정 | 아군 조합 0회 매치업 최소화 | 적군 조합 0회 매치업 최소화") # <<< 캡션 수정
 
 with st.sidebar:
+    st.header("👥 선수 명단")
+    roster_file = st.file_uploader(
+        "명단 파일 (JSON / CSV / Parquet)", type=['json', 'csv', 'parquet'], key="roster_upload",
+        help=f"선수 한 명당 한 행: {', '.join(ROSTER_COLUMNS)} (순위 1 = 1티어). JSON 은 기본 명단과 같은 {{포지션: {{순위: [별명, 이름]}}}} 모양도 됩니다. "
+             "비우면 기본 명단을 사용합니다."
+    )
+    roster_data = default_player_data
+    if roster_file is not None:
+        try:
+            roster_data = load_roster(roster_format_of(roster_file.name), roster_file.getvalue())
+        except ValueError as e:
+            st.error(f"명단을 읽지 못해 기본 명단을 사용합니다.\n\n{e}")
+        except ImportError as e: # Parquet 엔진(pyarrow / fastparquet)이 없는 환경
+            st.error(f"Parquet 명단을 읽으려면 pyarrow (또는 fastparquet) 설치가 필요합니다. 기본 명단을 사용합니다.\n\n{e}")
+    if st.session_state.get('roster_key') != roster_key(roster_data):
+        # 명단이 바뀌면 선수 선택지가 달라지므로 출전 금지 선택을 비움 (기존 스케줄은 아래에서 명단 키로 걸러짐)
+        if 'roster_key' in st.session_state:
+            for d in range(1, NUM_DAYS + 1): st.session_state.pop(f"ban_day_{d}", None)
+        st.session_state.roster_key = roster_key(roster_data)
+    # 이 실행의 명단 (아래 UI/해 찾기 요청은 모두 이 값을 씀)
+    roster_source = "기본 명단" if roster_data is default_player_data else "업로드한 명단"
+    roster_positions = list(roster_data); roster_players_per_team = len(roster_positions); roster = (roster_data, roster_positions)
+    (_, _, _, _, _, roster_tier1, _, _, roster_size, _, _, _, display_player_options, _, _) = process_player_data(roster_data)
+    st.caption(f"{roster_source}: 선수 {roster_size}명 | 포지션 {' / '.join(roster_positions)} | 1티어 {len(roster_tier1)}명")
+    for col, fmt in zip(st.columns(2), ('csv', 'json')):
+        col.download_button(f"명단 {fmt.upper()}", data=dump_roster(fmt, roster_data), file_name=f"roster.{fmt}", key=f"roster_download_{fmt}",
+                            help="현재 명단을 내려받아 고친 뒤 다시 올릴 수 있습니다.")
     st.header("⚙️ 계산 시간(초)")
     time_limit_sec = st.slider(
         "시간이 올라갈 수록 대진 퀄리티 증가", min_value=10, max_value=300, value=10, step=10,
         help="솔버가 해를 찾는 최대 시간을 설정합니다."
     )
+    with st.expander("⏱️ 조기 종료 조건 (0 = 사용 안 함)"):
+        st.caption("조건 중 하나라도 충족되면 시간 제한 전에 현재 최선 스케줄로 끝냅니다.")
+        stop_no_improve_ui = st.number_input("개선 없음 (초)", min_value=0, max_value=300, value=0, step=5, key="stop_no_improvement",
+                                             help="마지막으로 더 좋은 스케줄을 찾은 뒤 이 시간 동안 개선이 없으면 종료")
+        stop_target_ui = st.number_input("목표 0회 매치업 수 이하", min_value=0, value=0, step=1, key="stop_target_objective")
+        stop_rel_gap_ui = st.number_input("상대 gap (%) 이하", min_value=0.0, max_value=100.0, value=0.0, step=1.0, key="stop_relative_gap",
+                                          help="(목표 값 - 하한) / 목표 값")
+        stop_criteria_ui = None
+        if stop_no_improve_ui or stop_target_ui or stop_rel_gap_ui:
+            stop_criteria_ui = StopCriteria(relative_gap=stop_rel_gap_ui / 100 if stop_rel_gap_ui else None,
+                                            no_improvement_seconds=stop_no_improve_ui or None,
+                                            target_objective=stop_target_ui or None)
+    with st.expander("🔀 대안 스케줄"):
+        st.caption("한 번의 실행으로 서로 다른 준최적 스케줄을 여러 개 받아 나란히 비교합니다. (시간의 30%를 대안 찾기에 사용)")
+        num_alternatives_ui = st.number_input("스케줄 수", min_value=1, max_value=5, value=1, step=1, key="num_alternatives")
+        alternative_tolerance_ui = st.number_input("최선 대비 허용 0회 매치업 증가", min_value=0, max_value=50, value=ALTERNATIVE_TOLERANCE,
+                                                   step=1, key="alternative_tolerance")
+        alternative_distance_ui = st.number_input("서로 다른 최소 슬롯 수", min_value=1, max_value=NUM_GAMES * num_teams_per_game * roster_players_per_team,
+                                                  value=ALTERNATIVE_MIN_DISTANCE, step=1, key="alternative_min_distance")
+    st.subheader("🧠 해 찾기 엔진")
+    engine_ui = st.selectbox(
+        "엔진", options=list(ENGINE_LABELS.keys()), format_func=lambda engine: ENGINE_LABELS[engine], key="engine",
+        help="로컬 서치는 휴리스틱 초기 스케줄에서 출발해 팀/선수/게임 교환을 담금질로 반복합니다. 최적 증명은 없지만 "
+             "큰 명단이나 CP-SAT 이 좋은 해에 늦게 도달할 때 더 빨리 좋은 스케줄을 줍니다. (모델 빌드 모드/캐시/대안/조기 종료는 CP-SAT 전용)"
+    )
+    ls_processes_ui = st.number_input("병렬 프로세스 수 (시드별)", min_value=1, max_value=max(1, available_cores()), value=1, step=1,
+                                      key="ls_processes", disabled=engine_ui != ENGINE_LOCAL_SEARCH,
+                                      help="2 이상이면 시드만 다른 담금질을 프로세스마다 돌려 가장 좋은 해를 고릅니다 (진행 중 스케줄 표시 없음).")
+    st.subheader("🧩 모델 빌드 모드")
+    model_mode_ui = st.selectbox(
+        "CP-SAT 모델 구성 방식", options=list(MODEL_MODE_LABELS.keys()),
+        format_func=lambda mode: MODEL_MODE_LABELS[mode], key="model_mode",
+        help="불리언 one-hot 모드는 하나의 x[g,t,p] 격자에서 출전/1티어/아군/적군을 선형 제약으로 유도해 모델이 훨씬 작습니다."
+    )
+    symmetry_breaking_ui = st.checkbox(
+        "대칭 제거 (날짜 고정 배치)", value=False, key="symmetry_breaking",
+        help=f"게임을 {GAMES_PER_DAY} 순서의 연속 블록으로 날짜에 고정하고, 팀 A/B 교환·같은 날 게임 순서 뒤집기 등 "
+             "동일한 스케줄의 중복 탐색을 제거합니다. 연속 경기 금지는 표시되는 경기 순서 그대로 적용됩니다."
+    )
+    heuristic_ui = st.checkbox(
+        "휴리스틱 초기 스케줄", value=True, key="use_heuristic",
+        help="1티어 맞대결 계획 → 포지션별 출전 배정 순서로 모든 제약을 만족하는 스케줄을 수 ms 안에 만들어 솔버 힌트로 넘깁니다. "
+             "해 찾기 직후부터 스케줄이 표시되고, 시간 안에 더 좋은 해가 없으면 이 스케줄을 반환합니다."
+    )
+    rolling_ui = st.checkbox(
+        "롤링 호라이즌 (날짜 단위 분할)", value=False, key="rolling_horizon",
+        help="1티어 맞대결을 먼저 계획한 뒤 며칠씩 나눠서 순서대로 풉니다. 큰 토너먼트용이며, 창 사이에 만남 횟수와 출전 수를 넘겨 "
+             "토너먼트 전체 제약을 유지합니다. (모델 빌드 모드/대칭 제거/캐시는 사용하지 않음)"
+    )
+    window_days_ui = st.slider("창 크기 (일)", min_value=1, max_value=NUM_DAYS, value=DEFAULT_WINDOW_DAYS, key="rolling_window_days",
+                               disabled=not rolling_ui)
+    relax_c5_ui = st.checkbox("(C5) 완화 허용", value=False, key="rolling_relax_c5", disabled=not rolling_ui,
+                              help="같은 포지션 적군 1회를 모두 만족할 수 없을 때 벌점으로 바꿔 스케줄을 만듭니다. 위반한 쌍은 결과에 표시됩니다.")
+    st.subheader("🚦 서버 대기열")
+    solve_scheduler = get_default_scheduler()
+    solve_scheduler.prewarm() # 서버 프로세스에서 한 번만: 솔버 스택 import + 예열 (첫 "시작" 의 콜드 스타트 제거)
+    queue_stats = solve_scheduler.stats()
+    st.caption(f"실행 중 {queue_stats['running']}/{queue_stats['max_concurrent']}건 | 대기 {queue_stats['queued']}건 | "
+               f"워커 {queue_stats['workers_in_use']}/{queue_stats['max_workers']}개 (한 건당 {queue_stats['workers_per_solve']}개) | "
+               f"합쳐진 요청 {queue_stats['merged']}건 | 솔버 {'예열됨' if queue_stats['warm'] else '예열 중'} ({queue_stats['backend']})")
+    st.subheader("🗄️ 스케줄 캐시")
+    schedule_cache = ScheduleCache()
+    use_cache_ui = st.checkbox(
+        "캐시 사용", value=True, key="use_schedule_cache",
+        help="같은 선수 명단/출전 금지 조합의 최적해는 즉시 반환하고, 실행 가능 해는 힌트로 이어서 개선합니다."
+    )
+    model_templates = get_default_templates()
+    st.caption(f"저장된 스케줄: {len(schedule_cache)}개 (최대 {schedule_cache.max_entries}개) | 모델 템플릿: {len(model_templates)}개")
+    if st.button("캐시 비우기", key="clear_schedule_cache", help="저장된 스케줄과 구조 모델 템플릿을 모두 지웁니다."):
+        schedule_cache.clear(); model_templates.clear()
+        st.rerun()
     st.subheader("🚫 날짜별 출전 금지 선수")
     banned_players_by_day_ui = defaultdict(set)
     for d in range(1, NUM_DAYS + 1):
@@ -468,120 +412,169 @@ with st.sidebar:
         banned_list_display = st.multiselect(f"{d}일차 출전 금지 선수", options=display_player_options, default=default_banned_display, key=multi_select_key)
         if banned_list_display:
             banned_players_by_day_ui[d] = set(banned_list_display)
+    # 출전 금지를 바꿀 때마다 사전 점검 (수 ms): 확실히 불가능한 조합은 병목을 보여 주고 시작 버튼 비활성화
+    precheck_start = time.time()
+    precheck_issues_ui = precheck_bans(roster_positions, roster_data, num_teams_per_game, roster_players_per_team,
+                                       dict(banned_players_by_day_ui), fixed_day_layout=symmetry_breaking_ui)
+    if precheck_issues_ui:
+        st.error("출전 금지 조합으로는 스케줄을 만들 수 없습니다:\n\n" + "\n".join(f"- {issue}" for issue in precheck_issues_ui))
+    elif banned_players_by_day_ui:
+        st.caption(f"✅ 사전 점검 통과 ({(time.time() - precheck_start) * 1000:.1f}ms) - 최종 판정은 솔버가 합니다.")
+    if st.button("모델 크기 비교 (해 찾기 없음)", key="compare_model_modes"):
+        with st.spinner("두 모드로 모델을 빌드하는 중..."):
+            import pandas as pd
+            from schedule_solver import compare_model_modes
+            st.dataframe(pd.DataFrame(compare_model_modes(
+                roster_positions, roster_data, num_teams_per_game, roster_players_per_team,
+                dict(banned_players_by_day_ui), symmetry_breaking=symmetry_breaking_ui)), hide_index=True)
+
+    # 게시된(마지막으로 성공한) 스케줄이 있고 출전 금지가 바뀌었으면 전체 재계산 대신 수리 가능
+    last_schedule = st.session_state.get('last_schedule')
+    current_bans = {d: sorted(names) for d, names in banned_players_by_day_ui.items()}
+    if last_schedule is not None and last_schedule.get('roster') != st.session_state.roster_key: # 다른 명단으로 만든 스케줄은 수리 기준이 될 수 없음
+        st.session_state.pop('last_schedule', None); last_schedule = None
+    if last_schedule is not None and last_schedule['bans'] != current_bans and st.session_state.get('solve_job') is None:
+        st.subheader("🔧 기존 스케줄 수리")
+        st.caption("출전 금지가 바뀐 게임만 다시 최적화하고 나머지 게임은 그대로 유지합니다.")
+        if st.button("변경된 출전 금지로 기존 스케줄 수리", key="repair_button"):
+            st.session_state.solve_job = solve_scheduler.submit(dict(
+                positions=roster_positions, player_data=roster_data,
+                num_teams_per_game=num_teams_per_game, players_per_team=roster_players_per_team,
+                banned_players_by_day=dict(banned_players_by_day_ui),
+                time_limit_seconds=time_limit_sec,
+                previous_game_days=last_schedule['game_days'],
+                previous_assignments=last_schedule['assignments'],
+                model_mode=model_mode_ui
+            ), solve_fn='schedule_solver:repair_schedule')
+            st.rerun()
+
+    st.subheader("📂 스케줄 불러오기 / 검증")
+    uploaded_schedule = st.file_uploader(
+        "JSON / CSV / Parquet", type=['json', 'csv', 'parquet'], key="schedule_upload",
+        help="내보낸 스케줄이나 손으로 고친 스케줄을 현재 출전 금지 조건으로 즉시 검증하고 0회 매치업 수를 다시 계산합니다 (해 찾기 없음)."
+    )
 
 st.header("🚀 시작 버튼을 누르신 후, 계산이 진행되는 동안 잠시 기다리시고 스크롤을 내려주세요.")
 
-# <<< 버튼 상태 관리를 위한 세션 상태 초기화 >>>
-if 'processing_started' not in st.session_state:
-    st.session_state.processing_started = False
+if uploaded_schedule is not None:
+    with st.expander(f"📂 불러온 스케줄: {uploaded_schedule.name}", expanded=True):
+        # 같은 파일 / 출전 금지 / 명단이면 다시 읽거나 검증하지 않음
+        loaded = session_memo('uploaded_schedule_view', (uploaded_schedule.file_id, str(current_bans), st.session_state.roster_key),
+                              lambda: make_uploaded_schedule_view(uploaded_schedule, dict(banned_players_by_day_ui), roster))
+        if 'error' in loaded:
+            st.error(f"스케줄을 읽지 못했습니다: {loaded['error']}")
+        else:
+            st.dataframe(loaded['display_df'], hide_index=True, use_container_width=True)
+            show_validation_report(loaded['report'], loaded['analytics'])
+            if loaded['report'].valid and st.button("이 스케줄을 기존 스케줄로 사용 (출전 금지 변경 시 수리 기준)", key="use_loaded_schedule"):
+                st.session_state.last_schedule = {'game_days': loaded['game_days'], 'assignments': loaded['assignments'], 'bans': current_bans,
+                                                 'roster': roster_key(roster_data)}
+                st.rerun()
+
+# <<< 백그라운드 해 찾기 작업 상태 (세션별) >>>
+# 작업이 세션에 남아 있는 동안에는 다른 위젯을 조작해 rerun 이 일어나도 해 찾기가 계속됨
+if 'solve_job' not in st.session_state:
+    st.session_state.solve_job = None
 
 # <<< 버튼 표시 영역 >>>
 button_placeholder = st.empty() # 버튼을 표시하거나 지울 컨테이너
 
-if not st.session_state.processing_started:
+if st.session_state.solve_job is None:
     # 아직 처리 시작 전이면 버튼 표시
-    if button_placeholder.button(f"{NUM_GAMES} 게임 스케줄 생성 시작!", key="start_button"):
-        st.session_state.processing_started = True
-        # 버튼 클릭 시 상태 변경 후 Streamlit이 자동으로 rerun 함
+    if button_placeholder.button(f"{NUM_GAMES} 게임 스케줄 생성 시작!", key="start_button", disabled=bool(precheck_issues_ui)):
+        solve_kwargs = dict(
+            positions=roster_positions, player_data=roster_data,
+            num_teams_per_game=num_teams_per_game, players_per_team=roster_players_per_team,
+            banned_players_by_day=dict(banned_players_by_day_ui),
+            time_limit_seconds=time_limit_sec
+        )
+        if rolling_ui:
+            st.session_state.solve_job = solve_scheduler.submit(dict(solve_kwargs, window_days=window_days_ui, relax_c5=relax_c5_ui), solve_fn='schedule_rolling:solve_schedule_rolling')
+        elif engine_ui == ENGINE_LOCAL_SEARCH:
+            st.session_state.solve_job = solve_scheduler.submit(dict(solve_kwargs, symmetry_breaking=symmetry_breaking_ui, num_processes=ls_processes_ui),
+                                                                solve_fn='schedule_local_search:solve_schedule_local_search', workers_arg='num_processes')
+        else:
+            st.session_state.solve_job = solve_scheduler.submit(dict(
+                solve_kwargs,
+                model_mode=model_mode_ui,
+                symmetry_breaking=symmetry_breaking_ui,
+                cache=schedule_cache if use_cache_ui else None,
+                stop_criteria=stop_criteria_ui,
+                use_heuristic=heuristic_ui,
+                num_alternatives=num_alternatives_ui,
+                alternative_tolerance=alternative_tolerance_ui,
+                alternative_min_distance=alternative_distance_ui
+            ))
         st.rerun() # 명시적으로 rerun을 호출하여 즉시 버튼을 숨김
 
 # <<< 스케줄 생성 및 결과 표시 영역 >>>
-if st.session_state.processing_started:
+if st.session_state.solve_job is not None:
     # 처리 시작 상태이면 버튼 컨테이너 비우기 (버튼 숨김)
     button_placeholder.empty()
-
-    results_area = st.container()
-    with results_area:
-        st.info(f"{NUM_GAMES} 게임 스케줄 생성 시도 (0회 매치업 최소화 목표, 최대 {time_limit_sec}초)...")
-        overall_status_logs = []
-        search_start_time = time.time()
-        solution_found = False
-        final_schedule = None; final_assignments = None
-        final_status = cp_model.UNKNOWN
-
-        try: # solve_schedule 및 결과 처리 전체를 try 블록으로 감싸서 상태 리셋 보장
-            schedule_result, assignment_result, status_log, final_status = solve_schedule(
-                positions=positions, player_data=player_data,
-                num_teams_per_game=num_teams_per_game, players_per_team=players_per_team,
-                banned_players_by_day=dict(banned_players_by_day_ui),
-                time_limit_seconds=time_limit_sec
-            )
-            overall_status_logs.extend(status_log)
-
-            search_end_time = time.time()
-            st.info(f"실행 완료. (실제 소요 시간: {search_end_time - search_start_time:.2f}초 / 요청 시간 제한: {time_limit_sec}초)")
-
-            if final_status == cp_model.OPTIMAL:
-                st.success(f"성공! 최적 스케줄 발견!")
-                final_schedule = schedule_result; final_assignments = assignment_result; solution_found = True
-            elif final_status == cp_model.FEASIBLE:
-                st.success(f"성공! 실행 가능한 스케줄 발견! (시간 제한 도달, 최적해가 아닐 수 있습니다)")
-                final_schedule = schedule_result; final_assignments = assignment_result; solution_found = True
-            elif final_status == cp_model.INFEASIBLE:
-                st.error(f"실패: 제약 조건을 모두 만족하는 스케줄을 찾을 수 없습니다. (INFEASIBLE) 연속 경기 금지 조건이 너무 엄격할 수 있습니다.")
-            elif final_status == cp_model.MODEL_INVALID:
-                 st.error(f"실패: 모델 정의에 오류가 있습니다. (MODEL_INVALID)")
-            else:
-                 st.error(f"실패: 스케줄을 찾지 못했습니다. (상태: {cp_model.CpSolverStatus.Name(final_status)})")
-
-
-            if solution_found and final_schedule and final_assignments:
-                st.header(f"📊 최종 스케줄 ({NUM_GAMES} 게임)")
-                # ... (스케줄 표 생성 및 표시 로직 - 이전과 동일) ...
-                schedule_table_data = []
-                pos_indices = list(range(len(positions)))
-                sorted_games = sorted(final_schedule.keys(), key=lambda g: (final_schedule[g]['day'], final_schedule[g]['game_id']))
-
-                for g in sorted_games:
-                    game_info = final_schedule[g]
-                    game_data = {'Day': game_info['day'], 'Game': game_info['game_id'], 'vs': 'vs'}
-                    for t in range(num_teams_per_game):
-                        team_prefix = 'Team A' if t == 0 else 'Team B'
-                        for p_idx in pos_indices:
-                            player_id = final_assignments.get((g, t, p_idx), -1)
-                            display_text = "-"
-                            p_pos = positions[p_idx]
-                            if player_id != -1:
-                                _, p_alias_found, p_pos_found, _ = get_player_info(player_id)
-                                p_alias = p_alias_found if p_alias_found != "?" else "-"
-                                display_text = str(p_alias) if p_alias else "-"
-                                p_pos = p_pos_found if p_pos_found != "?" else p_pos
-
-                            column_name = f"{team_prefix} ({p_pos})"
-                            game_data[column_name] = display_text
-                    schedule_table_data.append(game_data)
-
-                if schedule_table_data:
-                    schedule_df = pd.DataFrame(schedule_table_data)
-                    schedule_df = schedule_df.sort_values(by=['Day', 'Game'])
-
-                    display_rows = []
-                    last_day = None
-                    column_order = ['Day']
-                    team_a_cols = [f"Team A ({pos})" for pos in positions]
-                    team_b_cols = [f"Team B ({pos})" for pos in positions]
-                    column_order.extend(team_a_cols)
-                    column_order.append('vs')
-                    column_order.extend(team_b_cols)
-                    blank_row_dict = {col: '' for col in column_order}
-
-                    for index, row in schedule_df.iterrows():
-                        current_day = row['Day']
-                        if last_day is not None and current_day != last_day:
-                            display_rows.append(blank_row_dict.copy())
-
-                        display_row_data = {col: row.get(col, '') for col in column_order}
-                        display_rows.append(display_row_data)
-                        last_day = current_day
-
-                    display_df = pd.DataFrame(display_rows, columns=column_order)
-                    st.dataframe(display_df.style.hide(axis="index"), use_container_width=True)
-
+    from schedule_solver import make_schedule_dict
+    job = st.session_state.solve_job
+    job_time_limit = job.solve_kwargs['time_limit_seconds']
+
+    results_area = st.empty() # 진행 상황 (끝나면 비우고 아래 결과 화면으로 바꿈)
+    with results_area.container():
+        st.info(f"{NUM_GAMES} 게임 스케줄 생성 시도 (0회 매치업 최소화 목표, 최대 {job_time_limit}초)...")
+
+        # --- 진행 중: 개선 해 스트리밍 + 중단 버튼 ---
+        if not job.done():
+            if job.merged:
+                st.caption(f"🔗 같은 요청이 이미 있어 그 작업의 결과를 함께 받습니다 (기다리는 세션 {job.subscribers}곳).")
+            if st.button("⏹ 중단하고 현재 최선 스케줄 유지", key="stop_button"):
+                job.stop()
+            progress_area = st.empty(); live_schedule_area = st.empty(); live_log_area = st.empty()
+            shown_incumbents = -1; shown_log_count = -1
+            while not job.done():
+                if job.queued():
+                    position, eta = job.queue_info()
+                    progress_area.warning(f"⏳ 대기 중: {position}번째 | 예상 시작 최대 {eta:.0f}초 후 | 대기 {time.time() - job.submitted_at:.0f}초 "
+                                          f"(동시 실행 한도 {solve_scheduler.max_concurrent}건)")
+                    time.sleep(0.5)
+                    continue
+                num_incumbents, latest = job.control.snapshot()
+                elapsed = time.time() - job.started_at
+                bound_text = "" if job.control.best_bound is None else f" | 하한 {job.control.best_bound:.0f}"
+                if latest is None:
+                    progress_area.info(f"해 찾는 중... 경과 {elapsed:.1f}초 / {job_time_limit}초 (아직 실행 가능한 스케줄 없음)")
                 else:
-                     st.warning("스케줄 데이터 생성 중 문제가 발생했습니다.")
-
-            with st.expander("상세 실행 로그 보기"):
-                st.text("\n".join(overall_status_logs))
-
-        finally:
-            st.session_state.processing_started = False
\ No newline at end of file
+                    stop_note = " | 중단 요청됨" if job.control.stop_requested else ""
+                    progress_area.info(
+                        f"개선 해 #{num_incumbents}: 0회 매치업 {latest['objective']:.0f}개{bound_text} | "
+                        f"해 발견 {latest['elapsed']:.1f}초 | 경과 {elapsed:.1f}초 / {job_time_limit}초{stop_note}")
+                    if num_incumbents != shown_incumbents:
+                        live_schedule_area.dataframe(
+                            build_schedule_display_df(make_schedule_dict(latest['game_days'], num_teams_per_game),
+                                                      latest['solution_assignments'], job_roster(job)),
+                            hide_index=True, use_container_width=True)
+                        shown_incumbents = num_incumbents
+                # 로그는 메시지마다가 아니라 폴링 주기(0.5초)마다 마지막 몇 줄만 다시 그림
+                log_count, log_tail = job.control.log_tail(LIVE_LOG_LINES)
+                if log_count != shown_log_count:
+                    live_log_area.code("\n".join(log_tail), language=None); shown_log_count = log_count
+                time.sleep(0.5)
+            progress_area.empty(); live_schedule_area.empty(); live_log_area.empty()
+
+    # --- 완료: 결과 화면을 한 번만 만들어 세션에 저장 ---
+    st.session_state.pop('result_view', None)
+    try: # 결과 처리 중 예외가 나도 작업 상태 리셋 보장
+        st.session_state.result_view = make_result_view(job)
+    finally:
+        if job.done():
+            st.session_state.solve_job = None
+    results_area.empty()
+    if st.session_state.result_view['final'] is not None:
+        result = st.session_state.result_view['result']
+        st.session_state.last_schedule = {
+            'game_days': [result.schedule[g]['day'] - 1 for g in sorted(result.schedule)],
+            'assignments': dict(result.solution_assignments),
+            'bans': {d: sorted(names) for d, names in job.solve_kwargs['banned_players_by_day'].items() if names},
+            'roster': roster_key(st.session_state.result_view['roster'][0]),
+        }
+
+# 마지막 결과 화면: 이후 rerun (위젯 조작, 내려받기 클릭 등) 에서는 저장된 표/분석을 그리기만 함
+result_view = st.session_state.get('result_view')
+if result_view is not None and st.session_state.solve_job is None:
+    show_result_view(result_view)
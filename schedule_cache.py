@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# 디스크 스케줄 캐시 (SQLite)
+# 키: player_data / 날짜별 출전 금지 / NUM_DAYS / GAMES_PER_DAY / 날짜 고정 배치 여부의 정규화 해시
+# 값: 지금까지 찾은 가장 좋은 solution_assignments, 게임 날짜, 목표 값, 증명된 하한
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "SCHEDULE_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".schedule_cache"))
+DEFAULT_MAX_ENTRIES = 200
+
+STATUS_OPTIMAL = "OPTIMAL"
+STATUS_FEASIBLE = "FEASIBLE"
+
+
+def make_cache_key(player_data, banned_players_by_day, num_days, games_per_day, fixed_day_layout=False):
+    # 포지션 순서는 선수 ID 부여 순서를 결정하므로 그대로 유지하고, 나머지는 정렬해서 정규화
+    canonical = {
+        'player_data': [[pos, [[rank, alias, name] for rank, (alias, name) in sorted(ranks.items())]]
+                        for pos, ranks in player_data.items()],
+        'banned_players_by_day': {str(day): sorted(names) for day, names in sorted(banned_players_by_day.items()) if names},
+        'num_days': num_days,
+        'games_per_day': list(games_per_day),
+        'fixed_day_layout': bool(fixed_day_layout),
+    }
+    payload = json.dumps(canonical, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _is_better(new, old):
+    # 최적 > 실행 가능, 그 다음 목표 값이 낮을수록 좋음
+    if old is None: return True
+    if new['objective'] != old['objective']: return new['objective'] < old['objective']
+    return new['status'] == STATUS_OPTIMAL and old['status'] != STATUS_OPTIMAL
+
+
+class ScheduleCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=DEFAULT_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.path = os.path.join(cache_dir, "schedules.sqlite3")
+        os.makedirs(cache_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS schedules (
+                    cache_key TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    objective REAL NOT NULL,
+                    bound REAL NOT NULL,
+                    game_days TEXT NOT NULL,
+                    assignments TEXT NOT NULL,
+                    solve_seconds REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )""")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get(self, cache_key):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT status, objective, bound, game_days, assignments, solve_seconds FROM schedules WHERE cache_key = ?",
+                (cache_key,)).fetchone()
+            if row is None: return None
+            conn.execute("UPDATE schedules SET last_used_at = ?, hits = hits + 1 WHERE cache_key = ?", (time.time(), cache_key))
+        status, objective, bound, game_days, assignments, solve_seconds = row
+        return {
+            'status': status, 'objective': objective, 'bound': bound,
+            'game_days': json.loads(game_days),
+            'solution_assignments': {(g, t, p_idx): p_id for g, t, p_idx, p_id in json.loads(assignments)},
+            'solve_seconds': solve_seconds,
+        }
+
+    def put(self, cache_key, status, objective, bound, game_days, solution_assignments, solve_seconds):
+        # 기존 항목보다 좋을 때만 해를 교체. 하한은 같은 문제에 대해 항상 유효하므로 큰 값을 유지
+        old = self.get(cache_key)
+        bound = max(bound, old['bound']) if old else bound
+        new = {'status': status, 'objective': objective}
+        if not _is_better(new, old):
+            objective = old['objective']; game_days = old['game_days']
+            solution_assignments = old['solution_assignments']; solve_seconds = old['solve_seconds']
+            status = old['status']
+        if bound >= objective: status = STATUS_OPTIMAL
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("""
+                INSERT INTO schedules (cache_key, status, objective, bound, game_days, assignments, solve_seconds, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    status = excluded.status, objective = excluded.objective, bound = excluded.bound,
+                    game_days = excluded.game_days, assignments = excluded.assignments,
+                    solve_seconds = excluded.solve_seconds, last_used_at = excluded.last_used_at""",
+                (cache_key, status, float(objective), float(bound), json.dumps(list(game_days)),
+                 json.dumps([[g, t, p_idx, p_id] for (g, t, p_idx), p_id in sorted(solution_assignments.items())]),
+                 float(solve_seconds), now, now))
+            self._evict(conn)
+        return status
+
+    def _evict(self, conn):
+        # 최근에 사용되지 않은 항목부터 max_entries 를 넘는 만큼 삭제
+        conn.execute("""
+            DELETE FROM schedules WHERE cache_key IN (
+                SELECT cache_key FROM schedules ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)""",
+            (self.max_entries,))
+
+    def discard(self, cache_key):
+        # 검증에 실패한 항목 삭제 (put 이 더 나쁜 새 해로 교체하지 않는 것을 막음)
+        with self._connect() as conn:
+            conn.execute("DELETE FROM schedules WHERE cache_key = ?", (cache_key,))
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM schedules")
+        with self._connect() as conn:
+            conn.execute("VACUUM")
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM schedules").fetchone()[0]
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+# 가벼운 설정/선수 명단 모듈: 고정 설정, 선수 데이터 처리, 출전 금지 정규화와 사전 점검, 해 찾기 제어 (OR-Tools/pandas/numpy 비의존)
+# UI 첫 화면은 이 모듈만으로 그리고, 무거운 솔버 스택(schedule_solver)은 해 찾기를 시작할 때 불러옴.
+# 설정/명단 이름은 이 모듈에서 직접 import (schedule_solver 는 자기가 쓰는 이름만 가져오므로 다시 내보내는 경로에 기대지 않음).
+import json
+import os
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+
+import schedule_precheck
+from schedule_roster import load_roster_file
+
+# --- 고정 설정 및 데이터 ---
+NUM_DAYS = 3
+GAMES_PER_DAY = [4, 3, 3]
+NUM_GAMES = sum(GAMES_PER_DAY)
+EXACT_TIER1_PER_TEAM_FIXED = 1
+MIN_ENEMY_SAME_POS_FIXED = 1
+
+num_teams_per_game = 2
+ROSTER_ENV = 'SCHEDULE_ROSTER' # 명단 파일 경로 (JSON / CSV / Parquet, schedule_roster). 있으면 아래 기본 명단 대신 사용
+
+player_data = {
+    'T': {1: ('인섹', 'T1'), 2: ('얍얍', 'T2'), 3: ('뽀융쨩', 'T3'), 4: ('룩삼', 'T4'), 5: ('강소연', 'T5')},
+    'J': {1: ('소우릎', 'J1'), 2: ('꼴랑이', 'J2'), 3: ('네클릿', 'J3'), 4: ('휘용', 'J4'), 5: ('고수달', 'J5')},
+    'M': {1: ('갱맘', 'M1'), 2: ('실프', 'M2'), 3: ('헤징', 'M3'), 4: ('젤리', 'M4'), 5: ('명훈', 'M5')},
+    'A': {1: ('크캣', 'A1'), 2: ('따효니', 'A2'), 3: ('플러리', 'A3'), 4: ('모카형', 'A4'), 5: ('러너', 'A5')},
+    'S': {1: ('라콩', 'S1'), 2: ('눈꽃', 'S2'), 3: ('던', 'S3'), 4: ('루루카', 'S4'), 5: ('감규리', 'S5')},
+}
+if os.environ.get(ROSTER_ENV): player_data = load_roster_file(os.environ[ROSTER_ENV])
+positions = list(player_data)
+players_per_team = len(positions)
+
+_processed_player_data = {}
+
+def process_player_data(p_data):
+    # 같은 선수 데이터는 한 번만 처리 (Streamlit 캐시 대신 프로세스 내 메모)
+    memo_key = json.dumps([[pos, list(ranks.items())] for pos, ranks in p_data.items()], ensure_ascii=False) # 선수 ID 는 순회 순서로 매김
+    if memo_key not in _processed_player_data:
+        _processed_player_data[memo_key] = _process_player_data(p_data)
+    return _processed_player_data[memo_key]
+
+
+def _process_player_data(p_data):
+    players = []; player_alias = {}; player_pos = {}; player_rank = {}
+    pos_players = defaultdict(list); tier1_players = []
+    player_to_id = {}; id_to_player = {}; pid_counter = 0; all_player_names = []
+    display_player_options = []
+    display_to_name_map = {}
+    name_to_display_map = {}
+
+    for pos, ranks in p_data.items():
+        for rank, (alias, name) in ranks.items():
+            players.append(name); player_alias[name] = alias; player_pos[name] = pos
+            player_rank[name] = rank; pos_players[pos].append(name); all_player_names.append(name)
+            display_text = f"{alias}({name})"
+            display_player_options.append(display_text)
+            display_to_name_map[display_text] = name
+            name_to_display_map[name] = display_text
+            if rank == 1: tier1_players.append(name)
+            player_to_id[name] = pid_counter; id_to_player[pid_counter] = name; pid_counter += 1
+
+    num_players = len(players); player_ids = list(range(num_players))
+    non_tier1_players = [p for p in players if p not in tier1_players]
+    return (players, player_alias, player_pos, player_rank, pos_players,
+            tier1_players, player_to_id, id_to_player, num_players,
+            player_ids, sorted(all_player_names), non_tier1_players,
+            sorted(display_player_options), display_to_name_map, name_to_display_map)
+
+(players, player_alias, player_pos, player_rank, pos_players,
+ tier1_players, player_to_id, id_to_player, num_players,
+ player_ids, all_player_names, non_tier1_players,
+ display_player_options, display_to_name_map, name_to_display_map) = process_player_data(player_data)
+
+
+def get_player_info(p_id):
+    name = id_to_player.get(p_id, "Unknown")
+    if name == "Unknown": return "Unknown", "Unk", "N/A", -1
+    return name, player_alias.get(name,"?"), player_pos.get(name,"?"), player_rank.get(name,-1)
+
+# 모델 빌드 모드: 'boolean' 은 공유 one-hot x[g,t,p] 격자 하나에서 나머지를 선형 제약으로 유도,
+# 'legacy' 는 기존 정수 assignment[g,t,p_idx] + == p_id 반복 리파이 방식
+MODEL_MODE_BOOLEAN = 'boolean'
+MODEL_MODE_LEGACY = 'legacy'
+MODEL_MODE_LABELS = {
+    MODEL_MODE_BOOLEAN: "불리언 one-hot (x[g,t,p])",
+    MODEL_MODE_LEGACY: "기존 정수 배정 (assignment[g,t,p_idx])",
+}
+DEFAULT_MODEL_MODE = MODEL_MODE_BOOLEAN
+# 해 찾기 엔진: CP-SAT (solve_schedule) 또는 NumPy 담금질 (schedule_local_search.solve_schedule_local_search)
+ENGINE_CP_SAT = 'cp_sat'
+ENGINE_LOCAL_SEARCH = 'local_search'
+ENGINE_LABELS = {
+    ENGINE_CP_SAT: "CP-SAT (최적화 모델)",
+    ENGINE_LOCAL_SEARCH: "로컬 서치 (NumPy 담금질)",
+}
+DEFAULT_NUM_WORKERS = None # None: 사용 가능한 코어를 동시에 실행 중인 해 찾기끼리 나눔 (default_num_workers)
+
+
+def available_cores():
+    # 이 프로세스가 실제로 쓸 수 있는 코어 수 (컨테이너 CPU 제한/taskset 반영)
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError: # sched_getaffinity 가 없는 플랫폼
+        return os.cpu_count() or 1
+
+
+# 대안 스케줄 기본값 (schedule_solver.find_alternatives)
+ALTERNATIVE_TOLERANCE = 5 # 최선 목표 값 + 이 값 이하의 스케줄만 대안으로 인정
+ALTERNATIVE_MIN_DISTANCE = 10 # 대안끼리 최소한 달라야 하는 슬롯 수 (해밍 거리)
+
+# 롤링 호라이즌 기본 창 크기 (schedule_rolling.solve_schedule_rolling)
+DEFAULT_WINDOW_DAYS = 1
+
+
+@dataclass
+class StopCriteria:
+    # 시간 제한 전에 해 찾기를 끝내는 조건 (None 이면 사용 안 함). gap = 목표 값 - 하한 (최소화)
+    relative_gap: float = None            # gap / max(1, |목표 값|) 이 이 값 이하
+    absolute_gap: float = None            # gap 이 이 값 이하
+    no_improvement_seconds: float = None  # 마지막 개선 해 이후 이 시간 동안 개선 없음
+    target_objective: float = None        # 목표 값이 이 값 이하
+
+    def check(self, objective, bound, since_improvement):
+        # 충족된 조건의 설명 (없으면 None). 해가 아직 없으면 어떤 조건도 충족되지 않음
+        if objective is None: return None
+        if self.target_objective is not None and objective <= self.target_objective:
+            return f"목표 값 {objective:g} <= 목표치 {self.target_objective:g}"
+        if bound is not None:
+            gap = max(0.0, objective - bound)
+            if self.absolute_gap is not None and gap <= self.absolute_gap:
+                return f"절대 gap {gap:g} <= {self.absolute_gap:g}"
+            if self.relative_gap is not None and gap / max(1.0, abs(objective)) <= self.relative_gap:
+                return f"상대 gap {gap / max(1.0, abs(objective)):.1%} <= {self.relative_gap:.1%}"
+        if self.no_improvement_seconds is not None and since_improvement >= self.no_improvement_seconds:
+            return f"{since_improvement:.1f}초 동안 개선 없음"
+        return None
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**d) if d else None
+
+
+class SolveControl:
+    # 백그라운드 해 찾기와 UI 사이의 공유 상태: 개선 해 스트리밍, 현재 하한, 실행 로그, 중단 요청
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._solver = None
+        self._incumbents = []
+        self.best_bound = None
+        self.stop_requested = False
+        self.status_messages = []
+
+    def log(self, msg):
+        with self._lock: self.status_messages.append(msg)
+
+    def log_tail(self, n):
+        # (전체 줄 수, 마지막 n 줄): UI 는 폴링 주기마다 줄 수가 바뀌었을 때만 다시 그림
+        with self._lock: return len(self.status_messages), self.status_messages[-n:]
+
+    def attach_solver(self, solver):
+        with self._lock:
+            self._solver = solver
+            if self.stop_requested: solver.StopSearch()
+
+    def stop(self):
+        # "중단하고 현재 최선 유지": CP-SAT 은 지금까지의 최선 해를 FEASIBLE 로 반환
+        with self._lock:
+            self.stop_requested = True
+            if self._solver is not None: self._solver.StopSearch()
+
+    def publish(self, incumbent):
+        with self._lock:
+            self._incumbents.append(incumbent)
+            self._raise_bound(incumbent['bound'])
+
+    def update_bound(self, bound):
+        with self._lock: self._raise_bound(bound)
+
+    def _raise_bound(self, bound):
+        if bound is not None: self.best_bound = bound if self.best_bound is None else max(self.best_bound, bound)
+
+    def snapshot(self):
+        with self._lock:
+            return len(self._incumbents), (self._incumbents[-1] if self._incumbents else None)
+
+
+# --- 출전 금지 정규화 / 사전 점검 ---
+def normalize_player_data(p_data):
+    # JSON 입력처럼 순위 키가 문자열이거나 값이 리스트여도 {pos: {rank(int): (alias, name)}} 로 맞춤
+    return {pos: {int(rank): tuple(entry) for rank, entry in ranks.items()} for pos, ranks in p_data.items()}
+
+
+def normalize_banned_players_by_day(player_data, banned_players_by_day, num_days=NUM_DAYS):
+    # 날짜 키(1부터, 문자열 허용)와 선수 이름/별명/표시 이름("별명(이름)") 모두 받아서 {day: {표시 이름}} 으로 변환.
+    # 별명은 명단에서 한 명만 쓸 때만 허용 (겹치면 이름이나 표시 이름으로 지정)
+    (_, player_alias_f, _, _, _, _, _, _, _, _, _, _, _, display_to_name_map_f, name_to_display_map_f) = process_player_data(player_data)
+    alias_to_names = defaultdict(list)
+    for name, alias in player_alias_f.items(): alias_to_names[alias].append(name)
+    normalized = {}
+    for day, names in (banned_players_by_day or {}).items():
+        day = int(day)
+        if not 1 <= day <= num_days: raise ValueError(f"잘못된 날짜: {day} (1~{num_days})")
+        displays = set()
+        for name in names:
+            if name in display_to_name_map_f: displays.add(name)
+            elif name in name_to_display_map_f: displays.add(name_to_display_map_f[name])
+            elif len(alias_to_names.get(name, ())) == 1: displays.add(name_to_display_map_f[alias_to_names[name][0]])
+            elif name in alias_to_names: raise ValueError(f"별명이 여러 선수와 겹침: {name} ({', '.join(alias_to_names[name])}) - 이름으로 지정하세요")
+            else: raise ValueError(f"알 수 없는 선수: {name}")
+        normalized[day] = displays
+    return normalized
+
+
+def get_target_play_count(non_tier1_players, games_per_day, num_teams_per_game, players_per_team):
+    # (C8) 비1티어 목표 경기 수. 슬롯 수가 나누어떨어지지 않으면 None (제약 제외)
+    total_non_tier1_slots = sum(games_per_day) * num_teams_per_game * (players_per_team - 1)
+    if non_tier1_players and total_non_tier1_slots % len(non_tier1_players) == 0:
+        return total_non_tier1_slots // len(non_tier1_players)
+    return None
+
+
+def precheck_bans(positions, player_data, num_teams_per_game, players_per_team, banned_players_by_day,
+                  games_per_day=GAMES_PER_DAY, fixed_day_layout=False):
+    # 모델 빌드 전 출전 금지 사전 점검 (schedule_precheck). 확실히 불가능하면 병목 메시지 목록, 아니면 빈 목록
+    if EXACT_TIER1_PER_TEAM_FIXED != 1: return []
+    (_, player_alias_f, player_pos_f, _, pos_players_f, tier1_players_f, player_to_id_f, _, _, _, _,
+     non_tier1_players_f, _, _, _) = process_player_data(player_data)
+    pos_player_ids = [[player_to_id_f[p] for p in pos_players_f[pos]] for pos in positions]
+    labels = {player_to_id_f[p]: f"{player_alias_f[p]}({p}, {player_pos_f[p]})" for p in player_to_id_f}
+    target = get_target_play_count(non_tier1_players_f, games_per_day, num_teams_per_game, players_per_team)
+    return schedule_precheck.find_bottlenecks(
+        positions, pos_player_ids, {player_to_id_f[p] for p in tier1_players_f}, list(games_per_day),
+        get_banned_player_ids_by_day(player_data, banned_players_by_day), labels,
+        target_plays=target, num_teams=num_teams_per_game, fixed_day_layout=fixed_day_layout)
+
+
+def get_banned_player_ids_by_day(player_data, banned_players_by_day):
+    (_, _, _, _, _, _, player_to_id_f, _, _, _, _, _, _, display_to_name_map_f, _) = process_player_data(player_data)
+    banned_ids = defaultdict(set)
+    for day, banned_names_display in banned_players_by_day.items():
+        for disp_name in banned_names_display:
+            name = display_to_name_map_f.get(disp_name)
+            if name in player_to_id_f: banned_ids[day - 1].add(player_to_id_f[name])
+    return banned_ids
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+# 구성적 휴리스틱: 모든 하드 제약을 만족하는 스케줄을 수 ms 안에 만들어 CP-SAT 힌트로 사용
+#
+# 0) 날짜 배치: 날짜 고정 배치면 GAMES_PER_DAY 순서의 연속 블록, 아니면 같은 날 게임이 이웃하지 않게 번갈아 배치
+#    (이웃한 게임이 모두 다른 날이면 같은 날 연속 출전 금지가 자동으로 만족되어 탐색이 훨씬 쉬움)
+# 1) 1티어 맞대결 계획: 게임마다 1티어 쌍 하나 (쌍마다 floor~ceil 번, 출전 금지, 같은 날 연속 출전 금지)
+# 2) 포지션별 출전 배정: 1티어 계획이 정해지면 포지션끼리는 서로 독립 ((C5) 는 같은 포지션 쌍, (C8)/출전 금지/연속 출전은 선수 단위).
+#    게임마다 그 포지션 선수 2명을 고르는 무작위 DFS. 가지치기: 아직 안 만난 쌍 수 > 남은 게임 수,
+#    선수별 남은 출전 수 > 남은 출전 가능 횟수 (출전 금지 날짜 제외, 같은 날 L게임이 이어지면 연속 금지로 최대 ceil(L/2)번)
+# 3) 팀 배정: 1티어 ID 가 작은 쪽이 팀 A, 나머지 포지션은 새 아군 쌍이 많아지는 방향으로
+# 4) 날짜 고정 배치면 대칭 제거 조건(같은 날 첫 게임 서명 <= 마지막 게임 서명, 같은 조건 날짜 블록 순서)에 맞게 게임 순서 정규화
+# 2팀 / 팀당 1티어 1명 / 포지션당 1티어 최대 1명 구성만 지원. 시간 안에 못 만들면 None
+import random
+import time
+from collections import defaultdict
+from itertools import combinations
+
+NODE_LIMIT = 20000 # 재시작 한 번당 DFS 노드 수
+
+
+def _interleaved_days(games_per_day):
+    # 남은 게임이 가장 많은 (직전과 다른) 날짜를 차례로 고름. 이웃한 같은 날을 피할 수 없으면 None
+    left = list(games_per_day); day_of = []
+    for _ in range(sum(games_per_day)):
+        cands = [d for d in range(len(left)) if left[d] and (not day_of or d != day_of[-1])]
+        if not cands: return None
+        d = max(cands, key=lambda d: (left[d], -d)); left[d] -= 1; day_of.append(d)
+    return day_of
+
+
+def _run_ends(day_of):
+    # run_end[g]: g 가 속한 '같은 날 연속 게임' 구간이 끝나는 다음 게임 번호
+    run_end = [len(day_of)] * len(day_of)
+    for g in range(len(day_of) - 2, -1, -1):
+        run_end[g] = run_end[g + 1] if day_of[g + 1] == day_of[g] else g + 1
+    return run_end
+
+
+def _plan_tier1(tier1_ids, day_of, banned, rng):
+    # 게임별 1티어 쌍 목록. 탐색을 끝까지 했는데 없으면 'infeasible', 노드 제한에 걸리면 None
+    pairs = list(combinations(sorted(tier1_ids), 2)); num_games = len(day_of)
+    lo, hi = num_games // len(pairs), -(-num_games // len(pairs))
+    count = dict.fromkeys(pairs, 0); plan = []; nodes = [0]
+
+    def dfs(g):
+        if g == num_games: return True
+        nodes[0] += 1
+        if nodes[0] > NODE_LIMIT or sum(max(0, lo - c) for c in count.values()) > num_games - g: return False
+        prev = plan[g - 1] if g and day_of[g - 1] == day_of[g] else ()
+        day_banned = banned.get(day_of[g], ())
+        cands = [p for p in pairs if count[p] < hi and not set(p) & set(prev) and not set(p) & set(day_banned)]
+        rng.shuffle(cands); cands.sort(key=lambda p: count[p])
+        for p in cands:
+            count[p] += 1; plan.append(p)
+            if dfs(g + 1): return True
+            count[p] -= 1; plan.pop()
+        return False
+
+    if dfs(0): return plan
+    return None if nodes[0] > NODE_LIMIT else 'infeasible'
+
+
+def _assign_position(players, tier1_id, plan, day_of, run_end, banned, target, rng):
+    # 이 포지션의 게임별 출전 선수 쌍. target 이 있으면 비1티어는 정확히 target 번, 없으면 고르게(최대 ceil)
+    num_games = len(day_of)
+    t1_games = [tier1_id is not None and tier1_id in plan[g] for g in range(num_games)]
+    others = [p for p in players if p != tier1_id]
+    slots = sum(1 if t1_games[g] else 2 for g in range(num_games))
+    if not others or (target is not None and target * len(others) != slots): return None
+    rem = dict.fromkeys(others, target if target is not None else -(-slots // len(others)))
+    uncovered = set(combinations(sorted(players), 2))
+    t1_left = [sum(t1_games[g:]) for g in range(num_games + 1)]
+    played_prev = set(); chosen = []; nodes = [0]
+
+    def opportunities(p, g, played_g_minus_1):
+        # g 이후 p 가 더 뛸 수 있는 최대 횟수
+        total = 0; h = g
+        while h < num_games:
+            if p not in banned.get(day_of[h], ()):
+                length = run_end[h] - h
+                if h == g and played_g_minus_1 and g and day_of[g - 1] == day_of[g]: length -= 1
+                total += -(-length // 2)
+            h = run_end[h]
+        return total
+
+    def dfs(g, played_prev):
+        if g == num_games: return not uncovered
+        nodes[0] += 1
+        if nodes[0] > NODE_LIMIT: return False
+        uncovered_t1 = sum(1 for pair in uncovered if tier1_id in pair)
+        if uncovered_t1 > t1_left[g] or len(uncovered) - uncovered_t1 > (num_games - g) - t1_left[g]: return False
+        if target is not None and any(rem[p] > opportunities(p, g, p in played_prev) for p in others): return False
+        if target is None and sum(rem.values()) < sum(1 if t1_games[h] else 2 for h in range(g, num_games)): return False
+        same_day = g and day_of[g - 1] == day_of[g]
+        day_banned = banned.get(day_of[g], ())
+        eligible = [p for p in others if rem[p] > 0 and p not in day_banned and not (same_day and p in played_prev)]
+        if t1_games[g]: cands = [tuple(sorted((tier1_id, p))) for p in eligible]
+        else: cands = list(combinations(sorted(eligible), 2))
+        rng.shuffle(cands)
+        cands.sort(key=lambda pair: (pair not in uncovered, -sum(rem.get(p, 0) for p in pair)))
+        for pair in cands:
+            newly = pair in uncovered
+            for p in pair:
+                if p in rem: rem[p] -= 1
+            if newly: uncovered.discard(pair)
+            chosen.append(pair)
+            if dfs(g + 1, set(pair)): return True
+            chosen.pop()
+            if newly: uncovered.add(pair)
+            for p in pair:
+                if p in rem: rem[p] += 1
+        return False
+
+    return list(chosen) if dfs(0, played_prev) else None
+
+
+def _assign_teams(plan, pos_pairs, rng):
+    # 게임별 [팀 A 선수들, 팀 B 선수들] (포지션 순서). 1티어 ID 가 작은 쪽이 팀 A
+    allies = set(); games = []
+    for g, (t1_a, t1_b) in enumerate(plan):
+        teams = [dict(), dict()]
+        order = sorted(range(len(pos_pairs)), key=lambda pi: not (t1_a in pos_pairs[pi][g] or t1_b in pos_pairs[pi][g]))
+        for pi in order:
+            u, v = pos_pairs[pi][g]
+            if t1_a in (u, v): u, v = t1_a, (v if u == t1_a else u)
+            elif t1_b in (u, v): v, u = t1_b, (v if u == t1_b else u)
+            else:
+                gain = lambda a, b: (sum((min(a, q), max(a, q)) not in allies for q in teams[0].values())
+                                     + sum((min(b, q), max(b, q)) not in allies for q in teams[1].values()))
+                if gain(v, u) > gain(u, v) or (gain(v, u) == gain(u, v) and rng.random() < 0.5): u, v = v, u
+            teams[0][pi] = u; teams[1][pi] = v
+        for team in teams:
+            allies.update(combinations(sorted(team.values()), 2))
+        games.append([[team[pi] for pi in range(len(pos_pairs))] for team in teams])
+    return games
+
+
+def _normalize_order(games, plan, games_per_day, banned, num_players):
+    # 대칭 제거 조건에 맞는 게임 순서 (같은 날 게임 순서 뒤집기 / 같은 조건 날짜 블록 교환은 모든 하드 제약을 보존)
+    signature = lambda g: plan[g][0] * num_players + plan[g][1]
+    blocks = []; start = 0
+    for n in games_per_day:
+        block = list(range(start, start + n)); start += n
+        if len(block) >= 2 and signature(block[0]) > signature(block[-1]): block.reverse()
+        blocks.append(block)
+    groups = defaultdict(list)
+    for d, n in enumerate(games_per_day):
+        if n: groups[n, frozenset(banned.get(d, ()))].append(d)
+    ordered = list(blocks)
+    for days in groups.values():
+        for d, block in zip(days, sorted((blocks[d] for d in days), key=lambda b: signature(b[0]))): ordered[d] = block
+    return [g for block in ordered for g in block]
+
+
+def construct_schedule(pos_player_ids, tier1_ids, games_per_day, banned_ids_by_day, target_plays=None,
+                       num_players=None, fixed_day_layout=False, time_limit=1.0, seed=0):
+    # pos_player_ids: 포지션 순서대로 선수 ID 목록, banned_ids_by_day: {날짜 인덱스(0부터): {선수 ID}}
+    # 반환: {'game_days': [...], 'solution_assignments': {(g, t, p_idx): p_id}} 또는 None
+    deadline = time.time() + time_limit; rng = random.Random(seed)
+    tier1_ids = set(tier1_ids); num_players = num_players or sum(len(ids) for ids in pos_player_ids)
+    blocks_day_of = [d for d, n in enumerate(games_per_day) for _ in range(n)]
+    day_of = blocks_day_of if fixed_day_layout else (_interleaved_days(games_per_day) or blocks_day_of)
+    run_end = _run_ends(day_of)
+    pos_tier1 = []
+    for ids in pos_player_ids:
+        t1 = [p for p in ids if p in tier1_ids]
+        if len(t1) > 1: return None
+        pos_tier1.append(t1[0] if t1 else None)
+    if len(tier1_ids) < 2 or len(tier1_ids) != sum(t is not None for t in pos_tier1): return None
+    if any(len(ids) < 2 for ids in pos_player_ids): return None
+
+    while time.time() < deadline:
+        plan = _plan_tier1(tier1_ids, day_of, banned_ids_by_day, rng)
+        if plan == 'infeasible': return None
+        if plan is None: continue
+        pos_pairs = []
+        for ids, t1 in zip(pos_player_ids, pos_tier1):
+            pairs = _assign_position(ids, t1, plan, day_of, run_end, banned_ids_by_day, target_plays, rng)
+            if pairs is None: break
+            pos_pairs.append(pairs)
+        else:
+            games = _assign_teams(plan, pos_pairs, rng)
+            order = (_normalize_order(games, plan, games_per_day, banned_ids_by_day, num_players) if fixed_day_layout
+                     else list(range(len(day_of))))
+            solution_assignments = {(new_g, t, pi): p_id for new_g, g in enumerate(order)
+                                    for t, team in enumerate(games[g]) for pi, p_id in enumerate(team)}
+            return {'game_days': list(day_of), 'solution_assignments': solution_assignments}
+    return None
+
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+# NumPy 로컬 서치(담금질) 엔진: CP-SAT 대신 고를 수 있는 두 번째 해 찾기 엔진 (큰 명단 / CP-SAT 이 좋은 해에 늦게 도달할 때)
+#
+# 스케줄 = grid[g, t, p] (게임 x 팀 x 포지션 선수 ID) 정수 배열, 게임별 날짜 day_of[g] 는 고정.
+# 선수 x 선수 아군/적군 만남 횟수 행렬(평탄화, 인덱스 = 작은 ID * 선수 수 + 큰 ID)을 유지하고, 이동마다 바뀌는 게임의 쌍만
+# 모아 np.unique / bincount 로 0회 쌍 수 변화를 한 번에 계산 (게임 하나당 쌍 45개, 전체 재계산 없음).
+# 시작 해는 schedule_heuristic 의 구성적 스케줄 (하드 제약 모두 만족). 이동은 하드 제약을 유지하는 것만 사용:
+#  - 팀 교환: 한 게임에서 같은 포지션 비1티어 두 선수의 팀을 맞바꿈 (출전/1티어/(C5) 불변)
+#  - 1티어 교환: 한 게임에서 두 1티어의 포지션을 함께 팀 맞바꿈 (팀당 1티어 1명 유지)
+#  - 게임 간 교환: 같은 포지션 비1티어 두 선수가 서로의 게임 자리를 맞바꿈 (출전 수 유지, 출전 금지/같은 날 연속 출전 검사)
+#  - 게임 교환: 두 게임의 배정을 통째로 맞바꿔 날짜/순서를 옮김 (목표 값 불변, 출전 금지/같은 날 연속 출전 검사)
+# (C5) 같은 포지션 적군 1회는 게임 간 교환에서만 깨질 수 있으므로 위반 쌍 x C5_PENALTY 를 비용에 더하고 위반 0 인 해만 최선으로 기록.
+# 1티어 맞대결 계획과 출전 수는 시작 해 그대로. 2팀 / 팀당 1티어 1명 구성만 지원 (구성적 휴리스틱과 같음).
+# num_processes > 1 이면 시드만 다른 담금질을 프로세스마다 돌려 가장 좋은 해를 고름.
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from schedule_solver import HEURISTIC_TIME_LIMIT, make_result, StatusLog, build_heuristic_schedule
+from schedule_config import (
+    GAMES_PER_DAY, EXACT_TIER1_PER_TEAM_FIXED, normalize_banned_players_by_day, get_banned_player_ids_by_day, precheck_bans,
+)
+from schedule_validate import grid_from_assignments, assignments_from_grid
+from schedule_roster import get_player_index
+
+C5_PENALTY = 10 # (C5) 위반 쌍 하나의 비용 (0회 매치업 하나 = 1)
+START_TEMPERATURE = 2.0
+END_TEMPERATURE = 0.05 # 시간에 따라 기하급수로 낮춤
+MOVE_WEIGHTS = (0.35, 0.1, 0.45, 0.1) # 팀 교환, 1티어 교환, 게임 간 교환, 게임 교환
+CHECK_EVERY = 200 # 이 이동 수마다 시간/중단 확인, 온도 갱신, 개선 해 보고
+
+
+def build_problem(index, day_of, banned_ids_by_day):
+    # 담금질에 필요한 상수 배열 (프로세스로 넘길 수 있게 dict). index: schedule_roster.PlayerIndex 의 쌍 마스크를 평탄화 키로 펼침
+    n = index.num_players; keys = index.pair_keys
+    banned = np.zeros((n, max(day_of) + 1), dtype=bool)
+    for d, ids in banned_ids_by_day.items():
+        if ids: banned[sorted(ids), d] = True
+    enemy_mask = np.zeros(n * n, dtype=bool); enemy_mask[keys] = True
+    ally_mask = np.zeros(n * n, dtype=bool); ally_mask[keys[index.ally_pair]] = True
+    c5_mask = np.zeros(n * n, dtype=bool); c5_mask[keys[index.same_pos]] = True
+    return {'num_players': n, 'day_of': np.asarray(day_of, dtype=np.int64), 'is_tier1': index.is_tier1, 'banned': banned,
+            'enemy_mask': enemy_mask, 'ally_mask': ally_mask, 'c5_mask': c5_mask}
+
+
+class AnnealState:
+    # grid 와 아군/적군 만남 횟수, 출전 여부(plays[선수, 게임]), 0회 쌍 수 / (C5) 위반 수를 함께 유지
+    def __init__(self, problem, grid):
+        self.problem = problem; self.grid = grid.copy(); n = problem['num_players']
+        self.ally_i, self.ally_j = np.triu_indices(grid.shape[2], 1)
+        self.ally = np.zeros(n * n, dtype=np.int64); self.enemy = np.zeros(n * n, dtype=np.int64)
+        ally_keys, enemy_keys = self.pair_keys(self.grid)
+        np.add.at(self.ally, ally_keys, 1); np.add.at(self.enemy, enemy_keys, 1)
+        self.plays = np.zeros((n, grid.shape[0]), dtype=bool)
+        for g in range(grid.shape[0]): self.plays[grid[g].ravel(), g] = True
+        self.zero = int(np.sum(problem['enemy_mask'] & (self.enemy == 0)) + np.sum(problem['ally_mask'] & (self.ally == 0)))
+        self.c5 = int(np.sum(problem['c5_mask'] & (self.enemy == 0)))
+
+    def pair_keys(self, rows):
+        # rows: (게임 수, 2, 포지션 수) -> (아군 쌍 키, 적군 쌍 키)
+        n = self.problem['num_players']
+        a = rows[:, :, self.ally_i]; b = rows[:, :, self.ally_j]
+        ally = (np.minimum(a, b) * n + np.maximum(a, b)).ravel()
+        ea = rows[:, 0, :, None]; eb = rows[:, 1, None, :]
+        enemy = (np.minimum(ea, eb) * n + np.maximum(ea, eb)).ravel()
+        return ally, enemy
+
+    def delta(self, games, new_rows):
+        # 게임 games 의 배정을 new_rows 로 바꿀 때 (0회 쌍 수 변화, (C5) 위반 변화, 적용용 키)
+        old_ally, old_enemy = self.pair_keys(self.grid[games]); new_ally, new_enemy = self.pair_keys(new_rows)
+        d_zero = 0; d_c5 = 0
+        for counts, old, new, mask in ((self.ally, old_ally, new_ally, self.problem['ally_mask']),
+                                       (self.enemy, old_enemy, new_enemy, self.problem['enemy_mask'])):
+            keys = np.unique(np.concatenate([old, new]))
+            before = counts[keys]
+            after = (before - np.bincount(np.searchsorted(keys, old), minlength=len(keys))
+                     + np.bincount(np.searchsorted(keys, new), minlength=len(keys)))
+            became_zero = (after == 0) & (before != 0); left_zero = (before == 0) & (after != 0)
+            d_zero += int(np.sum(mask[keys] & became_zero) - np.sum(mask[keys] & left_zero))
+            if counts is self.enemy:
+                c5 = self.problem['c5_mask'][keys]; d_c5 = int(np.sum(c5 & became_zero) - np.sum(c5 & left_zero))
+        return d_zero, d_c5, (old_ally, old_enemy, new_ally, new_enemy)
+
+    def feasible(self, games, new_rows):
+        # 바뀌는 게임에 새로 들어가는 선수로 출전 금지 / 같은 날 연속 출전 검사 (다른 게임은 이미 만족)
+        day_of = self.problem['day_of']; num_games = self.grid.shape[0]
+        involved = np.unique(np.concatenate([self.grid[games].ravel(), new_rows.ravel()]))
+        local = self.plays[involved]
+        local[:, games] = False
+        for g, rows in zip(games, new_rows): local[np.searchsorted(involved, rows.ravel()), g] = True
+        if np.any(local[:, games] & self.problem['banned'][involved][:, day_of[games]]): return False
+        for g in games:
+            for h in (g - 1, g + 1):
+                if 0 <= h < num_games and day_of[h] == day_of[g] and np.any(local[:, g] & local[:, h]): return False
+        return True
+
+    def apply(self, games, new_rows, d_zero=0, d_c5=0, keys=None):
+        if keys is not None:
+            old_ally, old_enemy, new_ally, new_enemy = keys
+            np.add.at(self.ally, old_ally, -1); np.add.at(self.ally, new_ally, 1)
+            np.add.at(self.enemy, old_enemy, -1); np.add.at(self.enemy, new_enemy, 1)
+        for g in games: self.plays[self.grid[g].ravel(), g] = False
+        for g, rows in zip(games, new_rows): self.plays[rows.ravel(), g] = True
+        self.grid[games] = new_rows; self.zero += d_zero; self.c5 += d_c5
+
+
+def anneal(problem, grid, deadline, seed=0, on_improve=None, should_stop=None):
+    # deadline(time.time() 기준)까지 담금질. on_improve(objective, grid) 는 확인 주기마다 최선이 나아졌으면 호출
+    rng = random.Random(seed); state = AnnealState(problem, grid); is_tier1 = problem['is_tier1']
+    num_games, num_teams, num_positions = grid.shape
+    best_zero = state.zero if state.c5 == 0 else None; best_grid = state.grid.copy()
+    reported = best_zero; started_at = time.time(); timeline = [(0.0, best_zero)]
+    span = max(1e-6, deadline - started_at); temperature = START_TEMPERATURE
+    iterations = accepted = 0; move_counts = [0, 0, 0, 0]
+    thresholds = np.cumsum(MOVE_WEIGHTS) / sum(MOVE_WEIGHTS)
+    while True:
+        if iterations % CHECK_EVERY == 0:
+            now = time.time()
+            if best_zero is not None and best_zero != reported:
+                reported = best_zero; timeline.append((now - started_at, best_zero))
+                if on_improve is not None: on_improve(best_zero, best_grid.copy())
+            if now >= deadline or (should_stop is not None and should_stop()): break
+            temperature = START_TEMPERATURE * (END_TEMPERATURE / START_TEMPERATURE) ** min(1.0, (now - started_at) / span)
+        iterations += 1
+        r = rng.random(); move = 0 if r < thresholds[0] else 1 if r < thresholds[1] else 2 if r < thresholds[2] else 3
+        if move == 0: # 팀 교환
+            g = rng.randrange(num_games); p = rng.randrange(num_positions)
+            a, b = state.grid[g, 0, p], state.grid[g, 1, p]
+            if is_tier1[a] or is_tier1[b]: continue
+            games = [g]; new_rows = state.grid[games].copy(); new_rows[0, 0, p], new_rows[0, 1, p] = b, a
+        elif move == 1: # 1티어 교환
+            g = rng.randrange(num_games)
+            tier1_pos = [np.flatnonzero(is_tier1[state.grid[g, t]]) for t in range(num_teams)]
+            if any(len(pos) != 1 for pos in tier1_pos): continue
+            games = [g]; new_rows = state.grid[games].copy()
+            for p in (tier1_pos[0][0], tier1_pos[1][0]): new_rows[0, 0, p], new_rows[0, 1, p] = new_rows[0, 1, p], new_rows[0, 0, p]
+        elif move == 2: # 게임 간 교환
+            g1 = rng.randrange(num_games); g2 = rng.randrange(num_games - 1); g2 += g2 >= g1
+            p = rng.randrange(num_positions); t1 = rng.randrange(num_teams); t2 = rng.randrange(num_teams)
+            a, b = state.grid[g1, t1, p], state.grid[g2, t2, p]
+            if is_tier1[a] or is_tier1[b] or state.plays[a, g2] or state.plays[b, g1]: continue
+            games = [g1, g2]; new_rows = state.grid[games].copy(); new_rows[0, t1, p] = b; new_rows[1, t2, p] = a
+            if not state.feasible(games, new_rows): continue
+        else: # 게임 교환
+            g1 = rng.randrange(num_games); g2 = rng.randrange(num_games - 1); g2 += g2 >= g1
+            games = [g1, g2]; new_rows = state.grid[[g2, g1]].copy()
+            if not state.feasible(games, new_rows): continue
+            state.apply(games, new_rows); accepted += 1; move_counts[move] += 1
+            continue
+        d_zero, d_c5, keys = state.delta(games, new_rows)
+        d_cost = d_zero + C5_PENALTY * d_c5
+        if d_cost <= 0 or rng.random() < math.exp(-d_cost / temperature):
+            state.apply(games, new_rows, d_zero, d_c5, keys); accepted += 1; move_counts[move] += 1
+            if state.c5 == 0 and (best_zero is None or state.zero < best_zero):
+                best_zero = state.zero; best_grid = state.grid.copy()
+    return {'objective': best_zero, 'grid': best_grid, 'iterations': iterations, 'accepted': accepted, 'seed': seed,
+            'move_counts': dict(zip(('team_swap', 'tier1_swap', 'player_swap', 'game_swap'), move_counts)),
+            'timeline': timeline}
+
+
+def _anneal_process(args):
+    problem, grid, deadline, seed = args
+    return anneal(problem, grid, deadline, seed)
+
+
+def solve_schedule_local_search(positions, player_data,
+                                num_teams_per_game, players_per_team,
+                                banned_players_by_day,
+                                time_limit_seconds,
+                                control=None,
+                                games_per_day=GAMES_PER_DAY,
+                                symmetry_breaking=False,
+                                num_processes=1,
+                                seed=0):
+    # symmetry_breaking: 날짜 고정 배치 (CP-SAT 의 같은 옵션과 같은 날짜 배치). num_processes > 1 이면 시드별 병렬 담금질 (개선 해 스트리밍 없음)
+    solve_start = time.time(); deadline = solve_start + time_limit_seconds
+    update_status = StatusLog(control)
+    num_games = sum(games_per_day)
+    banned_players_by_day = normalize_banned_players_by_day(player_data, banned_players_by_day, len(games_per_day))
+    update_status(f"\n=== 로컬 서치(담금질) 스케줄 생성 ({num_games} 게임, 프로세스 {num_processes}개, 시간 제한: {time_limit_seconds}초) ===")
+    if num_teams_per_game != 2 or EXACT_TIER1_PER_TEAM_FIXED != 1:
+        update_status("[오류] 로컬 서치는 2팀 / 팀당 1티어 1명 구성만 지원합니다.")
+        return make_result(cp_model.MODEL_INVALID, update_status, num_teams_per_game)
+    precheck_issues = precheck_bans(positions, player_data, num_teams_per_game, players_per_team, banned_players_by_day,
+                                    games_per_day, fixed_day_layout=symmetry_breaking)
+    if precheck_issues:
+        for issue in precheck_issues: update_status(f"[사전 점검] {issue}")
+        return make_result(cp_model.INFEASIBLE, update_status, num_teams_per_game, precheck_issues=precheck_issues)
+
+    # --- 시작 해: 구성적 휴리스틱 ---
+    heuristic = build_heuristic_schedule(positions, player_data, num_teams_per_game, players_per_team, banned_players_by_day,
+                                         games_per_day, symmetry_breaking, min(HEURISTIC_TIME_LIMIT, 0.1 * time_limit_seconds))
+    if heuristic is None:
+        update_status("[로컬 서치] 시작 스케줄을 만들지 못했습니다 (구성적 휴리스틱 실패). CP-SAT 엔진을 사용해 보세요.")
+        return make_result(cp_model.UNKNOWN, update_status, num_teams_per_game, wall_time=time.time() - solve_start)
+    update_status(f"[로컬 서치] 시작 스케줄: 0회 매치업 {heuristic['objective']}개 ({time.time() - solve_start:.2f}초)")
+    problem = build_problem(get_player_index(player_data, positions), heuristic['game_days'],
+                            get_banned_player_ids_by_day(player_data, banned_players_by_day))
+    grid = grid_from_assignments(heuristic['solution_assignments'], num_games, num_teams_per_game, len(positions))
+
+    # --- 담금질 ---
+    if num_processes > 1:
+        # spawn: Streamlit 등 스레드가 있는 프로세스에서 fork 하지 않도록. 시작 지연은 절대 마감 시각으로 흡수
+        with ProcessPoolExecutor(max_workers=num_processes, mp_context=multiprocessing.get_context('spawn')) as pool:
+            runs = list(pool.map(_anneal_process, [(problem, grid, deadline, seed + i) for i in range(num_processes)]))
+    else:
+        def on_improve(objective, best_grid):
+            if control is not None:
+                control.publish({'objective': objective, 'bound': None, 'elapsed': time.time() - solve_start,
+                                 'game_days': list(heuristic['game_days']), 'solution_assignments': assignments_from_grid(best_grid)})
+        runs = [anneal(problem, grid, deadline, seed, on_improve=on_improve,
+                       should_stop=lambda: control is not None and control.stop_requested)]
+    for run in runs:
+        update_status(f"[로컬 서치] 시드 {run['seed']}: 0회 매치업 {run['objective']}개 | 이동 {run['iterations']}회 "
+                      f"(채택 {run['accepted']}회, {run['move_counts']})")
+    best = min(runs, key=lambda run: run['objective'])
+    wall_time = time.time() - solve_start
+    update_status(f"[로컬 서치] 완료: 0회 매치업 {heuristic['objective']} -> {best['objective']}개 ({wall_time:.2f}초)")
+    stats = {'iterations': sum(run['iterations'] for run in runs), 'accepted': sum(run['accepted'] for run in runs),
+             'iterations_per_second': round(sum(run['iterations'] for run in runs) / max(1e-9, wall_time)),
+             'num_processes': num_processes, 'best_seed': best['seed']}
+    timeline = [{'elapsed': round(elapsed, 3), 'objective': objective, 'bound': None} for elapsed, objective in best['timeline']]
+    return make_result(cp_model.FEASIBLE, update_status, num_teams_per_game,
+                       {'num_vars': None, 'num_constraints': None, 'solver_stats': stats, 'timeline': timeline},
+                       game_days=heuristic['game_days'], solution_assignments=assignments_from_grid(best['grid']),
+                       objective=best['objective'], wall_time=wall_time)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# 출전 금지 사전 점검: 모델을 만들기 전에 세기/흐름 하한으로 확실히 불가능한 출전 금지 조합을 수 ms 안에 걸러냄
+#
+# 모두 필요 조건이라 여기서 걸리면 해가 없음이 증명된 것이고, 통과해도 해가 있다는 보장은 없음 (CP-SAT 이 판정).
+# 선수 한 명이 하루에 뛸 수 있는 최대 게임 수: 같은 날 연속 출전 금지 때문에
+#   날짜 고정 배치 (날짜마다 연속 블록) -> ceil(그날 게임 수 / 2)
+#   자유 배치 -> 그날 게임 사이사이에 다른 날 게임을 끼울 수 있어 min(그날 게임 수, ceil(전체 게임 수 / 2))
+# 1) 날짜 x 포지션: 게임마다 팀 수만큼 그 포지션 선수가 필요 -> 출전 가능 인원 x 하루 최대 출전 >= 팀 수 x 그날 게임 수
+# 2) 날짜별 1티어: 팀마다 1티어 1명 -> 같은 세기
+# 3) 선수별: (C8) 목표 / 1티어 최소 출전 수 <= 출전 가능한 날의 최대 출전 합, 1티어 쌍은 둘 다 나올 수 있는 날에 최소 맞대결 수만큼 게임 필요
+# 4) 1티어 맞대결 흐름: 쌍 -> (둘 다 출전 가능한) 날짜 -> 게임 수. 모든 게임에 쌍 하나, 쌍마다 최소 맞대결 수
+# 5) 포지션 흐름: 선수 -> (출전 가능한) 날짜 -> 슬롯 수. 모든 슬롯이 채워지고, 선수마다 최소 출전 수를 받을 수 있어야 함
+# 2팀 / 팀당 1티어 1명 구성 기준. 메시지는 가장 좁은 병목부터 (날짜/포지션 단위 -> 선수 단위 -> 흐름)
+from collections import defaultdict, deque
+from itertools import combinations
+
+
+def day_play_caps(games_per_day, fixed_day_layout):
+    num_games = sum(games_per_day)
+    if fixed_day_layout: return [-(-n // 2) for n in games_per_day]
+    return [min(n, -(-num_games // 2)) for n in games_per_day]
+
+
+def _max_flow(capacity, source, sink):
+    # Edmonds-Karp. capacity: {u: {v: cap}} (수정됨). 그래프가 수십 개 노드라 충분히 빠름
+    for u in list(capacity):
+        for v in list(capacity[u]): capacity.setdefault(v, {}).setdefault(u, 0)
+    flow = 0
+    while True:
+        parent = {source: None}; queue = deque([source])
+        while queue and sink not in parent:
+            u = queue.popleft()
+            for v, cap in capacity[u].items():
+                if cap > 0 and v not in parent: parent[v] = u; queue.append(v)
+        if sink not in parent: return flow
+        path = []; v = sink
+        while parent[v] is not None: path.append((parent[v], v)); v = parent[v]
+        push = min(capacity[u][v] for u, v in path)
+        for u, v in path: capacity[u][v] -= push; capacity[v][u] += push
+        flow += push
+
+
+def find_bottlenecks(positions, pos_player_ids, tier1_ids, games_per_day, banned_ids_by_day, labels,
+                     target_plays=None, num_teams=2, fixed_day_layout=False):
+    # 불가능 사유 메시지 목록 (빈 목록 = 통과). banned_ids_by_day: {day_idx(0부터): {p_id}}, labels: {p_id: 표시 이름}
+    num_games = sum(games_per_day); num_days = len(games_per_day)
+    caps = day_play_caps(games_per_day, fixed_day_layout)
+    available_days = {p_id: [d for d in range(num_days) if p_id not in banned_ids_by_day.get(d, ())]
+                      for ids in pos_player_ids for p_id in ids}
+    issues = []
+
+    # 1) 2) 날짜 x 포지션 / 날짜별 1티어
+    groups = [(f"{pos} 포지션", ids) for pos, ids in zip(positions, pos_player_ids)]
+    if tier1_ids: groups.append(("1티어", sorted(tier1_ids)))
+    for d, n in enumerate(games_per_day):
+        if not n: continue
+        for label, ids in groups:
+            available = sum(1 for p_id in ids if d in available_days[p_id])
+            needed = max(num_teams, -(-num_teams * n // caps[d]))
+            if available < needed:
+                issues.append(f"{d + 1}일차 {label}: 출전 가능 {available}명, 필요 {needed}명 "
+                              f"(게임 {n}개 x 팀 {num_teams}개, 연속 출전 금지로 1명당 최대 {caps[d]}게임)")
+    if issues: return issues
+
+    # 3) 선수별 출전 수
+    tier1_pairs = list(combinations(sorted(tier1_ids), 2))
+    min_match = num_games // len(tier1_pairs) if tier1_pairs else 0
+    max_match = -(-num_games // len(tier1_pairs)) if tier1_pairs else 0
+    min_plays = {}; max_plays = {}
+    for ids in pos_player_ids:
+        for p_id in ids:
+            reachable = sum(min(games_per_day[d], caps[d]) for d in available_days[p_id])
+            if p_id in tier1_ids: need, upper, rule = (len(tier1_ids) - 1) * min_match, (len(tier1_ids) - 1) * max_match, "1티어 맞대결"
+            elif target_plays is not None: need, upper, rule = target_plays, target_plays, "(C8) 목표"
+            else: need, upper, rule = 0, num_games, None
+            min_plays[p_id] = need; max_plays[p_id] = min(upper, reachable)
+            if reachable < need:
+                issues.append(f"{labels.get(p_id, p_id)}: 출전 가능한 날의 최대 출전 {reachable}경기, {rule} {need}경기 필요")
+    for id1, id2 in tier1_pairs:
+        shared = sum(games_per_day[d] for d in available_days[id1] if d in available_days[id2])
+        if shared < min_match:
+            issues.append(f"1티어 {labels.get(id1, id1)} vs {labels.get(id2, id2)}: 둘 다 출전 가능한 날의 게임 {shared}개, "
+                          f"맞대결 {min_match}번 필요")
+    if issues: return issues
+
+    # 4) 1티어 맞대결 흐름: 모든 게임에 쌍 하나 (쌍마다 최대 맞대결 수), 쌍마다 최소 맞대결 수
+    if tier1_pairs:
+        for per_pair, total, what in ((max_match, num_games, "게임마다 1티어 쌍 하나"),
+                                      (min_match, min_match * len(tier1_pairs), f"쌍마다 최소 {min_match}번")):
+            capacity = defaultdict(dict)
+            for pair in tier1_pairs:
+                capacity['s'][pair] = per_pair
+                for d in available_days[pair[0]]:
+                    if d in available_days[pair[1]]: capacity[pair][('day', d)] = num_games
+            for d, n in enumerate(games_per_day): capacity[('day', d)]['t'] = n
+            flow = _max_flow(capacity, 's', 't')
+            if flow < total:
+                issues.append(f"1티어 맞대결 계획 불가 ({what}): {total}게임 필요, 출전 금지로 최대 {flow}게임"); return issues
+
+    # 5) 포지션 흐름: 슬롯을 모두 채우는지 (선수 상한), 선수마다 최소 출전 수를 받을 수 있는지 (선수 하한)
+    for pos, ids in zip(positions, pos_player_ids):
+        for plays, total, what in ((max_plays, num_teams * num_games, "채울 수 있는 슬롯"),
+                                   (min_plays, sum(min_plays[p_id] for p_id in ids), "선수별 최소 출전 수 합")):
+            if total > num_teams * num_games:
+                issues.append(f"{pos} 포지션: {what} {total}개, 슬롯은 {num_teams * num_games}개뿐"); continue
+            capacity = defaultdict(dict)
+            for p_id in ids:
+                capacity['s'][p_id] = plays[p_id]
+                for d in available_days[p_id]: capacity[p_id][('day', d)] = min(games_per_day[d], caps[d])
+            for d, n in enumerate(games_per_day): capacity[('day', d)]['t'] = num_teams * n
+            flow = _max_flow(capacity, 's', 't')
+            if flow < total: issues.append(f"{pos} 포지션: {what} {total}개 필요, 날짜별 출전 가능 인원으로 최대 {flow}개")
+    return issues
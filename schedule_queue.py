@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+# 서버 전체 해 찾기 대기열: Streamlit 세션 여러 곳에서 동시에 "시작" 을 눌러도 CPU 를 나눠 쓰도록 입장 제어
+#
+#   scheduler = get_default_scheduler()
+#   ticket = scheduler.submit(solve_kwargs)                    # solve_schedule (기본)
+#   ticket = scheduler.submit(kwargs, solve_fn='schedule_solver:repair_schedule') # 함수 또는 'module:function'
+#   ticket = scheduler.submit(kwargs, solve_fn='schedule_local_search:solve_schedule_local_search', workers_arg='num_processes')
+#
+# - 동시에 실행하는 해 찾기는 최대 max_concurrent 개, 한 건에는 max_workers // max_concurrent 개의 워커(스레드/프로세스)만 배정
+#   -> 동시 실행 중인 해 찾기의 워커 합이 max_workers 를 넘지 않음. 나머지는 제출 순서대로 대기 (순번 + 예상 시작 시간 표시)
+# - 같은 요청(명단, 출전 금지, 시간 제한 등 워커 수를 뺀 인자 전부가 같음)은 대기 중이거나 실행 중인 작업 하나에 합쳐지고
+#   결과/개선 해 스트리밍/로그를 모든 세션이 공유. 중단하면 그 세션은 구독을 끊고 현재 최선 해를 바로 받음 - 작업 자체는
+#   기다리는 세션이 하나도 남지 않았을 때만 취소(대기 중)/중단(실행 중). 중단된 작업에는 같은 요청이 더 합쳐지지 않음
+# - 해 찾기 작업 핸들은 SolveTicket 하나 (control / result / error / started_at / finished_at / solve_kwargs / done() / stop())
+# - 실행 방식 (SCHEDULE_SOLVER_BACKEND): 'thread' (기본) 는 이 프로세스의 스레드에서 실행, 'process' 는 솔버 스택을 미리 불러 둔
+#   작업 프로세스(schedule_worker.SolverWorker)에서 실행. prewarm() 은 스레드 방식이면 백그라운드로 솔버 스택 import + 예열,
+#   프로세스 방식이면 작업 프로세스를 미리 띄움. 이 모듈은 OR-Tools 를 import 하지 않음 (함수는 작업 스레드/프로세스에서 불러옴)
+import dataclasses
+import hashlib
+import heapq
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from schedule_config import SolveControl, available_cores
+from schedule_worker import SolverWorker, resolve_solve_fn, solve_fn_path
+
+# 환경 변수로 서버 전체 한도 지정 (기본: 코어 4개당 해 찾기 1건, 워커는 코어 수만큼)
+MAX_CONCURRENT_ENV = 'SCHEDULE_MAX_CONCURRENT_SOLVES'
+MAX_WORKERS_ENV = 'SCHEDULE_MAX_SOLVER_WORKERS'
+CORES_PER_SOLVE = 4
+BACKEND_ENV = 'SCHEDULE_SOLVER_BACKEND'
+BACKEND_THREAD = 'thread'
+BACKEND_PROCESS = 'process'
+PREWARM_ENV = 'SCHEDULE_PREWARM' # '0' 이면 prewarm() 이 아무것도 하지 않음
+DEFAULT_SOLVE_FN = 'schedule_solver:solve_schedule'
+# 요청 키에서 빼는 인자 (대기열이 정하는 값)
+WORKER_ARGS = ('num_workers', 'num_processes')
+
+
+def default_max_concurrent():
+    return int(os.environ.get(MAX_CONCURRENT_ENV) or max(1, available_cores() // CORES_PER_SOLVE))
+
+
+def default_max_workers():
+    return int(os.environ.get(MAX_WORKERS_ENV) or available_cores())
+
+
+def canonicalize(obj):
+    # 요청 키용 JSON 호환 값: dict 키는 문자열로 정렬, set 은 정렬한 목록, dataclass 는 dict, 그 밖의 객체는 타입 + 경로
+    if isinstance(obj, dict):
+        return sorted([json.dumps(canonicalize(k), ensure_ascii=False, sort_keys=True), canonicalize(v)] for k, v in obj.items())
+    if isinstance(obj, (set, frozenset)): return sorted(canonicalize(v) for v in obj)
+    if isinstance(obj, (list, tuple)): return [canonicalize(v) for v in obj]
+    if dataclasses.is_dataclass(obj): return [type(obj).__name__, canonicalize(dataclasses.asdict(obj))]
+    if obj is None or isinstance(obj, (bool, int, float, str)): return obj
+    return f"{type(obj).__name__}:{getattr(obj, 'path', id(obj))}" # 예: ScheduleCache -> SQLite 경로
+
+
+def make_request_key(solve_fn, solve_kwargs):
+    canonical = [solve_fn_path(solve_fn),
+                 canonicalize({k: v for k, v in solve_kwargs.items() if k not in WORKER_ARGS})]
+    payload = json.dumps(canonical, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class QueuedSolve:
+    # 대기열의 해 찾기 한 건. 같은 요청을 낸 세션들(SolveTicket)이 공유
+    def __init__(self, key, solve_kwargs, solve_fn, workers_arg):
+        self.key = key
+        self.solve_kwargs = solve_kwargs
+        self.solve_fn = solve_fn
+        self.workers_arg = workers_arg
+        self.control = SolveControl()
+        self.result = None; self.error = None
+        self.submitted_at = time.time(); self.started_at = None; self.finished_at = None
+        self.workers = None
+        self.subscribers = 0
+        self._done = threading.Event()
+
+    @property
+    def time_limit(self):
+        return float(self.solve_kwargs.get('time_limit_seconds') or 0)
+
+    def done(self):
+        return self._done.is_set()
+
+
+class SolveTicket:
+    # 세션 하나가 들고 있는 핸들. merged 면 이미 있던 같은 요청에 합쳐진 것
+    def __init__(self, scheduler, entry, merged):
+        self._scheduler = scheduler
+        self._entry = entry
+        self.merged = merged
+        self.stop_requested = False
+        self._detached = None # 다른 세션이 남은 작업에서 먼저 빠져나올 때 받은 (결과, 시각)
+
+    control = property(lambda self: self._entry.control)
+    result = property(lambda self: self._detached[0] if self._detached else self._entry.result)
+    error = property(lambda self: None if self._detached else self._entry.error)
+    solve_kwargs = property(lambda self: self._entry.solve_kwargs)
+    submitted_at = property(lambda self: self._entry.submitted_at)
+    started_at = property(lambda self: self._entry.started_at or (self._detached and self._detached[1]))
+    finished_at = property(lambda self: self._detached[1] if self._detached else self._entry.finished_at)
+    workers = property(lambda self: self._entry.workers)
+    subscribers = property(lambda self: self._entry.subscribers)
+
+    def done(self):
+        return self._detached is not None or self._entry.done()
+
+    def queued(self):
+        return self._entry.started_at is None and not self.done()
+
+    def queue_info(self):
+        # (대기 순번 1.., 예상 시작까지 초) - 실행 중이거나 끝났으면 (0, 0)
+        return self._scheduler.queue_info(self._entry)
+
+    def stop(self):
+        # 이 세션의 중단 요청: 구독을 끊음. 남은 세션이 없으면 작업을 취소/중단하고, 있으면 이 세션만 현재 최선 해로 끝냄
+        if self.stop_requested: return
+        self.stop_requested = True
+        detached = self._scheduler.unsubscribe(self._entry)
+        if detached is not None: self._detached = (detached, time.time())
+
+
+class SolveScheduler:
+    # 프로세스 전체 해 찾기 대기열 (스레드 안전). 작업마다 스레드 하나에서 solve_fn 실행 (process 방식이면 그 스레드가 작업 프로세스를 기다림)
+    def __init__(self, max_concurrent=None, max_workers=None, backend=None):
+        self.max_concurrent = max(1, max_concurrent or default_max_concurrent())
+        self.max_workers = max(1, max_workers or default_max_workers())
+        self.workers_per_solve = max(1, self.max_workers // self.max_concurrent)
+        self.backend = backend or os.environ.get(BACKEND_ENV) or BACKEND_THREAD
+        if self.backend not in (BACKEND_THREAD, BACKEND_PROCESS): raise ValueError(f"알 수 없는 실행 방식: {self.backend}")
+        self._idle_processes = [] # 쉬고 있는 SolverWorker
+        self._prewarm_thread = None; self.warm_up_seconds = None
+        self._lock = threading.Lock()
+        self._queue = deque() # 대기 중 QueuedSolve (제출 순서)
+        self._running = [] # 실행 중 QueuedSolve (같은 키라도 중단된 작업과 새 작업은 서로 다른 항목)
+        self._live = {} # key -> 대기/실행 중이고 중단되지 않은 QueuedSolve (합치기용)
+        self.num_submitted = 0; self.num_merged = 0; self.num_finished = 0
+
+    def submit(self, solve_kwargs, solve_fn=DEFAULT_SOLVE_FN, workers_arg='num_workers'):
+        key = make_request_key(solve_fn, solve_kwargs)
+        with self._lock:
+            self.num_submitted += 1
+            entry = self._live.get(key)
+            if entry is not None:
+                entry.subscribers += 1; self.num_merged += 1
+                entry.control.log(f"[대기열] 같은 요청이 합쳐졌습니다 (기다리는 세션 {entry.subscribers}곳).")
+                return SolveTicket(self, entry, merged=True)
+            entry = QueuedSolve(key, solve_kwargs, solve_fn, workers_arg)
+            entry.subscribers = 1
+            self._queue.append(entry); self._live[key] = entry
+            if len(self._running) >= self.max_concurrent:
+                entry.control.log(f"[대기열] 동시 실행 한도 {self.max_concurrent}건이 차서 대기합니다 (대기 {len(self._queue)}번째).")
+            self._dispatch()
+        return SolveTicket(self, entry, merged=False)
+
+    def _dispatch(self):
+        # (잠금 안에서 호출) 빈 자리만큼 대기열 앞에서부터 시작
+        while self._queue and len(self._running) < self.max_concurrent:
+            entry = self._queue.popleft()
+            requested = entry.solve_kwargs.get(entry.workers_arg)
+            entry.workers = min(requested, self.workers_per_solve) if requested else self.workers_per_solve
+            entry.started_at = time.time()
+            self._running.append(entry)
+            if entry.started_at - entry.submitted_at > 0.05:
+                entry.control.log(f"[대기열] {entry.started_at - entry.submitted_at:.1f}초 대기 후 시작 (워커 {entry.workers}개).")
+            threading.Thread(target=self._run, args=(entry,), name="solve-queue", daemon=True).start()
+
+    def _run(self, entry):
+        solve_kwargs = dict(entry.solve_kwargs, **{entry.workers_arg: entry.workers})
+        try:
+            if self.backend == BACKEND_PROCESS:
+                entry.result = self._run_in_process(entry.solve_fn, solve_kwargs, entry.control)
+            else:
+                entry.result = resolve_solve_fn(entry.solve_fn)(**solve_kwargs, control=entry.control)
+        except Exception as e:
+            entry.error = e
+        finally:
+            with self._lock:
+                self._running.remove(entry); self._forget(entry); self.num_finished += 1
+                entry.finished_at = time.time(); entry._done.set()
+                self._dispatch()
+
+    def _run_in_process(self, solve_fn, solve_kwargs, control):
+        # 쉬는 작업 프로세스를 빌려 실행 (없거나 죽었으면 새로 띄움 - 예열 안 된 프로세스면 첫 작업이 import 비용을 치름)
+        with self._lock:
+            while self._idle_processes and not self._idle_processes[-1].alive(): self._idle_processes.pop()
+            worker = self._idle_processes.pop() if self._idle_processes else None
+        if worker is None: worker = SolverWorker()
+        if not worker.ready: control.log("[대기열] 작업 프로세스 예열이 끝나지 않아 기다립니다...")
+        try:
+            return worker.run(solve_fn, solve_kwargs, control)
+        finally:
+            if worker.alive():
+                with self._lock: self._idle_processes.append(worker)
+
+    def prewarm(self):
+        # 한 번만 실행 (다시 불러도 아무것도 하지 않음). 해 찾기를 누르기 전에 OR-Tools 초기화/구조 모델 빌드를 끝내 둠
+        if os.environ.get(PREWARM_ENV, '1') == '0': return
+        with self._lock:
+            if self._prewarm_thread is not None or self._idle_processes: return
+            if self.backend == BACKEND_PROCESS:
+                self._idle_processes = [SolverWorker() for _ in range(self.max_concurrent)]
+                return
+            self._prewarm_thread = threading.Thread(target=self._prewarm_in_thread, name="solver-prewarm", daemon=True)
+        self._prewarm_thread.start()
+
+    def _prewarm_in_thread(self):
+        started = time.perf_counter()
+        import schedule_solver
+        schedule_solver.warm_up()
+        self.warm_up_seconds = time.perf_counter() - started
+
+    def warm(self):
+        # 예열 완료 여부 (process 방식이면 쉬는 작업 프로세스가 모두 예열됨)
+        if self.backend == BACKEND_PROCESS:
+            with self._lock: workers = list(self._idle_processes)
+            return bool(workers) and all(worker.wait_ready(0) for worker in workers)
+        return self.warm_up_seconds is not None
+
+    def _forget(self, entry):
+        # (잠금 안에서 호출) 합치기 대상에서 제외 - 같은 키의 더 새 작업이 있으면 그대로 둠
+        if self._live.get(entry.key) is entry: del self._live[entry.key]
+
+    def unsubscribe(self, entry):
+        # 세션 하나가 중단. 남은 세션이 없으면 작업을 취소/중단하고 None, 남아 있으면 빠져나가는 세션에 줄 현재 최선 해(SolveResult)
+        from ortools.sat.python import cp_model
+        from schedule_solver import SolveResult, make_schedule_dict
+        with self._lock:
+            if entry.done(): return None
+            entry.subscribers -= 1
+            if entry.subscribers <= 0:
+                self._forget(entry)
+                if entry.started_at is None: # 아직 대기 중: 실행하지 않고 취소
+                    self._queue.remove(entry)
+                    entry.control.stop()
+                    entry.result = SolveResult(status=cp_model.UNKNOWN, log=[{'elapsed': 0.0, 'message': "[대기열] 시작 전에 취소되었습니다."}])
+                    entry.started_at = entry.finished_at = time.time(); entry._done.set()
+                    return None
+            else:
+                entry.control.log(f"[대기열] 세션 하나가 중단했습니다 (남은 세션 {entry.subscribers}곳은 계속 기다림).")
+                _, latest = entry.control.snapshot()
+                message = "[대기열] 이 세션만 중단했습니다 - 같은 작업은 기다리는 다른 세션을 위해 계속 실행됩니다."
+                elapsed = time.time() - (entry.started_at or time.time())
+                if latest is None:
+                    return SolveResult(status=cp_model.UNKNOWN, wall_time=elapsed, log=[{'elapsed': elapsed, 'message': message}])
+                return SolveResult(status=cp_model.FEASIBLE, schedule=make_schedule_dict(latest['game_days'], entry.solve_kwargs['num_teams_per_game']),
+                                   solution_assignments=latest['solution_assignments'], game_days=list(latest['game_days']),
+                                   objective=latest['objective'], bound=entry.control.best_bound, wall_time=elapsed,
+                                   log=[{'elapsed': elapsed, 'message': message}])
+        entry.control.stop()
+        return None
+
+    def queue_info(self, entry):
+        # 실행 중 작업은 남은 시간 제한, 대기 작업은 시간 제한만큼 자리를 차지한다고 보고 빈 자리 순서를 흉내 냄
+        # (조기 종료/최적 증명으로 더 빨리 끝날 수 있으므로 예상 시작 시간은 상한)
+        with self._lock:
+            if entry.started_at is not None or entry.done(): return 0, 0.0
+            now = time.time()
+            slots = [max(0.0, e.started_at + e.time_limit - now) for e in self._running]
+            slots += [0.0] * (self.max_concurrent - len(slots))
+            heapq.heapify(slots)
+            for position, queued in enumerate(self._queue, start=1):
+                start = heapq.heappop(slots)
+                if queued is entry: return position, start
+                heapq.heappush(slots, start + queued.time_limit)
+        return 0, 0.0
+
+    def stats(self):
+        warm = self.warm()
+        with self._lock:
+            return {'backend': self.backend, 'warm': warm, 'running': len(self._running), 'queued': len(self._queue), 'max_concurrent': self.max_concurrent,
+                    'max_workers': self.max_workers, 'workers_per_solve': self.workers_per_solve,
+                    'workers_in_use': sum(e.workers for e in self._running),
+                    'submitted': self.num_submitted, 'merged': self.num_merged, 'finished': self.num_finished}
+
+
+_default_scheduler = None; _default_scheduler_lock = threading.Lock()
+
+
+def get_default_scheduler():
+    # 프로세스(= Streamlit 서버) 전체가 공유하는 대기열
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None: _default_scheduler = SolveScheduler()
+        return _default_scheduler
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+# 롤링 호라이즌 분할 해 찾기 (선수/게임/날짜 수가 큰 토너먼트용)
+#
+# 전체 모델은 (선수 쌍 x 게임) 마다 아군/적군 리터럴을 만들어서 규모가 커지면 감당할 수 없으므로
+#  1) 1티어 맞대결 계획: 게임마다 어느 1티어 쌍이 맞붙을지 작은 모델로 먼저 결정
+#     (쌍마다 floor~ceil(G / 쌍 수)번, 같은 날 연속 출전 금지, 출전 금지 반영)
+#  2) window_days 일씩 앞에서부터 풀면서 지금까지의 아군/적군 만남 횟수와 출전 수를 다음 창으로 넘김
+#     - 아직 한 번도 만나지 않은 쌍에만 리터럴을 만들고 목표에 포함 → 창 하나의 모델 크기는 창 길이에 비례
+#     - 하드 제약(출전 수, 연속 출전 금지, 출전 금지, (C5) 같은 포지션 적군 1회)은 "누가 출전하는지"만으로 정해지므로
+#       남은 게임 전체를 포지션별 출전 쌍 변수 z[g, 포지션, 쌍] 만으로 표현한 가벼운 미래 모델을 창 모델에 붙여서,
+#       이번 창의 선택 뒤에도 토너먼트 전체 제약을 만족하도록 완성할 수 있는지 함께 보장 (게임 수에 선형)
+#  (C5) 는 기본적으로 하드 제약: 1티어 계획 아래에서 만족하는 출전 계획이 없거나 창을 풀지 못하면 UNKNOWN (불가능 증명이 아님).
+#  relax_c5=True 일 때만 (C5) 를 벌점으로 완화하고, 그래도 남은 미충족 쌍은 SolveResult.violations 로 돌려줌
+import time
+from collections import Counter, defaultdict
+from itertools import combinations
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from schedule_solver import default_num_workers, get_day_blocks, get_model_size, make_result, StatusLog
+from schedule_config import (
+    GAMES_PER_DAY, DEFAULT_NUM_WORKERS, EXACT_TIER1_PER_TEAM_FIXED, DEFAULT_WINDOW_DAYS,
+    normalize_banned_players_by_day, get_banned_player_ids_by_day, precheck_bans,
+)
+from schedule_roster import get_player_index
+
+C5_PENALTY_WEIGHT = 1000
+
+
+def count_zero_matchups(player_data, positions, enemy_counts, ally_counts):
+    # 전체 모델의 목표와 같은 기준: 적군 0회 쌍(모든 쌍) + 아군 0회 쌍(PlayerIndex.ally_pair: 다른 포지션이면서 둘 다 1티어가 아닌 쌍)
+    index = get_player_index(player_data, positions); n = index.num_players
+    def met(counts): # {(id1, id2): 횟수} -> 쌍 순서 불리언 배열
+        flat = np.zeros(n * n, dtype=bool); flat[[id1 * n + id2 for (id1, id2), c in counts.items() if c]] = True
+        return flat[index.pair_keys]
+    return int(np.sum(~met(enemy_counts)) + np.sum(index.ally_pair & ~met(ally_counts)))
+
+
+def plan_tier1_matchups(tier1_ids, games_per_day, banned_player_ids_by_day, time_limit_seconds, num_workers, update_status):
+    # 게임 g 의 (팀 A 1티어, 팀 B 1티어) 목록. 팀 A 쪽이 항상 작은 ID (팀 교환 대칭 제거)
+    num_games = sum(games_per_day); pairs = list(combinations(sorted(tier1_ids), 2))
+    min_match = num_games // len(pairs); max_match = -(-num_games // len(pairs))
+    update_status(f"[1티어 계획] 1티어 {len(tier1_ids)}명, 쌍 {len(pairs)}개, 쌍마다 {min_match}~{max_match}번.")
+    model = cp_model.CpModel()
+    y = {(g, k): model.NewBoolVar(f'y_g{g}_k{k}') for g in range(num_games) for k in range(len(pairs))}
+    for g in range(num_games): model.AddExactlyOne(y[g, k] for k in range(len(pairs)))
+    for k in range(len(pairs)): model.AddLinearConstraint(sum(y[g, k] for g in range(num_games)), min_match, max_match)
+    pairs_of = {p_id: [k for k, pair in enumerate(pairs) if p_id in pair] for p_id in tier1_ids}
+    for day_idx, block in enumerate(get_day_blocks(games_per_day)):
+        for p_id in tier1_ids:
+            if p_id in banned_player_ids_by_day.get(day_idx, ()):
+                for g in block:
+                    for k in pairs_of[p_id]: model.Add(y[g, k] == 0)
+            for g, g_next in zip(block, block[1:]):
+                model.Add(sum(y[g, k] + y[g_next, k] for k in pairs_of[p_id]) <= 1)
+    solver = cp_model.CpSolver()
+    solver.parameters.num_search_workers = num_workers
+    solver.parameters.max_time_in_seconds = float(time_limit_seconds)
+    status = solver.Solve(model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        update_status(f"[1티어 계획] 실패: {solver.StatusName(status)}")
+        return None, status
+    plan = [next(pairs[k] for k in range(len(pairs)) if solver.Value(y[g, k])) for g in range(num_games)]
+    update_status(f"[1티어 계획] 완료 ({solver.WallTime():.2f}초).")
+    return plan, status
+
+
+def build_window_model(ctx, window_games, window_blocks, future_blocks, state, c5_hard=True):
+    # ctx: 토너먼트 전체 정보, state: 지금까지의 만남/출전 수. 창 게임은 불리언 one-hot, 남은 게임은 출전 쌍만
+    model = cp_model.CpModel()
+    positions = ctx['positions']; pos_player_ids = ctx['pos_player_ids']; tier1_ids = ctx['tier1_ids']
+    x = {}; slot_literals = {}
+    for g in window_games:
+        team_tier1 = ctx['tier1_plan'][g]; banned = ctx['banned_by_game'][g]
+        for t in range(2):
+            for p_idx, pos in enumerate(positions):
+                if ctx['player_pos_idx'][team_tier1[t]] == p_idx: candidates = [team_tier1[t]]
+                else: candidates = [p_id for p_id in pos_player_ids[pos] if p_id not in tier1_ids and p_id not in banned]
+                lits = []
+                for p_id in candidates:
+                    x[g, t, p_id] = model.NewBoolVar(f'x_g{g}_t{t}_{p_id}'); lits.append((p_id, x[g, t, p_id]))
+                model.AddExactlyOne(lit for _, lit in lits)
+                slot_literals[g, t, p_idx] = lits
+
+    player_in_game = {}
+    for (g, t, p_id) in x:
+        if (p_id, g) in player_in_game: continue
+        pig = model.NewBoolVar(f'p{p_id}_in_g{g}'); player_in_game[p_id, g] = pig
+        model.Add(pig == sum(x[g, u, p_id] for u in range(2) if (g, u, p_id) in x))
+
+    # --- 미래 모델: 남은 게임마다 포지션별로 출전하는 두 선수 쌍 하나 ---
+    future_pairs = {}
+    for block in future_blocks:
+        for g in block:
+            team_tier1 = ctx['tier1_plan'][g]; banned = ctx['banned_by_game'][g]
+            for p_idx, pos in enumerate(positions):
+                playing_tier1 = [p_id for p_id in team_tier1 if ctx['player_pos_idx'][p_id] == p_idx]
+                candidates = [p_id for p_id in pos_player_ids[pos] if p_id not in tier1_ids and p_id not in banned]
+                if playing_tier1: options = [tuple(sorted((playing_tier1[0], p_id))) for p_id in candidates]
+                else: options = list(combinations(candidates, 2))
+                lits = []
+                for pair in options:
+                    z = model.NewBoolVar(f'z_g{g}_{pair[0]}_{pair[1]}'); future_pairs[g, pair] = z; lits.append(z)
+                model.AddExactlyOne(lits)
+    future_plays = defaultdict(list); future_meetings = defaultdict(list)
+    for (g, pair), z in future_pairs.items():
+        future_meetings[pair].append(z)
+        for p_id in pair: future_plays[p_id, g].append(z)
+
+    def plays_in(p_id, g):
+        # 창 게임이면 player_in_game, 남은 게임이면 z 합 (없으면 0)
+        if (p_id, g) in player_in_game: return [player_in_game[p_id, g]]
+        return future_plays.get((p_id, g), [])
+
+    # 같은 날 연속 출전 금지 (1티어는 계획 단계에서 이미 보장)
+    for block in list(window_blocks) + list(future_blocks):
+        for g, g_next in zip(block, block[1:]):
+            for p_id in ctx['non_tier1_ids']:
+                both = plays_in(p_id, g) + plays_in(p_id, g_next)
+                if len(both) >= 2: model.Add(sum(both) <= 1)
+
+    # 비1티어 출전 수: 지금까지 + 이번 창 + 남은 게임 = 포지션별 목표 floor~ceil
+    remaining_games = list(window_games) + [g for block in future_blocks for g in block]
+    for p_id in ctx['non_tier1_ids']:
+        target_lo, target_hi = ctx['play_targets'][p_id]; before = state['plays'][p_id]
+        plays = [lit for g in remaining_games for lit in plays_in(p_id, g)]
+        model.AddLinearConstraint(sum(plays), target_lo - before, target_hi - before)
+
+    def add_and(a, b, name):
+        lit = model.NewBoolVar(name)
+        model.AddImplication(lit, a); model.AddImplication(lit, b); model.AddBoolOr([a.Not(), b.Not(), lit])
+        return lit
+
+    def add_never(lits, name):
+        never = model.NewBoolVar(name)
+        model.AddBoolOr(lits + [never])
+        for lit in lits: model.AddImplication(never, lit.Not())
+        return never
+
+    # 아직 만나지 않은 쌍만 리터럴 생성
+    objective_terms = []
+    for (id1, id2), same_pos, both_tier1 in ctx['pairs']:
+        need_enemy = not state['enemy'][id1, id2]
+        need_ally = not same_pos and not both_tier1 and not state['ally'][id1, id2]
+        if not need_enemy and not need_ally: continue
+        enemy_lits = []; ally_lits = []
+        for g in window_games:
+            if same_pos or both_tier1:
+                if need_enemy and (id1, g) in player_in_game and (id2, g) in player_in_game:
+                    enemy_lits.append(add_and(player_in_game[id1, g], player_in_game[id2, g], f'both_{id1}_{id2}_g{g}'))
+                continue
+            for t in range(2):
+                for u in range(2):
+                    if (g, t, id1) not in x or (g, u, id2) not in x: continue
+                    if t == u and need_ally: ally_lits.append(add_and(x[g, t, id1], x[g, u, id2], f'same_t{t}_{id1}_{id2}_g{g}'))
+                    if t != u and need_enemy: enemy_lits.append(add_and(x[g, t, id1], x[g, u, id2], f'diff_t{t}{u}_{id1}_{id2}_g{g}'))
+        if need_enemy:
+            never = add_never(enemy_lits, f'never_enemies_{id1}_{id2}') if enemy_lits else 1
+            if same_pos:
+                # (C5) 이번 창에서 못 만나면 남은 게임에서 만나야 함 (완화 시에는 큰 벌점)
+                if c5_hard: model.Add(sum(future_meetings[id1, id2]) >= never)
+                else: objective_terms.append(C5_PENALTY_WEIGHT * never)
+            objective_terms.append(never)
+        if need_ally:
+            objective_terms.append(add_never(ally_lits, f'never_allies_{id1}_{id2}') if ally_lits else 1)
+    model.Minimize(sum(objective_terms))
+    num_vars, num_constraints = get_model_size(model)
+    return {'model': model, 'slot_literals': slot_literals, 'num_vars': num_vars, 'num_constraints': num_constraints}
+
+
+def solve_schedule_rolling(positions, player_data,
+                           num_teams_per_game, players_per_team,
+                           banned_players_by_day,
+                           time_limit_seconds,
+                           window_days=DEFAULT_WINDOW_DAYS,
+                           control=None,
+                           num_workers=DEFAULT_NUM_WORKERS,
+                           games_per_day=GAMES_PER_DAY,
+                           relax_c5=False):
+    solve_start = time.time(); deadline = solve_start + time_limit_seconds
+    update_status = StatusLog(control)
+    num_workers = num_workers or default_num_workers()
+    num_games = sum(games_per_day); num_days = len(games_per_day)
+    banned_players_by_day = normalize_banned_players_by_day(player_data, banned_players_by_day, num_days)
+    update_status(f"\n=== 롤링 호라이즌 스케줄 생성 ({num_days}일 / {num_games} 게임, 창 {window_days}일, 시간 제한: {time_limit_seconds}초) ===")
+    if num_teams_per_game != 2 or EXACT_TIER1_PER_TEAM_FIXED != 1:
+        update_status("[오류] 롤링 호라이즌은 2팀 / 팀당 1티어 1명 구성만 지원합니다.")
+        return make_result(cp_model.MODEL_INVALID, update_status, num_teams_per_game)
+    precheck_issues = precheck_bans(positions, player_data, num_teams_per_game, players_per_team, banned_players_by_day,
+                                    games_per_day, fixed_day_layout=True) # 롤링은 날짜 고정 블록
+    if precheck_issues:
+        for issue in precheck_issues: update_status(f"[사전 점검] {issue}")
+        return make_result(cp_model.INFEASIBLE, update_status, num_teams_per_game, precheck_issues=precheck_issues)
+
+    index = get_player_index(player_data, positions)
+    tier1_ids = set(index.tier1_ids)
+    if len(tier1_ids) < 2:
+        update_status("[오류] 1티어 선수가 2명 이상 필요합니다.")
+        return make_result(cp_model.MODEL_INVALID, update_status, num_teams_per_game)
+    banned_by_day = get_banned_player_ids_by_day(player_data, banned_players_by_day)
+    day_blocks = get_day_blocks(games_per_day)
+    game_day = [d for d, block in enumerate(day_blocks) for _ in block]
+
+    # --- 1) 1티어 맞대결 계획 ---
+    tier1_plan, plan_status = plan_tier1_matchups(tier1_ids, games_per_day, banned_by_day,
+                                                  max(1.0, min(10.0, 0.1 * time_limit_seconds)), num_workers, update_status)
+    if tier1_plan is None:
+        return make_result(plan_status if plan_status == cp_model.INFEASIBLE else cp_model.UNKNOWN, update_status, num_teams_per_game,
+                           wall_time=time.time() - solve_start)
+
+    # 포지션별 비1티어 출전 목표: 그 포지션 비1티어 슬롯 수를 선수 수로 나눈 floor~ceil
+    ctx = {
+        'positions': positions, 'games_per_day': list(games_per_day), 'num_games': num_games, 'game_day': game_day,
+        'tier1_ids': tier1_ids, 'tier1_plan': tier1_plan, 'banned_by_day': banned_by_day,
+        'banned_by_game': [banned_by_day.get(game_day[g], set()) for g in range(num_games)],
+        'pos_player_ids': dict(zip(positions, index.pos_player_ids)),
+        'player_pos_idx': index.pos_of.tolist(), 'non_tier1_ids': index.non_tier1_ids,
+        # (쌍, 같은 포지션, 둘 다 1티어) - 쌍 루프에서 선수 정보를 다시 찾지 않게 미리 분류
+        'pairs': list(zip(index.pairs(), index.same_pos.tolist(), index.both_tier1.tolist())), 'play_targets': {},
+    }
+    tier1_games_by_pos = Counter(ctx['player_pos_idx'][p_id] for pair in tier1_plan for p_id in pair)
+    for p_idx, pos in enumerate(positions):
+        members = [p_id for p_id in ctx['pos_player_ids'][pos] if p_id not in tier1_ids]
+        if not members: continue
+        slots = 2 * num_games - tier1_games_by_pos[p_idx]
+        for p_id in members: ctx['play_targets'][p_id] = (slots // len(members), -(-slots // len(members)))
+        update_status(f"[계산] {pos} 비1티어 {len(members)}명 목표 경기 수: {slots // len(members)}~{-(-slots // len(members))}")
+
+    state = {'enemy': Counter(), 'ally': Counter(), 'plays': Counter(), 'games_done': 0}
+
+    # --- 2) 출전 계획 확인: 창 없이 미래 모델만으로 토너먼트 전체의 (C5)/출전 수/연속 출전 금지를 만족할 수 있는지 ---
+    check = build_window_model(ctx, [], [], day_blocks, state, c5_hard=True)
+    solver = cp_model.CpSolver()
+    solver.parameters.num_search_workers = num_workers
+    solver.parameters.max_time_in_seconds = max(1.0, min(10.0, 0.1 * time_limit_seconds))
+    check_status = solver.Solve(check['model'])
+    c5_hard_first = check_status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    if check_status == cp_model.INFEASIBLE and not relax_c5:
+        update_status("[출전 계획] 이 1티어 맞대결 계획으로는 (C5) 같은 포지션 적군 1회를 모두 만족하는 출전 계획이 없습니다 (완화하려면 relax_c5).")
+        # 다른 1티어 계획이면 가능할 수 있으므로 불가능 증명이 아님 -> UNKNOWN
+        return make_result(cp_model.UNKNOWN, update_status, num_teams_per_game, wall_time=time.time() - solve_start)
+    if check_status == cp_model.INFEASIBLE:
+        update_status("[출전 계획] (C5) 같은 포지션 적군 1회를 모두 만족하는 출전 계획이 없어 (C5) 를 벌점으로 완화합니다.")
+    elif not c5_hard_first:
+        update_status(f"[출전 계획] {solver.WallTime():.2f}초 안에 출전 계획을 찾지 못했습니다"
+                      + (" - (C5) 를 벌점으로 완화합니다." if relax_c5 else " - (C5) 를 지키며 창마다 계속 시도합니다."))
+    else:
+        update_status(f"[출전 계획] 확인 완료 ({solver.WallTime():.2f}초).")
+
+    # --- 3) 창 단위 순차 해 찾기 ---
+    solution_assignments = {}; solution_game_days = []
+    windows = [list(range(start, min(start + window_days, num_days))) for start in range(0, num_days, window_days)]
+    max_vars = max_constraints = 0
+    for w_idx, days in enumerate(windows):
+        window_games = [g for d in days for g in day_blocks[d]]
+        window_blocks = [day_blocks[d] for d in days]
+        future_blocks = [day_blocks[d] for d in range(days[-1] + 1, num_days)]
+        remaining_games = num_games - state['games_done']
+        stopping = control is not None and control.stop_requested
+
+        window_status = None
+        # 출전 계획이 있으면 미래 모델 덕분에 창마다 완성 가능성이 유지됨. 완화를 허용했으면 시간 안에 해가 없을 때 (C5) 를 완화해서 다시 시도
+        for c5_hard in ((True,) if not relax_c5 else (True, False) if c5_hard_first else (False,)):
+            build_start = time.time()
+            built = build_window_model(ctx, window_games, window_blocks, future_blocks, state, c5_hard)
+            max_vars = max(max_vars, built['num_vars']); max_constraints = max(max_constraints, built['num_constraints'])
+            update_status(f"\n[창 {w_idx + 1}/{len(windows)}] {days[0] + 1}~{days[-1] + 1}일차 게임 {len(window_games)}개 | "
+                          f"변수 {built['num_vars']}개 / 제약 {built['num_constraints']}개 (빌드 {time.time() - build_start:.2f}초)"
+                          + ("" if c5_hard else " | (C5) 벌점으로 완화"))
+            solver = cp_model.CpSolver()
+            solver.parameters.num_search_workers = num_workers
+            solver.parameters.max_time_in_seconds = max(1.0, (deadline - time.time()) * len(window_games) / remaining_games)
+            # 중단 요청 뒤에는 남은 창을 첫 해만 찾고 마무리 (완성된 스케줄을 돌려주기 위해)
+            if stopping: solver.parameters.stop_after_first_solution = True
+            elif control is not None: control.attach_solver(solver)
+            window_status = solver.Solve(built['model'])
+            if window_status in (cp_model.OPTIMAL, cp_model.FEASIBLE): break
+            update_status(f"[창 {w_idx + 1}] 해 없음 ({solver.StatusName(window_status)}).")
+
+        if window_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            update_status(f"[롤링 실패] {w_idx + 1}번째 창에서 스케줄을 찾지 못했습니다.")
+            return make_result(window_status if window_status == cp_model.INFEASIBLE else cp_model.UNKNOWN, update_status,
+                               num_teams_per_game, {'num_vars': max_vars, 'num_constraints': max_constraints},
+                               wall_time=time.time() - solve_start)
+
+        # 창 결과 반영: 배정 + 아군/적군 만남 수 + 출전 수
+        for g in window_games:
+            teams = [[] for _ in range(2)]
+            for t in range(2):
+                for p_idx in range(len(positions)):
+                    p_id = next(p for p, lit in built['slot_literals'][g, t, p_idx] if solver.Value(lit))
+                    solution_assignments[g, t, p_idx] = p_id; teams[t].append(p_id)
+                    if p_id not in tier1_ids: state['plays'][p_id] += 1
+            for team in teams:
+                for id1, id2 in combinations(sorted(team), 2): state['ally'][id1, id2] += 1
+            for id1 in teams[0]:
+                for id2 in teams[1]: state['enemy'][min(id1, id2), max(id1, id2)] += 1
+            solution_game_days.append(game_day[g])
+        state['games_done'] += len(window_games)
+        zero_so_far = count_zero_matchups(player_data, positions, state['enemy'], state['ally'])
+        update_status(f"[창 {w_idx + 1} 완료] {solver.WallTime():.2f}초 | 누적 0회 매치업 {zero_so_far}개")
+        if control is not None:
+            control.publish({'objective': zero_so_far, 'bound': None, 'elapsed': time.time() - solve_start,
+                             'game_days': list(solution_game_days), 'solution_assignments': dict(solution_assignments)})
+
+    labels = index.labels()
+    violations = [('C5', f"{labels[id1]} vs {labels[id2]}: 같은 포지션 적군 0번 (최소 1번, 완화됨)")
+                  for (id1, id2), same_pos, _ in ctx['pairs'] if same_pos and not state['enemy'][id1, id2]]
+    if violations: update_status(f"[경고] (C5) 완화로 같은 포지션 적군 미충족 쌍 {len(violations)}개가 남았습니다.")
+    zero_count = count_zero_matchups(player_data, positions, state['enemy'], state['ally'])
+    update_status(f"\n[롤링 완료] 0회 매치업 {zero_count}개 | 최대 창 모델 변수 {max_vars}개 / 제약 {max_constraints}개 | "
+                  f"총 {time.time() - solve_start:.2f}초")
+    # 창마다 최적이어도 전체 최적은 보장되지 않으므로 FEASIBLE (완화한 (C5) 위반은 violations 로 함께 돌려줌)
+    return make_result(cp_model.FEASIBLE, update_status, num_teams_per_game, {'num_vars': max_vars, 'num_constraints': max_constraints},
+                       game_days=solution_game_days, solution_assignments=solution_assignments,
+                       objective=zero_count, wall_time=time.time() - solve_start, violations=violations or None)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+# 선수 명단 파일 + 배열 기반 선수 인덱스
+#
+# 명단 파일 (JSON / CSV / Parquet) -> player_data ({포지션: {순위: (별명, 이름)}}, 기존 하드코딩 명단과 같은 모양)
+#   JSON   : 기존 player_data 모양 {"T": {"1": ["인섹", "T1"], ...}, ...} 또는 행 목록 [{"Position": "T", "Rank": 1, ...}, ...]
+#   CSV    : 선수 한 명당 한 행, 열 ROSTER_COLUMNS (Position, Rank, Alias, Name). 엑셀 BOM 허용
+#   Parquet: CSV 와 같은 열 (pyarrow 또는 fastparquet 필요)
+# 검증 (check_roster_rows): 빈 값, 순위(1 이상 정수), 포지션 안 순위 중복, 이름 중복, 1티어(순위 1) 2명 이상 - 문제를 모두 모아 ValueError.
+# 포지션 순서는 파일에 처음 나온 순서, 포지션 안은 순위 순 (선수 ID 도 이 순서). 같은 파일 내용은 해시로 한 번만 파싱.
+#
+# PlayerIndex: 선수 ID 순서 NumPy 배열 (포지션 인덱스 / 순위 / 1티어 여부) + 포지션별 ID 구간 + 쌍 마스크
+# (같은 포지션 / 둘 다 1티어 / 아군 0회를 세는 쌍). 쌍 k = (pair_i[k], pair_j[k]) 는 np.triu_indices 순서 (= combinations(ID, 2) 순서).
+# 모델 빌더/검증기/로컬 서치/롤링이 쌍마다 dict 를 찾는 대신 이 마스크를 씀. get_player_index 가 명단 내용 해시로 캐시.
+# 이 모듈은 가벼운 설정 모듈(schedule_config)에서도 불리므로 NumPy/pandas 는 필요할 때만 import.
+import csv
+import hashlib
+import io
+import json
+import os
+import threading
+
+ROSTER_COLUMNS = ['Position', 'Rank', 'Alias', 'Name']
+ROSTER_FORMATS = ('json', 'csv', 'parquet')
+MIN_TIER1_PLAYERS = 2 # 게임마다 팀 2개 x 팀당 1티어 1명
+
+_roster_cache = {}; _index_cache = {}; _cache_lock = threading.Lock()
+
+
+def roster_format_of(path):
+    ext = os.path.splitext(str(path))[1].lower().lstrip('.')
+    if ext not in ROSTER_FORMATS: raise ValueError(f"지원하지 않는 명단 파일 형식: .{ext} (json / csv / parquet)")
+    return ext
+
+
+def check_roster_rows(rows):
+    # rows: [(포지션, 순위, 별명, 이름)] -> player_data. 문제가 있으면 모든 문제를 담은 ValueError
+    issues = []; player_data = {}; seen_names = {}
+    for line, (pos, rank, alias, name) in enumerate(rows, start=1):
+        pos, alias, name = (str(v).strip() if v is not None else '' for v in (pos, alias, name))
+        where = f"{line}번째 선수"
+        if not pos: issues.append(f"{where}: 포지션이 비어 있음")
+        if not alias: issues.append(f"{where}: 별명이 비어 있음")
+        if not name: issues.append(f"{where}: 이름이 비어 있음")
+        try:
+            rank_value = float(rank)
+            if rank_value != int(rank_value) or rank_value < 1: raise ValueError
+            rank = int(rank_value)
+        except (TypeError, ValueError):
+            issues.append(f"{where} ({name or '?'}): 순위는 1 이상 정수여야 함 (값: {rank!r})"); continue
+        if not (pos and alias and name): continue
+        if name in seen_names: issues.append(f"{where}: 이름 '{name}' 중복 ({seen_names[name]}번째 선수와 같음)"); continue
+        ranks = player_data.setdefault(pos, {})
+        if rank in ranks: issues.append(f"{where} ({name}): {pos} 포지션 {rank}순위 중복 ('{ranks[rank][1]}' 와 같음)"); continue
+        ranks[rank] = (alias, name); seen_names[name] = line
+    if not player_data and not issues: issues.append("선수가 없음")
+    num_tier1 = sum(1 for ranks in player_data.values() if 1 in ranks)
+    if player_data and num_tier1 < MIN_TIER1_PLAYERS:
+        issues.append(f"1티어(순위 1) 선수 {num_tier1}명 - 최소 {MIN_TIER1_PLAYERS}명 필요 (팀마다 1티어 1명)")
+    if issues: raise ValueError("명단 오류:\n" + "\n".join(f"- {issue}" for issue in issues))
+    return {pos: dict(sorted(ranks.items())) for pos, ranks in player_data.items()}
+
+
+def rows_from_player_data(player_data):
+    # player_data 모양(순위 키가 문자열이어도 됨) -> 검증 전 행 목록
+    if not isinstance(player_data, dict): raise ValueError("명단 JSON 은 {포지션: {순위: [별명, 이름]}} 또는 행 목록이어야 함")
+    rows = []
+    for pos, ranks in player_data.items():
+        if not isinstance(ranks, dict): raise ValueError(f"{pos} 포지션: {{순위: [별명, 이름]}} 이어야 함")
+        for rank, entry in ranks.items():
+            if not isinstance(entry, (list, tuple)) or len(entry) != 2: raise ValueError(f"{pos} 포지션 {rank}순위: [별명, 이름] 이어야 함")
+            rows.append((pos, rank, entry[0], entry[1]))
+    return rows
+
+
+def rows_from_records(records):
+    # [{Position, Rank, Alias, Name}] (열 이름 대소문자 무시) -> 행 목록
+    rows = []
+    for line, record in enumerate(records, start=1):
+        fields = {str(k).strip().lower(): v for k, v in record.items()} if isinstance(record, dict) else {}
+        missing = [col for col in ROSTER_COLUMNS if col.lower() not in fields]
+        if missing: raise ValueError(f"{line}번째 선수: 열이 없음 {missing} (필요: {ROSTER_COLUMNS})")
+        rows.append(tuple(fields[col.lower()] for col in ROSTER_COLUMNS))
+    return rows
+
+
+def parse_roster(fmt, data):
+    # 바이트 -> 검증 전 행 목록
+    if fmt == 'json':
+        payload = json.loads(data.decode('utf-8-sig'))
+        return rows_from_records(payload) if isinstance(payload, list) else rows_from_player_data(payload)
+    if fmt == 'csv':
+        reader = csv.DictReader(io.StringIO(data.decode('utf-8-sig')))
+        return rows_from_records(record for record in reader if any((v or '').strip() for v in record.values()))
+    if fmt == 'parquet':
+        import pandas as pd
+        frame = pd.read_parquet(io.BytesIO(data))
+        return rows_from_records(frame.astype(object).where(frame.notna(), None).to_dict('records'))
+    raise ValueError(f"지원하지 않는 명단 파일 형식: {fmt}")
+
+
+def load_roster(fmt, data):
+    # 명단 파일 내용 -> 검증된 player_data. 같은 내용은 캐시 (돌려준 dict 는 수정하지 말 것)
+    key = hashlib.sha256(fmt.encode('utf-8') + b'\0' + data).hexdigest()
+    with _cache_lock:
+        if key in _roster_cache: return _roster_cache[key]
+    player_data = check_roster_rows(parse_roster(fmt, data))
+    with _cache_lock: _roster_cache[key] = player_data
+    return player_data
+
+
+def load_roster_file(path):
+    with open(path, 'rb') as f: return load_roster(roster_format_of(path), f.read())
+
+
+def dump_roster(fmt, player_data):
+    # 형식별 바이트 (명단 내려받기 / 양식). JSON 은 기존 player_data 모양
+    if fmt == 'json':
+        return json.dumps({pos: {str(rank): list(entry) for rank, entry in ranks.items()} for pos, ranks in player_data.items()},
+                          ensure_ascii=False, indent=2).encode('utf-8')
+    rows = [(pos, rank, alias, name) for pos, ranks in player_data.items() for rank, (alias, name) in ranks.items()]
+    if fmt == 'csv':
+        buffer = io.StringIO(); writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(ROSTER_COLUMNS); writer.writerows(rows)
+        return buffer.getvalue().encode('utf-8-sig') # 엑셀에서 한글이 깨지지 않게 BOM
+    if fmt == 'parquet':
+        import pandas as pd
+        buffer = io.BytesIO(); pd.DataFrame(rows, columns=ROSTER_COLUMNS).to_parquet(buffer, index=False); return buffer.getvalue()
+    raise ValueError(f"지원하지 않는 명단 파일 형식: {fmt}")
+
+
+def roster_key(player_data, positions=None):
+    # 명단 내용 해시 (포지션 순서 + 포지션/순위별 선수). 선수 ID 는 이 순서로 매겨짐
+    canonical = [list(positions) if positions is not None else list(player_data),
+                 [[pos, [[rank, list(entry)] for rank, entry in ranks.items()]] for pos, ranks in player_data.items()]]
+    payload = json.dumps(canonical, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class PlayerIndex:
+    # 선수 ID 순서 배열 (ID = player_data 순회 순서, schedule_config.process_player_data 와 같음). 만든 뒤 수정하지 않음
+    def __init__(self, player_data, positions=None):
+        import numpy as np
+        positions = list(positions) if positions is not None else list(player_data)
+        self.positions = positions; self.key = roster_key(player_data, positions)
+        entries = [(pos, int(rank), alias, name) for pos, ranks in player_data.items() for rank, (alias, name) in ranks.items()]
+        n = self.num_players = len(entries)
+        self.names = [name for _, _, _, name in entries]; self.aliases = [alias for _, _, alias, _ in entries]
+        self.name_to_id = {name: p_id for p_id, name in enumerate(self.names)}
+        pos_map = {pos: pi for pi, pos in enumerate(positions)}
+        self.pos_of = np.array([pos_map.get(pos, -1) for pos, _, _, _ in entries], dtype=np.int64) # positions 에 없는 포지션은 -1
+        self.rank = np.array([rank for _, rank, _, _ in entries], dtype=np.int64)
+        self.is_tier1 = self.rank == 1
+        self.pos_player_ids = [np.flatnonzero(self.pos_of == pi).tolist() for pi in range(len(positions))]
+        # 포지션별 ID 구간 [start, stop) - player_data 는 포지션마다 연속으로 ID 를 매기므로 항상 연속 (선수 없으면 (0, 0))
+        self.pos_ranges = [(ids[0], ids[-1] + 1) if ids else (0, 0) for ids in self.pos_player_ids]
+        self.tier1_ids = np.flatnonzero(self.is_tier1).tolist(); self.non_tier1_ids = np.flatnonzero(~self.is_tier1).tolist()
+        # 쌍 마스크 (i < j, combinations 순서)
+        i, j = np.triu_indices(n, 1); known = (self.pos_of[i] >= 0) & (self.pos_of[j] >= 0)
+        self.pair_i = i; self.pair_j = j; self.pair_keys = i * n + j
+        self.same_pos = known & (self.pos_of[i] == self.pos_of[j])
+        self.both_tier1 = self.is_tier1[i] & self.is_tier1[j]
+        self.ally_pair = known & ~self.same_pos & ~self.both_tier1 # 목표의 아군 0회 대상 (다른 포지션, 둘 다 1티어는 아님)
+
+    def pairs(self, mask=None):
+        # [(id1, id2)] (파이썬 int) - 마스크가 있으면 그 쌍만
+        i, j = (self.pair_i, self.pair_j) if mask is None else (self.pair_i[mask], self.pair_j[mask])
+        return list(zip(i.tolist(), j.tolist()))
+
+    def labels(self):
+        # {p_id: "별명(이름, 포지션)"} (검증/사전 점검 메시지용)
+        return {p_id: f"{alias}({name}, {self.positions[pi] if pi >= 0 else '?'})"
+                for p_id, (alias, name, pi) in enumerate(zip(self.aliases, self.names, self.pos_of.tolist()))}
+
+
+def get_player_index(player_data, positions=None):
+    # 명단 내용 해시로 캐시한 PlayerIndex
+    key = roster_key(player_data, positions)
+    with _cache_lock: index = _index_cache.get(key)
+    if index is None:
+        index = PlayerIndex(player_data, positions)
+        with _cache_lock: index = _index_cache.setdefault(key, index)
+    return index
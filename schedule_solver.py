@@ -0,0 +1,1484 @@
+# -*- coding: utf-8 -*-
+# 스케줄 솔버 코어 (Streamlit 비의존). schedule_app.py(UI), batch_solve.py(배치 CLI), 벤치마크에서 공용으로 사용
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from itertools import combinations
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from schedule_cache import make_cache_key, STATUS_OPTIMAL, STATUS_FEASIBLE
+from schedule_config import ( # 설정/명단/출전 금지 처리 (가벼운 모듈). 설정 이름은 호출자도 schedule_config 에서 직접 import
+    GAMES_PER_DAY, EXACT_TIER1_PER_TEAM_FIXED, MIN_ENEMY_SAME_POS_FIXED,
+    positions, num_teams_per_game, player_data, process_player_data,
+    MODEL_MODE_LEGACY, MODEL_MODE_LABELS, DEFAULT_MODEL_MODE, DEFAULT_NUM_WORKERS, available_cores,
+    ALTERNATIVE_TOLERANCE, ALTERNATIVE_MIN_DISTANCE,
+    normalize_banned_players_by_day, get_target_play_count, precheck_bans, get_banned_player_ids_by_day,
+)
+from schedule_templates import make_template_key, get_default_templates, SOURCE_MEMORY, SOURCE_DISK
+from schedule_roster import get_player_index
+import schedule_heuristic
+import schedule_validate
+
+# --- OR-Tools 스케줄링 로직 ---
+
+# 튜닝된 CP-SAT 파라미터 프로필 (benchmarks/tune.py 가 인스턴스 크기별로 생성)
+SOLVER_PROFILE_PATH = os.environ.get(
+    'SCHEDULE_SOLVER_PROFILES', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'solver_profiles.json'))
+_solver_profiles = {} # path -> (mtime, profiles)
+_active_solves = 0; _active_solves_lock = threading.Lock()
+
+
+def default_num_workers():
+    with _active_solves_lock: active = _active_solves
+    return max(1, available_cores() // (active + 1))
+
+
+def load_solver_profiles(path=None):
+    # 프로필 파일이 없으면 빈 목록. 파일이 바뀌면(mtime) 다시 읽음
+    path = path or SOLVER_PROFILE_PATH
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return []
+    if path not in _solver_profiles or _solver_profiles[path][0] != mtime:
+        with open(path, encoding='utf-8') as f:
+            _solver_profiles[path] = (mtime, json.load(f).get('profiles', []))
+    return _solver_profiles[path][1]
+
+
+def get_solver_profile(num_players, num_games, path=None):
+    # 크기(선수 수 x 게임 수) 비율이 가장 가까운 인스턴스로 튜닝된 프로필. 프로필이 없으면 None
+    profiles = load_solver_profiles(path)
+    if not profiles: return None
+    size = max(1, num_players * num_games)
+    return min(profiles, key=lambda prof: abs(math.log(max(1, prof['num_players'] * prof['num_games']) / size)))
+
+
+def apply_solver_params(solver, solver_params):
+    # {파라미터 이름: 값} 을 SatParameters 에 적용 (열거형은 이름 문자열 허용). 워커 수는 run_cp_sat 에서 따로 결정
+    for name, value in (solver_params or {}).items():
+        if name == 'num_search_workers': continue
+        if isinstance(value, str): value = getattr(type(getattr(solver.parameters, name)), value) # 열거형 멤버
+        setattr(solver.parameters, name, value)
+
+
+MODEL_TEMPLATE_SOURCE_LABELS = {SOURCE_MEMORY: "메모리", SOURCE_DISK: "디스크"}
+_builder_fingerprint = None
+
+
+def get_default_model_templates():
+    # 프로세스 공용 구조 모델 템플릿 캐시 (schedule_templates.get_default_templates)
+    return get_default_templates()
+
+
+def get_builder_fingerprint():
+    # 모델 빌더 코드가 바뀌면 디스크 템플릿을 다시 만들도록 빌더(이 파일)와 명단 처리(schedule_config / schedule_roster) 내용의 해시를 템플릿 키에 포함
+    global _builder_fingerprint
+    if _builder_fingerprint is None:
+        digest = hashlib.sha256(); here = os.path.dirname(os.path.abspath(__file__))
+        for path in (os.path.abspath(__file__), os.path.join(here, 'schedule_config.py'), os.path.join(here, 'schedule_roster.py')):
+            with open(path, 'rb') as f: digest.update(f.read())
+        _builder_fingerprint = digest.hexdigest()[:16]
+    return _builder_fingerprint
+
+
+def get_day_blocks(games_per_day=GAMES_PER_DAY):
+    # GAMES_PER_DAY 순서대로 연속된 게임 번호 블록 (예: [4, 3, 3] -> [[0..3], [4..6], [7..9]])
+    blocks = []; start = 0
+    for n in games_per_day:
+        blocks.append(list(range(start, start + n))); start += n
+    return blocks
+
+
+def get_model_size(model):
+    proto = model.Proto()
+    return len(proto.variables), len(proto.constraints)
+
+
+class BuildProfiler:
+    # 모델 빌드 계측: 제약 계열별 소요 시간 + 모델 proto 기준 정확한 변수/제약 증가량.
+    # begin() 은 이전 구간을 닫고 새 구간을 엶 (get_model_size 는 호출당 수 µs 라 구간마다 재도 부담 없음)
+    def __init__(self, model):
+        self._model = model; self._open = None
+        self.spans = []
+
+    def begin(self, family, label):
+        self.end()
+        self._open = (family, label, time.perf_counter()) + get_model_size(self._model)
+
+    def end(self):
+        if self._open is None: return
+        family, label, started, start_vars, start_constraints = self._open; self._open = None
+        num_vars, num_constraints = get_model_size(self._model)
+        self.spans.append({'family': family, 'label': label, 'seconds': round(time.perf_counter() - started, 4),
+                           'vars': num_vars - start_vars, 'constraints': num_constraints - start_constraints})
+
+
+# CP-SAT 응답 통계 중 기록할 필드 (CpSolverResponse 필드 이름 그대로)
+SOLVER_STAT_FIELDS = (
+    'num_booleans', 'num_integers', 'num_fixed_booleans', 'num_conflicts', 'num_branches',
+    'num_binary_propagations', 'num_integer_propagations', 'num_restarts', 'num_lp_iterations',
+    'wall_time', 'user_time', 'deterministic_time', 'gap_integral', 'solution_info',
+)
+
+
+def get_solver_stats(solver):
+    response = solver.response_proto
+    return {name: getattr(response, name) for name in SOLVER_STAT_FIELDS}
+
+
+def get_slot_value(built, value_fn, key):
+    # value_fn: solver.Value 또는 콜백의 Value. 슬롯 (g, t, p_idx) 에 배정된 선수 ID 반환
+    if built['model_mode'] == MODEL_MODE_LEGACY:
+        return value_fn(built['assignment'][key])
+    for p_id, lit in built['slot_literals'][key]:
+        if value_fn(lit): return p_id
+    return -1
+
+
+def make_schedule_dict(solution_game_days, num_teams_per_game):
+    return {g: {'day': day_idx + 1, 'teams': [[] for _ in range(num_teams_per_game)], 'game_id': g + 1}
+            for g, day_idx in enumerate(solution_game_days)}
+
+
+def add_solution_hints(built, solution_assignments, solution_game_days=None):
+    # 이전 스케줄을 CP-SAT 힌트로 전달 (배정 변수 + 게임 날짜)
+    model = built['model']
+    for key, p_id in solution_assignments.items():
+        if built['model_mode'] == MODEL_MODE_LEGACY:
+            if key in built['assignment']: model.AddHint(built['assignment'][key], p_id)
+        else:
+            for cand_id, lit in built['slot_literals'].get(key, []): model.AddHint(lit, cand_id == p_id)
+    for g, day_idx in enumerate(solution_game_days or []):
+        model.AddHint(built['game_day'][g], day_idx)
+
+
+def get_tier1_id_expr(tier1_on_team, g, t):
+    # 게임 g 팀 t 의 1티어 선수 ID (선형식, 팀당 1티어 1명 기준)
+    return sum(t1_id * lit for t1_id, lit in tier1_on_team[g, t])
+
+
+def get_game_signature(tier1_on_team, g, num_teams_per_game, num_players):
+    # 게임 서명 = 팀 A 1티어 ID * 선수 수 + 팀 B 1티어 ID (대칭 제거용)
+    return get_tier1_id_expr(tier1_on_team, g, 0) * num_players + get_tier1_id_expr(tier1_on_team, g, num_teams_per_game - 1)
+
+
+def build_structural_model(positions, player_data,
+                           num_teams_per_game, players_per_team,
+                           model_mode=DEFAULT_MODEL_MODE,
+                           symmetry_breaking=False,
+                           update_status=lambda msg: None,
+                           games_per_day=GAMES_PER_DAY,
+                           guard_rules=False):
+    # 출전 금지와 무관한 구조 모델 (명단/게임 구성/모드만으로 결정). 출전 금지 제약은 add_ban_constraints 가 추가
+    # guard_rules: 완화 가능한 규칙(RELAXABLE_RULES)을 계열마다 가정 리터럴 하나로 감쌈 (불가능 원인 진단용, built['rule_guards'])
+    if model_mode not in MODEL_MODE_LABELS:
+        raise ValueError(f"알 수 없는 모델 모드: {model_mode}")
+    num_games = sum(games_per_day); num_days = len(games_per_day)
+    exact_tier1_per_team = EXACT_TIER1_PER_TEAM_FIXED
+    min_enemy_same_pos_diff_rank = MIN_ENEMY_SAME_POS_FIXED
+
+    # 선수 ID 순서 배열 + 쌍 마스크 (schedule_roster.PlayerIndex). 쌍 루프는 dict 조회 대신 미리 분류한 쌍 목록을 씀
+    index = get_player_index(player_data, positions)
+    num_players_f = index.num_players; player_ids_f = list(range(num_players_f))
+    tier1_player_ids_f = set(index.tier1_ids); non_tier1_player_ids_f = set(index.non_tier1_ids)
+    pos_idx_of = [pi if pi >= 0 else None for pi in index.pos_of.tolist()] # 선수 ID -> 포지션 인덱스 (positions 에 없으면 None)
+
+    model = cp_model.CpModel(); profiler = BuildProfiler(model)
+    update_status(f"[모델 모드] {MODEL_MODE_LABELS[model_mode]}")
+    rule_guards = {family: model.NewBoolVar(f'guard_{family}') for family in RELAXABLE_RULES} if guard_rules else {}
+    def guarded(constraint, family):
+        return constraint.OnlyEnforceIf(rule_guards[family]) if guard_rules else constraint
+
+    # --- 선수 ID 집합 생성 ---
+    update_status("[계산] 선수 ID 집합 생성 중...");
+    pos_player_ids = dict(zip(positions, index.pos_player_ids))
+    update_status("[계산] 선수 ID 집합 생성 완료.")
+
+    # --- 비1티어 목표 경기 수 계산 ---
+    total_non_tier1_slots = num_games * num_teams_per_game * (players_per_team - 1)
+    num_non_tier1_players = len(non_tier1_player_ids_f)
+    target_play_count_non_tier1 = -1
+    if num_non_tier1_players > 0 and total_non_tier1_slots % num_non_tier1_players == 0:
+         target_play_count_non_tier1 = total_non_tier1_slots // num_non_tier1_players
+         update_status(f"[계산] 비1티어 목표 경기 수: {target_play_count_non_tier1}")
+    elif num_non_tier1_players > 0:
+         msg = f"[경고] 비1티어 선수({num_non_tier1_players}명) 수로 총 슬롯({total_non_tier1_slots}개)을 나눌 수 없어 동일 경기 수 제약 제외됨."
+         update_status(msg)
+    else:
+         msg = "[경고] 비1티어 선수가 없어 동일 경기 수 제약 제외됨."
+         update_status(msg)
+
+    pos_indices = list(range(len(positions)))
+    for pos in positions:
+        if not pos_player_ids.get(pos):
+            update_status(f"[오류] '{pos}' 선수 없음!")
+            return None
+    all_pairs = index.pairs()
+    # 함께 출전하면 항상 적군인 쌍: 같은 포지션, 또는 (C3)로 같은 팀이 될 수 없는 1티어 쌍
+    enemy_only_pair = (index.same_pos | (index.both_tier1 & (exact_tier1_per_team == 1))).tolist()
+
+    # --- (기존) 정수 배정 변수 기반 코어 ---
+    def build_core_legacy():
+        profiler.begin('variables', '배정 변수 (assignment / player_in_game)')
+        update_status("[모델 생성] 변수 생성 중...")
+        assignment = {}
+        for g in range(num_games):
+            for t in range(num_teams_per_game):
+                for p_idx in pos_indices:
+                    pos = positions[p_idx]; var_key = (g, t, p_idx)
+                    domain = cp_model.Domain.FromValues(pos_player_ids[pos])
+                    assignment[var_key] = model.NewIntVarFromDomain(domain, f'assign_g{g}_t{t}_p{pos}')
+        update_status(f"[모델 생성] assignment 변수 {len(assignment)}개 생성.")
+
+        player_in_game = {}; [player_in_game.setdefault((p_id, g), model.NewBoolVar(f'p{p_id}_in_g{g}')) for p_id in player_ids_f for g in range(num_games)]
+        update_status(f"[모델 생성] player_in_game 변수 {len(player_in_game)}개 생성.")
+
+        # --- 변수 연결 제약 ---
+        profiler.begin('link', '변수 연결 (assignment == p_id 리파이)')
+        update_status("[모델 생성] 변수 연결 제약 추가 중...");
+        for p_id in player_ids_f:
+            p_pos_idx = pos_idx_of[p_id]
+            if p_pos_idx is None: continue
+            for g in range(num_games):
+                presence_indicators = []
+                for t in range(num_teams_per_game):
+                     key = (g, t, p_pos_idx)
+                     indicator = model.NewBoolVar(f'ind_p{p_id}_g{g}_t{t}_pos{p_pos_idx}')
+                     model.Add(assignment[key] == p_id).OnlyEnforceIf(indicator); model.Add(assignment[key] != p_id).OnlyEnforceIf(indicator.Not()); presence_indicators.append(indicator)
+                model.Add(sum(presence_indicators) >= 1).OnlyEnforceIf(player_in_game[p_id, g]);
+                model.Add(sum(presence_indicators) == 0).OnlyEnforceIf(player_in_game[p_id, g].Not())
+        update_status("[모델 생성] 변수 연결 제약 추가 완료.")
+
+        # (C2) 게임 내 중복 금지
+        profiler.begin('C2', '(C2) 게임 내 중복 금지')
+        update_status("[제약 추가 중] (C2) 게임 내 중복 금지..."); count_c2 = 0
+        for g in range(num_games):
+            players_in_game_g = [assignment[g, t, p_idx] for t in range(num_teams_per_game) for p_idx in pos_indices]
+            if len(players_in_game_g) > 1: model.AddAllDifferent(players_in_game_g); count_c2 += 1
+        update_status(f"[제약 추가 완료] (C2) {count_c2}개 추가.")
+
+        # (C3) 팀당 1티어 선수 수
+        profiler.begin('C3', '(C3) 팀당 1티어 선수 수')
+        update_status("[제약 추가 중] (C3) 팀당 1티어 선수 수..."); count_c3 = 0
+        tier1_on_team = defaultdict(list)
+        for g in range(num_games):
+            for t in range(num_teams_per_game):
+                is_tier1_flags = []
+                for p_idx in pos_indices:
+                     key = (g, t, p_idx); pos = positions[p_idx]
+                     is_t1 = model.NewBoolVar(f'isT1_g{g}_t{t}_p{p_idx}'); pos_tier1_ids = [p_id for p_id in pos_player_ids.get(pos, []) if p_id in tier1_player_ids_f]
+                     if not pos_tier1_ids: model.Add(is_t1 == 0)
+                     else:
+                         t1_matches = []
+                         for t1_id in pos_tier1_ids:
+                             match = model.NewBoolVar(f'm_g{g}_t{t}_p{p_idx}_{t1_id}')
+                             model.Add(assignment[key] == t1_id).OnlyEnforceIf(match); model.Add(assignment[key] != t1_id).OnlyEnforceIf(match.Not()); t1_matches.append(match)
+                             tier1_on_team[g, t].append((t1_id, match))
+                         model.AddBoolOr(t1_matches).OnlyEnforceIf(is_t1)
+                         model.Add(sum(t1_matches) == 0).OnlyEnforceIf(is_t1.Not())
+                     is_tier1_flags.append(is_t1);
+                if is_tier1_flags: model.Add(sum(is_tier1_flags) == exact_tier1_per_team); count_c3 += 1
+        update_status(f"[제약 추가 완료] (C3) {count_c3}개 팀 제약 추가.")
+
+        # --- 아군/적군 보조 변수 생성 ---
+        profiler.begin('ally_enemy', '아군/적군 보조 변수')
+        update_status("[모델 생성] 아군/적군 조건용 변수 생성 중..."); are_enemies = {}; are_allies = {}
+        for g in range(num_games):
+            for p1_id, p2_id in all_pairs:
+                id1, id2 = p1_id, p2_id # all_pairs 는 id1 < id2
+
+                p1_lit = player_in_game[p1_id, g]; p2_lit = player_in_game[p2_id, g]
+                both_play = model.NewBoolVar(f'both_{id1}_{id2}_g{g}');
+                enemies_var = model.NewBoolVar(f'enemy_{id1}_{id2}_g{g}');
+                allies_var = model.NewBoolVar(f'ally_{id1}_{id2}_g{g}')
+                are_enemies[id1, id2, g] = [enemies_var]
+                are_allies[id1, id2, g] = [allies_var]
+
+                model.AddBoolAnd([p1_lit, p2_lit]).OnlyEnforceIf(both_play);
+                model.AddBoolOr([p1_lit.Not(), p2_lit.Not()]).OnlyEnforceIf(both_play.Not())
+
+                model.Add(enemies_var == 0).OnlyEnforceIf(both_play.Not())
+                model.Add(allies_var == 0).OnlyEnforceIf(both_play.Not())
+
+                p1_pos_idx, p2_pos_idx = pos_idx_of[p1_id], pos_idx_of[p2_id]
+                if p1_pos_idx is None or p2_pos_idx is None: continue
+
+                # 아군 조건
+                if p1_pos_idx != p2_pos_idx:
+                    same_team_indicators = [];
+                    for t in range(num_teams_per_game):
+                        key1 = (g, t, p1_pos_idx); key2 = (g, t, p2_pos_idx);
+                        p1_on_t = model.NewBoolVar(f'p1_t{t}_{g}_{id1}'); model.Add(assignment[key1] == p1_id).OnlyEnforceIf(p1_on_t); model.Add(assignment[key1] != p1_id).OnlyEnforceIf(p1_on_t.Not())
+                        p2_on_t = model.NewBoolVar(f'p2_t{t}_{g}_{id2}'); model.Add(assignment[key2] == p2_id).OnlyEnforceIf(p2_on_t); model.Add(assignment[key2] != p2_id).OnlyEnforceIf(p2_on_t.Not())
+                        same_t = model.NewBoolVar(f'same_t{t}_{id1}_{id2}_g{g}'); model.AddBoolAnd([p1_on_t, p2_on_t]).OnlyEnforceIf(same_t); model.AddBoolOr([p1_on_t.Not(), p2_on_t.Not()]).OnlyEnforceIf(same_t.Not())
+                        same_team_indicators.append(same_t)
+                    model.AddBoolOr(same_team_indicators).OnlyEnforceIf(allies_var)
+                    model.Add(sum(same_team_indicators) == 0).OnlyEnforceIf(allies_var.Not())
+                else: model.Add(allies_var == 0)
+
+                # 적군 조건
+                if num_teams_per_game == 2:
+                    key1_t0=(g,0,p1_pos_idx); key1_t1=(g,1,p1_pos_idx);
+                    key2_t0=(g,0,p2_pos_idx); key2_t1=(g,1,p2_pos_idx);
+                    p1_t0 = model.NewBoolVar(f'p1_t0_{g}_{id1}'); model.Add(assignment[key1_t0]==p1_id).OnlyEnforceIf(p1_t0); model.Add(assignment[key1_t0]!=p1_id).OnlyEnforceIf(p1_t0.Not())
+                    p1_t1 = model.NewBoolVar(f'p1_t1_{g}_{id1}'); model.Add(assignment[key1_t1]==p1_id).OnlyEnforceIf(p1_t1); model.Add(assignment[key1_t1]!=p1_id).OnlyEnforceIf(p1_t1.Not())
+                    p2_t0 = model.NewBoolVar(f'p2_t0_{g}_{id2}'); model.Add(assignment[key2_t0]==p2_id).OnlyEnforceIf(p2_t0); model.Add(assignment[key2_t0]!=p2_id).OnlyEnforceIf(p2_t0.Not())
+                    p2_t1 = model.NewBoolVar(f'p2_t1_{g}_{id2}'); model.Add(assignment[key2_t1]==p2_id).OnlyEnforceIf(p2_t1); model.Add(assignment[key2_t1]!=p2_id).OnlyEnforceIf(p2_t1.Not())
+                    diff_c1 = model.NewBoolVar(f'diff1_{id1}_{id2}_g{g}'); model.AddBoolAnd([p1_t0, p2_t1]).OnlyEnforceIf(diff_c1); model.AddBoolOr([p1_t0.Not(), p2_t1.Not()]).OnlyEnforceIf(diff_c1.Not())
+                    diff_c2 = model.NewBoolVar(f'diff2_{id1}_{id2}_g{g}'); model.AddBoolAnd([p1_t1, p2_t0]).OnlyEnforceIf(diff_c2); model.AddBoolOr([p1_t1.Not(), p2_t0.Not()]).OnlyEnforceIf(diff_c2.Not())
+                    model.AddBoolOr([diff_c1, diff_c2]).OnlyEnforceIf(enemies_var);
+                    model.Add(sum([diff_c1, diff_c2]) == 0).OnlyEnforceIf(enemies_var.Not())
+                else: model.Add(enemies_var == 0)
+
+                model.AddImplication(enemies_var, both_play)
+                model.AddImplication(allies_var, both_play)
+                model.Add(allies_var + enemies_var <= 1)
+        update_status("[모델 생성] 아군/적군 조건용 변수 생성 완료.")
+        return {'assignment': assignment, 'tier1_on_team': tier1_on_team}, player_in_game, are_allies, are_enemies, count_c2 + count_c3
+
+    # --- 불리언 one-hot 코어: x[g,t,p] 가 유일한 배정 변수 ---
+    def build_core_boolean():
+        profiler.begin('variables', 'one-hot 배정 변수 x[g,t,p]')
+        update_status("[모델 생성] one-hot 배정 변수 x[g,t,p] 생성 중...")
+        x = {}; slot_literals = {}
+        for g in range(num_games):
+            for t in range(num_teams_per_game):
+                for p_idx in pos_indices:
+                    pos = positions[p_idx]; lits = []
+                    for p_id in pos_player_ids[pos]:
+                        x[g, t, p_id] = model.NewBoolVar(f'x_g{g}_t{t}_{p_id}'); lits.append((p_id, x[g, t, p_id]))
+                    model.AddExactlyOne(lit for _, lit in lits)
+                    slot_literals[g, t, p_idx] = lits
+        update_status(f"[모델 생성] x 변수 {len(x)}개 생성 (슬롯 {len(slot_literals)}개, 슬롯당 정확히 1명).")
+
+        # player_in_game = 팀별 x 의 합. BoolVar 이므로 (C2) 게임 내 중복 금지도 함께 보장됨
+        profiler.begin('C2', '(C2) player_in_game = sum_t x')
+        player_in_game = {}
+        for p_id in player_ids_f:
+            for g in range(num_games):
+                pig = model.NewBoolVar(f'p{p_id}_in_g{g}'); player_in_game[p_id, g] = pig
+                model.Add(pig == sum(x[g, t, p_id] for t in range(num_teams_per_game)))
+        count_c2 = num_games
+        update_status(f"[모델 생성] player_in_game 변수 {len(player_in_game)}개 생성 (C2 포함).")
+
+        # (C3) 팀당 1티어 선수 수: 1티어 x 의 합으로 직접 표현
+        profiler.begin('C3', '(C3) 팀당 1티어 선수 수')
+        update_status("[제약 추가 중] (C3) 팀당 1티어 선수 수..."); count_c3 = 0
+        tier1_on_team = {(g, t): [(p_id, x[g, t, p_id]) for p_id in sorted(tier1_player_ids_f)]
+                         for g in range(num_games) for t in range(num_teams_per_game)}
+        for g in range(num_games):
+            for t in range(num_teams_per_game):
+                model.Add(sum(x[g, t, p_id] for p_id in tier1_player_ids_f) == exact_tier1_per_team); count_c3 += 1
+        update_status(f"[제약 추가 완료] (C3) {count_c3}개 팀 제약 추가.")
+
+        # 아군/적군: 같은 팀 t 에서 함께 뛰는 AND(x[g,t,p1], x[g,t,p2]) 리터럴 합 = 아군 횟수,
+        # 서로 다른 팀 t != u 의 AND(x[g,t,p1], x[g,u,p2]) 리터럴 합 = 적군 횟수
+        profiler.begin('ally_enemy', '아군/적군 AND 리터럴')
+        update_status("[모델 생성] 아군/적군 리터럴 생성 중..."); are_enemies = {}; are_allies = {}
+        def add_and(a, b, name):
+            y = model.NewBoolVar(name)
+            model.AddImplication(y, a); model.AddImplication(y, b); model.AddBoolOr([a.Not(), b.Not(), y])
+            return y
+        for g in range(num_games):
+            for (id1, id2), enemy_only in zip(all_pairs, enemy_only_pair):
+                if enemy_only:
+                    # 같은 포지션(또는 (C3)로 같은 팀이 될 수 없는 1티어 쌍)은 함께 출전하면 항상 적군
+                    are_enemies[id1, id2, g] = [add_and(player_in_game[id1, g], player_in_game[id2, g], f'both_{id1}_{id2}_g{g}')]
+                    continue
+                are_allies[id1, id2, g] = [add_and(x[g, t, id1], x[g, t, id2], f'same_t{t}_{id1}_{id2}_g{g}')
+                                           for t in range(num_teams_per_game)]
+                are_enemies[id1, id2, g] = [add_and(x[g, t, id1], x[g, u, id2], f'diff_t{t}{u}_{id1}_{id2}_g{g}')
+                                            for t in range(num_teams_per_game) for u in range(num_teams_per_game) if t != u]
+        update_status("[모델 생성] 아군/적군 리터럴 생성 완료.")
+        return {'x': x, 'slot_literals': slot_literals, 'tier1_on_team': tier1_on_team}, player_in_game, are_allies, are_enemies, count_c2 + count_c3
+
+    if model_mode == MODEL_MODE_LEGACY:
+        handles, player_in_game, are_allies, are_enemies, constraint_count = build_core_legacy()
+    else:
+        handles, player_in_game, are_allies, are_enemies, constraint_count = build_core_boolean()
+    day_blocks = get_day_blocks(games_per_day)
+    profiler.begin('game_day', 'game_day 변수')
+    if symmetry_breaking:
+        # 날짜 고정 배치: 게임을 GAMES_PER_DAY 순서의 연속 블록으로 날짜에 고정 (날짜 탐색 제거)
+        fixed_game_day = {g: d for d, block in enumerate(day_blocks) for g in block}
+        game_day = [model.NewIntVar(fixed_game_day[g], fixed_game_day[g], f'game_day_{g}') for g in range(num_games)]
+        update_status(f"[모델 생성] game_day 고정 배치 {list(games_per_day)} 적용.")
+    else:
+        game_day = [model.NewIntVar(0, num_days - 1, f'game_day_{g}') for g in range(num_games)]
+        update_status(f"[모델 생성] game_day 변수 {len(game_day)}개 생성.")
+
+    def pair_literals(matchups, id1, id2):
+        # 두 선수의 전 게임 아군/적군 리터럴 (합 = 만난 횟수)
+        return [lit for g in range(num_games) for lit in matchups.get((id1, id2, g), [])]
+
+    def add_never_indicator(lits, name):
+        never = model.NewBoolVar(name)
+        if model_mode == MODEL_MODE_LEGACY:
+            total = model.NewIntVar(0, num_games, f'total_{name[len("never_"):]}')
+            model.Add(total == sum(lits))
+            model.Add(total == 0).OnlyEnforceIf(never)
+            model.Add(total >= 1).OnlyEnforceIf(never.Not())
+        else:
+            # never <=> 모든 리터럴이 0: 절(clause)만으로 표현
+            model.AddBoolOr(lits + [never])
+            for lit in lits: model.AddImplication(never, lit.Not())
+        return never
+
+    # (NEW) 1티어 맞대결 균등: 게임마다 1티어 쌍 하나가 맞붙으므로 각 쌍은 floor(G/쌍 수) ~ ceil(G/쌍 수)번
+    # (기본 설정은 1티어 5명 = 10쌍, 10게임이라 정확히 1번씩)
+    profiler.begin('tier1_match', '(NEW) 1티어 맞대결 균등')
+    tier1_pairs = index.pairs(index.both_tier1)
+    min_t1_match = num_games // len(tier1_pairs) if tier1_pairs else 0
+    max_t1_match = -(-num_games // len(tier1_pairs)) if tier1_pairs else 0
+    update_status(f"[제약 추가 중] (NEW) 1티어 맞대결 쌍마다 {min_t1_match}~{max_t1_match}번 발생..."); count_t1_match = 0
+    if tier1_pairs and num_games % len(tier1_pairs): update_status(f"[경고] 게임 수 {num_games} 가 1티어 조합 수 {len(tier1_pairs)} 로 나누어떨어지지 않음.")
+    for id1, id2 in tier1_pairs:
+        enemy_vars = pair_literals(are_enemies, id1, id2)
+        if not enemy_vars: continue
+        if min_t1_match == max_t1_match: model.Add(sum(enemy_vars) == min_t1_match)
+        else: model.AddLinearConstraint(sum(enemy_vars), min_t1_match, max_t1_match)
+        count_t1_match += 1
+    constraint_count += count_t1_match; update_status(f"[제약 추가 완료] (NEW) 1티어 맞대결 제약 {count_t1_match}개 추가.")
+
+    # (C5) 같은 포지션 간 최소 적군 조건
+    profiler.begin('C5', '(C5) 같은 포지션 간 최소 적군')
+    update_status("[제약 추가 중] (C5) 같은 포지션 간 최소 적군 조건 (1회 고정)..."); count_c5 = 0
+    for id1, id2 in index.pairs(index.same_pos):
+        enemy_vars = pair_literals(are_enemies, id1, id2)
+        if enemy_vars: guarded(model.Add(sum(enemy_vars) >= min_enemy_same_pos_diff_rank), 'C5'); count_c5 += 1
+    constraint_count += count_c5; update_status(f"[제약 추가 완료] (C5) {count_c5}개 추가.")
+
+    # (C8) 비1티어 선수 동일 경기 수
+    if target_play_count_non_tier1 != -1:
+        profiler.begin('C8', '(C8) 비1티어 선수 동일 경기 수')
+        update_status(f"[제약 추가 중] (C8) 비1티어 선수 동일 경기 수 ({target_play_count_non_tier1}회)..."); count_c8 = 0
+        for p_id in non_tier1_player_ids_f:
+            play_count_vars = [player_in_game[p_id, g] for g in range(num_games)]
+            guarded(model.Add(sum(play_count_vars) == target_play_count_non_tier1), 'C8'); count_c8 += 1
+        constraint_count += count_c8; update_status(f"[제약 추가 완료] (C8) {count_c8}개 추가.")
+    else:
+         update_status("[제약 제외됨] (C8) 비1티어 선수 동일 경기 수 제약 조건 제외됨.")
+
+    def add_free_day_constraints():
+        count_total = 0
+        # (NEW) 날짜별 게임 수: games_per_day 그대로 (기본 [4, 3, 3])
+        profiler.begin('day_balance', '(NEW) 날짜별 게임 수 분배')
+        update_status(f"[제약 추가 중] (NEW) 날짜별 게임 수 분배 {list(games_per_day)}..."); count_day_bal = 0
+        game_on_day_vars = [[model.NewBoolVar(f'g{g}_on_d{d}') for g in range(num_games)] for d in range(num_days)]
+        for g in range(num_games):
+            for d in range(num_days):
+                model.Add(game_day[g] == d).OnlyEnforceIf(game_on_day_vars[d][g]); model.Add(game_day[g] != d).OnlyEnforceIf(game_on_day_vars[d][g].Not()); count_day_bal += 2
+            model.Add(sum(game_on_day_vars[d][g] for d in range(num_days)) == 1); count_day_bal += 1
+        for d in range(num_days):
+            model.Add(sum(game_on_day_vars[d][g] for g in range(num_games)) == games_per_day[d]); count_day_bal += 1
+        count_total += count_day_bal; update_status(f"[제약 추가 완료] (NEW) 날짜 균등 분배 제약 {count_day_bal}개 추가.")
+        handles['game_on_day'] = game_on_day_vars # (C7) 은 add_ban_constraints 에서 이 리터럴로 추가
+
+        # <<< --- NEW: 동일 날짜 연속 경기 출전 금지 제약 조건 추가 --- >>>
+        profiler.begin('consecutive', '(NEW) 동일 날짜 연속 경기 출전 금지')
+        update_status("[제약 추가 중] (NEW) 동일 날짜 연속 경기 출전 금지..."); count_consecutive = 0
+        # 인접한 두 게임이 같은 날짜인지 나타내는 변수 미리 생성
+        same_day_vars = {}
+        for g in range(num_games - 1):
+            var = model.NewBoolVar(f'same_day_{g}_{g+1}')
+            # game_day 변수를 사용하여 g와 g+1이 같은 날인지 확인
+            model.Add(game_day[g] == game_day[g+1]).OnlyEnforceIf(var)
+            model.Add(game_day[g] != game_day[g+1]).OnlyEnforceIf(var.Not())
+            same_day_vars[g] = var
+            count_consecutive += 2 # 변수 정의 제약 2개
+
+        # 모든 선수와 인접 게임 쌍에 대해 제약 적용
+        for p_id in player_ids_f:
+            for g in range(num_games - 1):
+                # 제약: p_plays_g + p_plays_gplus1 + same_day_g_gplus1 <= 2
+                # 즉, 세 변수가 동시에 1이 될 수 없음 (같은 날 연속 출전 금지)
+                guarded(model.Add(player_in_game[p_id, g] + player_in_game[p_id, g + 1] + same_day_vars[g] <= 2), 'consecutive')
+                count_consecutive += 1
+
+        count_total += count_consecutive
+        update_status(f"[제약 추가 완료] (NEW) 동일 날짜 연속 경기 금지 제약 {count_consecutive}개 추가.")
+        # <<< --- 연속 경기 금지 제약 조건 추가 완료 --- >>>
+        return count_total
+
+    def add_fixed_day_constraints():
+        # 날짜가 고정되어 있으므로 날짜 균등 분배는 배치 자체로 충족, (C7)/연속 경기 금지는 상수 조건으로 축약
+        count_total = 0
+        update_status(f"[제약 추가 완료] (NEW) 날짜 균등 분배: 고정 배치 {list(games_per_day)} 로 충족.")
+        profiler.begin('consecutive', '(NEW) 동일 날짜 연속 경기 출전 금지')
+        update_status("[제약 추가 중] (NEW) 동일 날짜 연속 경기 출전 금지..."); count_consecutive = 0
+        for block in day_blocks:
+            for g, g_next in zip(block, block[1:]):
+                for p_id in player_ids_f:
+                    guarded(model.AddBoolOr([player_in_game[p_id, g].Not(), player_in_game[p_id, g_next].Not()]), 'consecutive'); count_consecutive += 1
+        count_total += count_consecutive
+        update_status(f"[제약 추가 완료] (NEW) 동일 날짜 연속 경기 금지 제약 {count_consecutive}개 추가.")
+        return count_total
+
+    def add_symmetry_breaking_constraints():
+        # 게임 순서 자체는 연속 경기 금지 때문에 자유롭게 바꿀 수 없으므로, 실제로 해를 보존하는 변환만 제거:
+        #  - 팀 A/B 교환: 팀 A 의 1티어 ID < 팀 B 의 1티어 ID
+        #  - 같은 날 게임 순서 뒤집기: 첫 게임 서명 <= 마지막 게임 서명
+        #  (게임 수와 출전 금지 선수가 같은 날짜 블록 교환 제거는 출전 금지에 따라 달라지므로 add_ban_constraints 에서 추가)
+        # 게임 서명 = 팀 A 1티어 ID * 선수 수 + 팀 B 1티어 ID (방향 고정 후 1티어 맞대결 쌍을 나타냄)
+        count_sym = 0
+        profiler.begin('symmetry', '(SYM) 대칭 제거')
+        update_status("[제약 추가 중] (SYM) 대칭 제거...")
+        tier1_on_team = handles['tier1_on_team']
+        if exact_tier1_per_team != 1 or not tier1_on_team:
+            update_status("[제약 제외됨] (SYM) 팀당 1티어 1명 조건이 아니어서 대칭 제거 제외됨.")
+            return 0
+
+        def tier1_id(g, t): return get_tier1_id_expr(tier1_on_team, g, t)
+        def signature(g): return get_game_signature(tier1_on_team, g, num_teams_per_game, num_players_f)
+
+        for g in range(num_games):
+            for t in range(num_teams_per_game - 1):
+                model.Add(tier1_id(g, t) < tier1_id(g, t + 1)); count_sym += 1
+        for block in day_blocks:
+            if len(block) >= 2: model.Add(signature(block[0]) <= signature(block[-1])); count_sym += 1
+        update_status(f"[제약 추가 완료] (SYM) 대칭 제거 제약 {count_sym}개 추가.")
+        return count_sym
+
+    # (NEW) 날짜별 게임 수 균등 분배 / (C7) 특정 날짜 출전 금지 / (NEW) 동일 날짜 연속 경기 출전 금지
+    if symmetry_breaking:
+        constraint_count += add_fixed_day_constraints()
+    else:
+        constraint_count += add_free_day_constraints()
+
+    # (SYM) 대칭 제거: 팀 A/B 방향 고정 + 같은 날 게임 순서 역전/같은 조건의 날짜 블록 교환 제거
+    if symmetry_breaking:
+        constraint_count += add_symmetry_breaking_constraints()
+
+
+    # --- 최적화 목표 설정 ---
+    profiler.begin('objective', '목표: 0회 매치업 지시 변수')
+    update_status("[최적화 목표 설정] 0회 매치업 최소화...")
+    never_enemies_vars = []
+    never_allies_vars = []
+    never_enemies_of = defaultdict(list); never_allies_of = defaultdict(list) # 선수별 0회 변수 (하한 제약용)
+    for (id1, id2), ally_pair in zip(all_pairs, index.ally_pair.tolist()):
+        # 적군 0회 변수
+        valid_enemy_vars = pair_literals(are_enemies, id1, id2)
+        if valid_enemy_vars:
+             never_enemies_vars.append(add_never_indicator(valid_enemy_vars, f'never_enemies_{id1}_{id2}'))
+             never_enemies_of[id1].append(never_enemies_vars[-1]); never_enemies_of[id2].append(never_enemies_vars[-1])
+
+        # 아군 0회 변수 (다른 포지션이면서 둘 다 1티어가 아닌 쌍만)
+        if ally_pair:
+            valid_ally_vars = pair_literals(are_allies, id1, id2)
+            if valid_ally_vars:
+                 never_allies_vars.append(add_never_indicator(valid_ally_vars, f'never_allies_{id1}_{id2}'))
+                 never_allies_of[id1].append(never_allies_vars[-1]); never_allies_of[id2].append(never_allies_vars[-1])
+
+    model.Minimize(sum(never_enemies_vars) + sum(never_allies_vars))
+    zero_matchups_count = len(never_enemies_vars) + len(never_allies_vars)
+    update_status(f"[최적화 목표 설정 완료] 총 {zero_matchups_count}개의 0회 매치업 변수 고려.")
+
+    profiler.end()
+
+    built = {
+        'model': model, 'model_mode': model_mode,
+        'game_day': game_day, 'player_in_game': player_in_game,
+        'never_enemies_vars': never_enemies_vars, 'never_allies_vars': never_allies_vars,
+        'never_enemies_of': dict(never_enemies_of), 'never_allies_of': dict(never_allies_of),
+        'constraint_count': constraint_count, 'profile': profiler.spans, 'rule_guards': rule_guards,
+        # add_ban_constraints 가 쓰는 구성 값
+        'structure': {
+            'games_per_day': list(games_per_day), 'num_teams_per_game': num_teams_per_game, 'players_per_team': players_per_team,
+            'symmetry_breaking': symmetry_breaking, 'num_players': num_players_f, 'player_ids': list(player_ids_f),
+            'tier1_ids': sorted(tier1_player_ids_f), 'non_tier1_ids': sorted(non_tier1_player_ids_f),
+            'target_plays': target_play_count_non_tier1, 'max_t1_match': max_t1_match, 'num_tier1_pairs': len(tier1_pairs),
+        },
+    }
+    built.update(handles)
+    return built
+
+
+def add_ban_constraints(built, banned_player_ids_by_day, update_status=lambda msg: None, redundant_cuts=True, guard_bans=False):
+    # 구조 모델에 출전 금지에 따라 달라지는 제약만 추가: (C7), (SYM) 같은 조건의 날짜 블록 교환 제거, (LB) 하한 중복 제약
+    # guard_bans: (날짜, 선수) 출전 금지마다 가정 리터럴로 감쌈 (built['ban_guards']). 금지를 끌 수 있으면 출전 금지 집합에 기대는
+    # 날짜 블록 교환 제거/하한은 해를 잘라낼 수 있으므로 추가하지 않음
+    model = built['model']; profiler = BuildProfiler(model); st = built['structure']
+    games_per_day = st['games_per_day']; num_games = sum(games_per_day); num_days = len(games_per_day)
+    day_blocks = get_day_blocks(games_per_day); player_in_game = built['player_in_game']
+    constraint_count = 0; ban_guards = built['ban_guards'] = {}
+    if guard_bans: redundant_cuts = False
+
+    # (C7) 특정 날짜 출전 금지: 자유 배치는 게임-날짜 리터럴로 함의, 고정 배치는 그날 블록의 출전 변수를 0 으로
+    profiler.begin('C7', '(C7) 특정 날짜 출전 금지')
+    update_status("[제약 추가 중] (C7) 특정 날짜 출전 금지..."); count_c7 = 0
+    for day_idx, banned_ids in banned_player_ids_by_day.items():
+        for p_id in sorted(banned_ids):
+            guard = None
+            if guard_bans: guard = ban_guards[day_idx, p_id] = model.NewBoolVar(f'guard_ban_d{day_idx}_{p_id}')
+            if st['symmetry_breaking']:
+                for g in day_blocks[day_idx]:
+                    ct = model.Add(player_in_game[p_id, g] == 0); count_c7 += 1
+                    if guard is not None: ct.OnlyEnforceIf(guard)
+            else:
+                for g in range(num_games):
+                    ct = model.AddImplication(built['game_on_day'][day_idx][g], player_in_game[p_id, g].Not()); count_c7 += 1
+                    if guard is not None: ct.OnlyEnforceIf(guard)
+    if count_c7 > 0: constraint_count += count_c7; update_status(f"[제약 추가 완료] (C7) {count_c7}개 추가.")
+    else: update_status("[제약 추가 완료] (C7) 해당 제약 없음.")
+
+    # (SYM) 게임 수와 출전 금지 선수가 같은 날짜 블록 교환: 앞 날짜 첫 게임 서명 <= 뒤 날짜 첫 게임 서명
+    tier1_on_team = built.get('tier1_on_team')
+    if st['symmetry_breaking'] and EXACT_TIER1_PER_TEAM_FIXED == 1 and tier1_on_team and not guard_bans:
+        profiler.begin('symmetry', '(SYM) 같은 조건의 날짜 블록 교환 제거'); count_sym = 0
+        signature = lambda g: get_game_signature(tier1_on_team, g, st['num_teams_per_game'], st['num_players'])
+        for d1, d2 in combinations(range(num_days), 2):
+            same_shape = len(day_blocks[d1]) == len(day_blocks[d2]) >= 1
+            if same_shape and banned_player_ids_by_day.get(d1, set()) == banned_player_ids_by_day.get(d2, set()):
+                model.Add(signature(day_blocks[d1][0]) <= signature(day_blocks[d2][0])); count_sym += 1
+        constraint_count += count_sym; update_status(f"[제약 추가 완료] (SYM) 날짜 블록 교환 제거 {count_sym}개 추가.")
+
+    # (LB) 세기 논법 하한: 해 집합은 그대로 두고 목표 하한만 강화 (CP-SAT 자체 하한은 LP 완화가 약해 0 근처에 머묾)
+    #  - 게임 하나가 만드는 적군 쌍은 C(팀 수, 2) x 팀 인원^2, 아군 쌍은 팀 수 x C(팀 인원, 2) => 0회 쌍 수 >= 후보 쌍 수 - 전체 만남 수
+    #  - 선수는 게임마다 (팀 수 - 1) x 팀 인원 명의 적군, (팀 인원 - 1) 명의 아군을 만나고 출전 수 상한은 (C8)/출전 금지로 정해짐
+    #    => 선수별 0회 쌍 수 하한, 쌍마다 두 선수에서 두 번 세므로 합 / 2 도 전체 하한
+    # 선수별/게임별 만남 수 제약까지 모델에 넣으면 첫 해 발견이 늦어져 (기본 인스턴스 20초 내 해 없음) 전체 하한 두 개만 추가.
+    objective_lower_bound = 0
+    if redundant_cuts:
+        profiler.begin('redundant', '(LB) 만남 수 세기 중복 제약 / 목표 하한')
+        update_status("[제약 추가 중] (LB) 0회 매치업 하한 중복 제약..."); count_lb = 0
+        num_teams_per_game = st['num_teams_per_game']; players_per_team = st['players_per_team']
+        never_enemies_vars = built['never_enemies_vars']; never_allies_vars = built['never_allies_vars']
+        never_enemies_of = built['never_enemies_of']; never_allies_of = built['never_allies_of']
+        enemies_per_game = (num_teams_per_game - 1) * players_per_team; allies_per_game = players_per_team - 1
+        tier1_ids = set(st['tier1_ids']); non_tier1_ids = set(st['non_tier1_ids'])
+        max_plays = {}
+        for p_id in st['player_ids']:
+            # 출전 금지 날짜의 게임은 뛸 수 없음 + (C8) 목표 / 1티어는 맞대결 계획상 최대 출전 수
+            plays = num_games - sum(games_per_day[d] for d, banned_ids in banned_player_ids_by_day.items() if p_id in banned_ids)
+            if p_id in tier1_ids and st['num_tier1_pairs']: plays = min(plays, (len(tier1_ids) - 1) * st['max_t1_match'])
+            elif p_id in non_tier1_ids and st['target_plays'] != -1: plays = min(plays, st['target_plays'])
+            max_plays[p_id] = plays
+        enemy_meetings = num_games * (num_teams_per_game * (num_teams_per_game - 1) // 2) * players_per_team ** 2
+        ally_meetings = num_games * num_teams_per_game * (players_per_team * (players_per_team - 1) // 2)
+        enemy_lb = max(len(never_enemies_vars) - enemy_meetings,
+                       -(-sum(max(0, len(never_enemies_of.get(p, ())) - enemies_per_game * max_plays[p]) for p in st['player_ids']) // 2), 0)
+        ally_lb = max(len(never_allies_vars) - ally_meetings,
+                      -(-sum(max(0, len(never_allies_of.get(p, ())) - allies_per_game * max_plays[p]) for p in st['player_ids']) // 2), 0)
+        model.Add(sum(never_enemies_vars) >= enemy_lb); model.Add(sum(never_allies_vars) >= ally_lb); count_lb += 2
+        objective_lower_bound = enemy_lb + ally_lb
+        constraint_count += count_lb
+        update_status(f"[제약 추가 완료] (LB) {count_lb}개 추가. 0회 매치업 하한: 적군 {enemy_lb} + 아군 {ally_lb} = {objective_lower_bound}")
+    profiler.end()
+    built['profile'] = built['profile'] + profiler.spans
+    built['constraint_count'] += constraint_count; built['objective_lower_bound'] = objective_lower_bound
+    return built
+
+
+def build_schedule_model(positions, player_data,
+                         num_teams_per_game, players_per_team,
+                         banned_players_by_day,
+                         model_mode=DEFAULT_MODEL_MODE,
+                         symmetry_breaking=False,
+                         update_status=lambda msg: None,
+                         games_per_day=GAMES_PER_DAY,
+                         redundant_cuts=True,
+                         templates=False):
+    # 구조 모델 + 출전 금지 제약. templates: ModelTemplateCache, None 이면 프로세스 공용 캐시, False 면 매번 새로 빌드
+    # (템플릿을 쓰면 구조 모델은 캐시에서 복제하고 출전 금지 제약만 추가)
+    build_start_time = time.time()
+    if templates is None: templates = get_default_model_templates()
+    built = None
+    if templates is not False:
+        template_key = make_template_key(player_data, positions, num_teams_per_game, players_per_team, model_mode, symmetry_breaking,
+                                         games_per_day, code_version=get_builder_fingerprint())
+        clone_start = time.perf_counter()
+        built, source = templates.get(template_key)
+        if built is not None:
+            num_vars, num_constraints = get_model_size(built['model'])
+            built['profile'] = [{'family': 'template', 'label': f"구조 템플릿 복제 ({MODEL_TEMPLATE_SOURCE_LABELS[source]})",
+                                 'seconds': round(time.perf_counter() - clone_start, 4), 'vars': num_vars, 'constraints': num_constraints}]
+            update_status(f"[모델 템플릿] {MODEL_TEMPLATE_SOURCE_LABELS[source]} 구조 모델 복제 "
+                          f"({(time.perf_counter() - clone_start) * 1000:.0f}ms, 변수 {num_vars}개 / 제약 {num_constraints}개) - 출전 금지 제약만 추가.")
+    if built is None:
+        built = build_structural_model(positions, player_data, num_teams_per_game, players_per_team, model_mode=model_mode,
+                                       symmetry_breaking=symmetry_breaking, update_status=update_status, games_per_day=games_per_day)
+        if built is None: return None
+        if templates is not False:
+            templates.put(template_key, built)
+            update_status("[모델 템플릿] 구조 모델 저장 (다음 실행부터 복제해서 사용).")
+
+    (_, _, _, _, _, _, player_to_id_f, _, _, _, _, _, _, display_to_name_map_f, _) = process_player_data(player_data)
+    banned_player_ids_by_day = defaultdict(set)
+    for day, banned_names_display in banned_players_by_day.items():
+        day_idx = day - 1
+        if 0 <= day_idx < len(games_per_day):
+            banned_names_actual = {display_to_name_map_f.get(disp_name) for disp_name in banned_names_display}
+            banned_player_ids_by_day[day_idx] = {player_to_id_f[p] for p in banned_names_actual if p in player_to_id_f}
+    add_ban_constraints(built, banned_player_ids_by_day, update_status, redundant_cuts=redundant_cuts)
+
+    num_vars, num_constraints = get_model_size(built['model'])
+    build_seconds = time.time() - build_start_time
+    update_status(f"\n--- 주요 제약 {built['constraint_count']}개 추가 완료 ---")
+    update_status(f"[모델 크기] 변수 {num_vars}개 / 제약 {num_constraints}개 (빌드 {build_seconds:.2f}초)")
+    update_status("[빌드 계측] " + " | ".join(f"{span['family']} {span['seconds']:.2f}초 +{span['vars']}변수 +{span['constraints']}제약"
+                                              for span in built['profile']))
+    built.update(num_vars=num_vars, num_constraints=num_constraints, build_seconds=build_seconds)
+    return built
+
+
+def compare_model_modes(positions, player_data, num_teams_per_game, players_per_team, banned_players_by_day,
+                        symmetry_breaking=False):
+    # 두 빌드 모드의 모델 크기와 빌드 시간을 (해 찾기 없이) 비교
+    rows = []
+    for mode, label in MODEL_MODE_LABELS.items():
+        built = build_schedule_model(positions, player_data, num_teams_per_game, players_per_team,
+                                     banned_players_by_day, model_mode=mode, symmetry_breaking=symmetry_breaking)
+        if built is None: continue
+        rows.append({'모드': label, '변수 수': built['num_vars'], '제약 수': built['num_constraints'],
+                     '빌드 시간(초)': round(built['build_seconds'], 3)})
+    return rows
+
+
+# --- 불가능 원인 진단: 출전 금지와 완화 가능한 규칙을 가정 리터럴로 감싸고, CP-SAT 이 돌려주는 충분 가정 집합(코어)을 최소화 ---
+# 코어 = 모두 지키면 해가 없는 출전 금지/규칙 묶음. 최소화 후에는 하나만 풀어도 해가 생김 (시간 안에 증명된 만큼)
+RELAXABLE_RULES = {
+    'C5': "(C5) 같은 포지션 간 최소 적군",
+    'C8': "(C8) 비1티어 선수 동일 경기 수",
+    'consecutive': "동일 날짜 연속 경기 출전 금지",
+}
+DIAGNOSE_TIME_LIMIT = 30 # 진단 전체 시간 제한(초). solve_schedule 안에서는 시간 제한 중 남은 시간과 이 값 중 작은 쪽
+DIAGNOSE_STEP_TIME_LIMIT = 10 # 최소화 단계 한 번(가정 하나를 빼고 다시 풀기)의 시간 제한(초)
+
+
+@dataclass
+class InfeasibilityCore:
+    # diagnose_infeasibility 의 반환값. items: [{'kind': 'ban'|'rule', 'day', 'player'(표시 이름), 'rule', 'label'}]
+    status: str # 'conflict' 코어 찾음 / 'feasible' 가정을 모두 지켜도 해 있음 / 'structural' 가정 없이도 불가능 / 'unknown' 시간 부족
+    items: list = field(default_factory=list)
+    minimal: bool = False # 코어의 모든 항목이 하나만 빼도 해가 생김이 증명됨
+    initial_size: int = None # 최소화 전 코어 크기
+    solves: int = 0
+    seconds: float = 0.0
+
+    @property
+    def labels(self):
+        return [item['label'] for item in self.items]
+
+    def to_dict(self):
+        return {'status': self.status, 'items': self.items, 'minimal': self.minimal, 'initial_size': self.initial_size,
+                'solves': self.solves, 'seconds': round(self.seconds, 3)}
+
+
+def diagnose_infeasibility(positions, player_data, num_teams_per_game, players_per_team, banned_players_by_day,
+                           symmetry_breaking=False, relax_rules=True, minimize=True,
+                           time_limit_seconds=DIAGNOSE_TIME_LIMIT, games_per_day=GAMES_PER_DAY,
+                           num_workers=DEFAULT_NUM_WORKERS, update_status=lambda msg: None, control=None):
+    # 출전 금지 (날짜, 선수) 마다, relax_rules 면 RELAXABLE_RULES 계열마다 가정 리터럴을 두고 목표 없이 실행 가능성만 판정.
+    # INFEASIBLE 이면 SufficientAssumptionsForInfeasibility 로 코어를 받고, minimize 면 규칙 -> 출전 금지 순으로 하나씩 빼 보며
+    # 여전히 불가능하면 버림 (새 코어로 나머지도 줄임). 날짜 배치(symmetry_breaking)는 해 찾기와 같아야 결과가 같음.
+    # control 이 중단되면 그때까지 줄인 코어를 minimal=False 로 반환
+    start = time.time(); deadline = start + time_limit_seconds
+    banned_players_by_day = normalize_banned_players_by_day(player_data, banned_players_by_day, len(games_per_day))
+    (_, _, _, _, _, _, _, id_to_player_f, _, _, _, _, _, _, name_to_display_f) = process_player_data(player_data)
+    update_status("[진단] 출전 금지/규칙을 가정 리터럴로 감싼 모델 빌드 중...")
+    built = build_structural_model(positions, player_data, num_teams_per_game, players_per_team, symmetry_breaking=symmetry_breaking,
+                                   games_per_day=games_per_day, guard_rules=relax_rules)
+    add_ban_constraints(built, get_banned_player_ids_by_day(player_data, banned_players_by_day), guard_bans=True)
+    model = built['model']; model.ClearObjective()
+    items = {}; literals = {} # 가정 리터럴 인덱스 -> 항목 / 리터럴
+    for family, lit in built['rule_guards'].items():
+        literals[lit.Index()] = lit
+        items[lit.Index()] = {'kind': 'rule', 'day': None, 'player': None, 'rule': family, 'label': RELAXABLE_RULES[family]}
+    for (day_idx, p_id), lit in built['ban_guards'].items():
+        display = name_to_display_f[id_to_player_f[p_id]]; literals[lit.Index()] = lit
+        items[lit.Index()] = {'kind': 'ban', 'day': day_idx + 1, 'player': display, 'rule': 'C7', 'label': f"{day_idx + 1}일차 출전 금지: {display}"}
+    update_status(f"[진단] 가정 {len(items)}개 (출전 금지 {len(built['ban_guards'])}개 + 규칙 {len(built['rule_guards'])}개)")
+
+    solves = 0
+    def check(indices, step_limit):
+        # (상태, 코어 인덱스 목록 또는 None)
+        nonlocal solves
+        solves += 1
+        model.ClearAssumptions(); model.AddAssumptions([literals[i] for i in indices])
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = max(0.1, min(step_limit, deadline - time.time()))
+        solver.parameters.num_search_workers = num_workers or default_num_workers()
+        if control is not None: control.attach_solver(solver)
+        status = solver.Solve(model)
+        if status != cp_model.INFEASIBLE: return status, None
+        return status, list(solver.SufficientAssumptionsForInfeasibility())
+
+    def result(status, core=(), minimal=False, initial_size=None):
+        report = InfeasibilityCore(status, [items[i] for i in core], minimal, initial_size, solves, time.time() - start)
+        update_status(f"[진단] {status}: " + (" / ".join(report.labels) or "-") + f" (해 찾기 {solves}번, {report.seconds:.1f}초)")
+        return report
+
+    status, core = check(list(items), time_limit_seconds)
+    if status != cp_model.INFEASIBLE:
+        return result('feasible' if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) else 'unknown')
+    if not core: return result('structural')
+    initial_size = len(core)
+    update_status(f"[진단] 초기 코어 {initial_size}개" + (" - 최소화 중..." if minimize else ""))
+    if not minimize: return result('conflict', core, len(core) == 1, initial_size)
+
+    # 규칙을 먼저 빼 봄: 규칙 없이도 설명되면 사용자가 바꿀 수 있는 출전 금지만 남음
+    remaining = sorted(core, key=lambda i: (items[i]['kind'] != 'rule', i)); kept = []; minimal = True
+    while remaining:
+        candidate = remaining.pop(0)
+        if time.time() >= deadline or (control is not None and control.stop_requested):
+            kept.append(candidate); minimal = False; continue
+        status, sub_core = check(kept + remaining, DIAGNOSE_STEP_TIME_LIMIT)
+        if status == cp_model.INFEASIBLE: # 빼도 불가능: 버리고 새 코어 밖의 나머지도 버림
+            sub_core = set(sub_core); remaining = [i for i in remaining if i in sub_core]
+        else:
+            kept.append(candidate)
+            if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE): minimal = False
+    return result('conflict', sorted(kept, key=lambda i: (items[i]['kind'] != 'rule', i)), minimal, initial_size)
+
+
+class SearchMonitor:
+    # 목표 값/하한 타임라인 기록 + StopCriteria 충족 시 StopSearch.
+    # 해 콜백과 하한 콜백은 솔버 스레드에서 불리고, 개선 없음 조건은 감시 스레드가 주기적으로 확인
+    def __init__(self, solver, stop_criteria=None):
+        self._solver = solver; self._criteria = stop_criteria
+        self._lock = threading.Lock(); self._done = threading.Event(); self._watchdog = None
+        self._started_at = self._last_improvement = time.time()
+        self._objective = None; self._bound = None
+        self.timeline = []; self.stop_reason = None
+
+    def start(self):
+        self._started_at = self._last_improvement = time.time()
+        if self._criteria is not None and self._criteria.no_improvement_seconds is not None:
+            self._watchdog = threading.Thread(target=self._watch, name="solve-watchdog", daemon=True)
+            self._watchdog.start()
+
+    def finish(self):
+        self._done.set()
+        if self._watchdog is not None: self._watchdog.join()
+
+    def on_solution(self, objective, bound):
+        with self._lock:
+            now = time.time()
+            if self._objective is None or objective < self._objective: self._last_improvement = now
+            self._objective = objective; self._raise_bound(bound); self._record(now)
+            self._check(now)
+
+    def on_bound(self, bound):
+        with self._lock:
+            now = time.time(); self._raise_bound(bound); self._record(now)
+            self._check(now)
+
+    def _raise_bound(self, bound):
+        if bound is not None: self._bound = bound if self._bound is None else max(self._bound, bound)
+
+    def _record(self, now):
+        self.timeline.append({'elapsed': round(now - self._started_at, 3), 'objective': self._objective, 'bound': self._bound})
+
+    def _check(self, now):
+        if self._criteria is None or self.stop_reason is not None: return
+        reason = self._criteria.check(self._objective, self._bound, now - self._last_improvement)
+        if reason is not None:
+            self.stop_reason = reason; self._solver.StopSearch()
+
+    def _watch(self):
+        interval = min(0.5, max(0.05, self._criteria.no_improvement_seconds / 10))
+        while not self._done.wait(interval):
+            with self._lock: self._check(time.time())
+
+
+class IncumbentCallback(cp_model.CpSolverSolutionCallback):
+    # 해가 나올 때마다 타임라인(SearchMonitor) 에 기록하고, control 이 있으면 스케줄을 추출해서 SolveControl 로 전달.
+    # 전달하는 objective 는 항상 0회 매치업 수 (수리 모드처럼 목표식이 다를 때는 하한을 보내지 않음)
+    # pool 이 있으면 모든 개선 해를 모아 둠 (대안 스케줄 후보)
+    def __init__(self, built, slot_keys, control, report_bound=True, monitor=None, pool=None):
+        super().__init__()
+        self._built = built; self._slot_keys = slot_keys; self._control = control; self._report_bound = report_bound
+        self._monitor = monitor; self._pool = pool
+        self._never_vars = built['never_enemies_vars'] + built['never_allies_vars']
+
+    def on_solution_callback(self):
+        if self._monitor is not None: self._monitor.on_solution(self.ObjectiveValue(), self.BestObjectiveBound())
+        if self._control is None and self._pool is None: return
+        incumbent = {
+            'objective': sum(self.Value(v) for v in self._never_vars),
+            'bound': self.BestObjectiveBound() if self._report_bound else None, 'elapsed': self.WallTime(),
+            'game_days': [self.Value(v) for v in self._built['game_day']],
+            'solution_assignments': {key: get_slot_value(self._built, self.Value, key) for key in self._slot_keys},
+        }
+        if self._pool is not None: self._pool.append(incumbent)
+        if self._control is not None: self._control.publish(incumbent)
+
+
+class StatusLog:
+    # 실행 로그. 호출하면 한 줄 추가 ({'elapsed', 'message'}), control 이 있으면 UI 쪽으로도 전달
+    def __init__(self, control=None):
+        self._lock = threading.Lock()
+        self._control = control
+        self._started_at = time.time()
+        self.entries = []
+
+    def __call__(self, msg):
+        with self._lock: self.entries.append({'elapsed': round(time.time() - self._started_at, 3), 'message': msg})
+        if self._control is not None: self._control.log(msg)
+
+    @property
+    def messages(self):
+        with self._lock: return [entry['message'] for entry in self.entries]
+
+
+@dataclass
+class SolveResult:
+    # solve_schedule / repair_schedule 의 반환값. schedule 등은 해를 찾지 못하면 None
+    status: int
+    schedule: dict = None
+    solution_assignments: dict = None
+    game_days: list = None
+    objective: int = None # 0회 매치업 수 (모든 엔진에서 정수)
+    bound: float = None
+    wall_time: float = 0.0
+    num_vars: int = None
+    num_constraints: int = None
+    changed_slots: int = None
+    from_cache: bool = False
+    profile: list = None
+    solver_stats: dict = None
+    timeline: list = None
+    stop_reason: str = None
+    precheck_issues: list = None
+    alternatives: list = None # [{'objective', 'distance'(1번과 다른 슬롯 수), 'game_days', 'solution_assignments'}], 1번 = 최종 해
+    infeasibility_core: dict = None # INFEASIBLE 일 때 diagnose_infeasibility 결과 (InfeasibilityCore.to_dict())
+    violations: list = None # 호출자가 완화를 허용해 어긴 하드 규칙 [(규칙, 메시지)] (예: 롤링 relax_c5) - 없으면 None
+    log: list = field(default_factory=list)
+
+    @property
+    def status_name(self):
+        return cp_model.CpSolverStatus(self.status).name
+
+    @property
+    def found(self):
+        return self.status in (cp_model.OPTIMAL, cp_model.FEASIBLE) and self.solution_assignments is not None
+
+    @property
+    def status_messages(self):
+        return [entry['message'] for entry in self.log]
+
+    def to_dict(self, include_log=False):
+        # JSON 직렬화용. 배정은 [g, t, p_idx, p_id] 목록으로 변환
+        result = {
+            'status': self.status_name, 'objective': self.objective, 'bound': self.bound,
+            'wall_time': round(self.wall_time, 3), 'num_vars': self.num_vars, 'num_constraints': self.num_constraints,
+            'changed_slots': self.changed_slots, 'from_cache': self.from_cache,
+            'game_days': self.game_days, 'stop_reason': self.stop_reason, 'timeline': self.timeline,
+            'precheck_issues': self.precheck_issues, 'infeasibility_core': self.infeasibility_core,
+            'violations': None if self.violations is None else [list(v) for v in self.violations],
+            'alternatives': None if self.alternatives is None else
+                [dict(alt, solution_assignments=[[g, t, p_idx, p_id] for (g, t, p_idx), p_id in sorted(alt['solution_assignments'].items())])
+                 for alt in self.alternatives],
+            'profile': self.profile, 'solver_stats': self.solver_stats,
+            'solution_assignments': None if self.solution_assignments is None else
+                [[g, t, p_idx, p_id] for (g, t, p_idx), p_id in sorted(self.solution_assignments.items())],
+        }
+        if include_log: result['log'] = list(self.log)
+        return result
+
+
+def make_result(status, status_log, num_teams_per_game, built=None, game_days=None, solution_assignments=None, **kwargs):
+    found = solution_assignments is not None
+    return SolveResult(
+        status=status,
+        schedule=make_schedule_dict(game_days, num_teams_per_game) if found else None,
+        solution_assignments=solution_assignments, game_days=list(game_days) if found else None,
+        num_vars=built['num_vars'] if built else None, num_constraints=built['num_constraints'] if built else None,
+        profile=built.get('profile') if built else None, solver_stats=built.get('solver_stats') if built else None,
+        timeline=built.get('timeline') if built else None, stop_reason=built.get('stop_reason') if built else None,
+        log=status_log.entries, **kwargs)
+
+
+def get_slot_keys(num_games, num_teams_per_game, num_positions):
+    return [(g, t, p_idx) for g in range(num_games) for t in range(num_teams_per_game) for p_idx in range(num_positions)]
+
+
+def extract_solution(built, value_fn, slot_keys):
+    solution_game_days = [value_fn(v) for v in built['game_day']]
+    solution_assignments = {key: get_slot_value(built, value_fn, key) for key in slot_keys}
+    return solution_game_days, solution_assignments
+
+
+def run_cp_sat(built, time_limit_seconds, slot_keys, update_status, control=None, report_bound=True,
+               num_workers=DEFAULT_NUM_WORKERS, stop_criteria=None, solver_params=None, pool=None):
+    # 모델을 풀고 (solver, status) 반환. 응답 통계/목표 값·하한 타임라인/조기 종료 사유는 built 에 기록.
+    # control 이 있으면 개선 해 스트리밍/중단 지원, stop_criteria 가 있으면 조건 충족 시 시간 제한 전에 종료.
+    # num_workers 가 None 이면 코어 수 기준 자동 (solver_params 에 튜닝된 워커 수가 있으면 그 이하)
+    global _active_solves
+    update_status("\n[솔버 실행] CP-SAT 솔버 해 찾기 시작..."); solver = cp_model.CpSolver()
+    apply_solver_params(solver, solver_params)
+    if num_workers is None:
+        num_workers = default_num_workers()
+        if solver_params and 'num_search_workers' in solver_params: num_workers = min(num_workers, solver_params['num_search_workers'])
+    solver.parameters.num_search_workers = num_workers
+    update_status(f"[솔버 설정] 병렬 워커 수: {num_workers} (사용 가능 코어 {available_cores()}개)")
+    solver.parameters.max_time_in_seconds = float(time_limit_seconds)
+    update_status(f"[솔버 설정] 최대 실행 시간: {time_limit_seconds}초")
+
+    if stop_criteria is not None: update_status(f"[솔버 설정] 조기 종료 조건: {stop_criteria}")
+
+    monitor = SearchMonitor(solver, stop_criteria)
+    def on_bound(bound):
+        monitor.on_bound(bound)
+        if control is not None and report_bound: control.update_bound(bound)
+    solver.best_bound_callback = on_bound
+    solution_callback = IncumbentCallback(built, slot_keys, control, report_bound, monitor=monitor, pool=pool)
+    if control is not None: control.attach_solver(solver)
+    monitor.start()
+    with _active_solves_lock: _active_solves += 1
+    try:
+        status = solver.Solve(built['model'], solution_callback)
+    finally:
+        with _active_solves_lock: _active_solves -= 1
+        monitor.finish()
+
+    update_status(f"\n[솔버 실행 완료] 소요 시간: {solver.WallTime():.2f}초 (요청 시간 제한: {time_limit_seconds}초)")
+    if monitor.stop_reason is not None: update_status(f"[조기 종료] {monitor.stop_reason}")
+    update_status(f"[솔버 상태] 결과: {solver.StatusName(status)}")
+    built['timeline'] = monitor.timeline; built['stop_reason'] = monitor.stop_reason
+    built['solver_stats'] = stats = get_solver_stats(solver)
+    update_status(f"[솔버 통계] 충돌 {stats['num_conflicts']} / 분기 {stats['num_branches']} / 재시작 {stats['num_restarts']} / "
+                  f"LP 반복 {stats['num_lp_iterations']} / 결정적 시간 {stats['deterministic_time']:.2f} / gap 적분 {stats['gap_integral']:.2f}")
+    return solver, status
+
+
+# --- 대안 스케줄: 목표 값 허용 범위 안에서 서로 최소 슬롯 수 이상 다른 스케줄 K 개 ---
+ALTERNATIVE_TIME_SHARE = 0.3 # 대안을 찾을 때 추가 해 찾기 몫으로 남겨 두는 시간 비율 (본 해 찾기는 나머지)
+
+
+def assignment_distance(assignments1, assignments2):
+    return sum(1 for key, p_id in assignments1.items() if assignments2.get(key) != p_id)
+
+
+def select_diverse_schedules(candidates, num_alternatives, max_objective, min_distance):
+    # 목표 값 순으로 보며 이미 고른 모든 스케줄과 min_distance 슬롯 이상 다른 것만 고름 (탐욕, 같은 값이면 앞 후보 우선)
+    chosen = []
+    for cand in sorted(candidates, key=lambda c: c['objective']):
+        if len(chosen) == num_alternatives or cand['objective'] > max_objective: break
+        if all(assignment_distance(cand['solution_assignments'], c['solution_assignments']) >= min_distance for c in chosen):
+            chosen.append(cand)
+    return chosen
+
+
+def find_alternatives(built, slot_keys, best, pool, num_alternatives, tolerance, min_distance, time_limit_seconds,
+                      update_status, control=None, num_workers=DEFAULT_NUM_WORKERS, solver_params=None, seed=0):
+    # best(최종 해) 가 1번. 해 찾기 중 모은 개선 해(pool) 에서 먼저 고르고, 모자라면 추가 해 찾기로 채움:
+    # 목표 값 <= best + tolerance, 고른 스케줄마다 '같은 슬롯 수 <= 전체 슬롯 수 - min_distance' 를 더하고
+    # best 의 게임 몇 개만 풀어 둔 이웃(나머지 슬롯은 가정 리터럴로 고정)을 풂. 처음부터 다시 풀면 목표 값 상한 때문에 수 초 안에 해가 잘 안 나옴.
+    # built['model'] 에 제약을 추가하므로 이후 같은 모델을 다시 쓰지 말 것
+    min_distance = max(1, min_distance); max_objective = best['objective'] + tolerance
+    chosen = select_diverse_schedules([best] + pool, num_alternatives, max_objective, min_distance)
+    update_status(f"[대안] 개선 해 {len(pool)}개에서 {len(chosen)}개 선택 (목표 값 {max_objective} 이하, 서로 {min_distance}슬롯 이상 차이).")
+    if len(chosen) < num_alternatives:
+        deadline = time.time() + time_limit_seconds; rng = np.random.default_rng(seed)
+        model = built['model']; never_vars = built['never_enemies_vars'] + built['never_allies_vars']
+        num_games = len(built['game_day']); slots_per_game = len(slot_keys) // num_games
+        num_free_games = min(num_games, max(2, -(-min_distance // slots_per_game) + 1))
+        model.Add(sum(never_vars) <= int(max_objective))
+        same_slot_literals = {}
+        def same_slot(key, p_id):
+            if (key, p_id) not in same_slot_literals: same_slot_literals[key, p_id] = slot_equals_literal(built, key, p_id)
+            return same_slot_literals[key, p_id]
+        def add_distance_cut(schedule):
+            assignments = schedule['solution_assignments']
+            model.Add(sum(same_slot(key, assignments[key]) for key in slot_keys) <= len(slot_keys) - min_distance)
+        for schedule in chosen: add_distance_cut(schedule)
+        attempt = 0
+        while len(chosen) < num_alternatives:
+            remaining = deadline - time.time()
+            if remaining < 0.5 or (control is not None and control.stop_requested): break
+            attempt += 1; free_games = set(rng.choice(num_games, size=num_free_games, replace=False).tolist())
+            model.ClearAssumptions()
+            model.AddAssumptions([same_slot(key, best['solution_assignments'][key]) for key in slot_keys if key[0] not in free_games])
+            solver = cp_model.CpSolver(); apply_solver_params(solver, solver_params)
+            solver.parameters.num_search_workers = num_workers or default_num_workers()
+            solver.parameters.max_time_in_seconds = max(0.5, remaining / (num_alternatives - len(chosen) + 1))
+            if control is not None: control.attach_solver(solver)
+            status = solver.Solve(model)
+            if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                update_status(f"[대안] 시도 {attempt}: 게임 {sorted(g + 1 for g in free_games)} 이웃에서 대안 없음 ({solver.StatusName(status)}).")
+                continue
+            game_days, assignments = extract_solution(built, solver.Value, slot_keys)
+            chosen.append({'objective': sum(solver.Value(v) for v in never_vars), 'game_days': game_days, 'solution_assignments': assignments})
+            add_distance_cut(chosen[-1])
+            update_status(f"[대안] 시도 {attempt}: #{len(chosen)} 발견 (게임 {sorted(g + 1 for g in free_games)} 변경, "
+                          f"목표 값 {chosen[-1]['objective']}, {solver.WallTime():.2f}초).")
+        model.ClearAssumptions()
+    chosen.sort(key=lambda sched: sched['objective']) # 이웃 탐색이 best 보다 좋은 해를 찾으면 그게 1번
+    return [{'objective': sched['objective'], 'game_days': list(sched['game_days']), 'solution_assignments': sched['solution_assignments'],
+             'distance': assignment_distance(sched['solution_assignments'], chosen[0]['solution_assignments'])} for sched in chosen]
+
+
+# --- 스케줄 검증 / 가져오기 / 내보내기 (schedule_validate) ---
+def make_validation_rules(positions, player_data, num_teams_per_game, players_per_team, banned_players_by_day,
+                          games_per_day=GAMES_PER_DAY):
+    # 여러 스케줄을 같은 조건으로 검증할 때 한 번만 만들어 validate_schedule(rules=...) 로 넘김
+    index = get_player_index(player_data, positions)
+    banned_players_by_day = normalize_banned_players_by_day(player_data, banned_players_by_day, len(games_per_day))
+    return schedule_validate.build_rules(
+        index, list(games_per_day), get_banned_player_ids_by_day(player_data, banned_players_by_day), labels=index.labels(),
+        target_plays=get_target_play_count(index.non_tier1_ids, games_per_day, num_teams_per_game, players_per_team),
+        tier1_per_team=EXACT_TIER1_PER_TEAM_FIXED, min_enemy_same_pos=MIN_ENEMY_SAME_POS_FIXED)
+
+
+def validate_schedule(positions, player_data, num_teams_per_game, players_per_team, banned_players_by_day,
+                      game_days, solution_assignments, games_per_day=GAMES_PER_DAY, rules=None):
+    # CP-SAT 없이 스케줄 하나의 하드 제약 위반 / 0회 매치업 수 / 만남 행렬 계산 (schedule_validate.ValidationReport)
+    if rules is None:
+        rules = make_validation_rules(positions, player_data, num_teams_per_game, players_per_team, banned_players_by_day, games_per_day)
+    shape = (len(game_days), num_teams_per_game, len(positions))
+    outside = sorted(key for key in solution_assignments if not all(0 <= k < size for k, size in zip(key, shape)))
+    if outside: # 격자를 만들 수 없는 슬롯 (팀 수가 다른 스케줄 등): 인덱싱 대신 구조 위반으로 보고
+        return schedule_validate.ValidationReport([('구조', f"{g + 1}게임 {schedule_validate.team_label(t)}팀 {p_idx + 1}번 슬롯: "
+                                                           f"스케줄 모양 (게임 {shape[0]}개 x 팀 {shape[1]}개 x 포지션 {shape[2]}개) 밖")
+                                                  for g, t, p_idx in outside])
+    grid = schedule_validate.grid_from_assignments(solution_assignments, len(game_days), num_teams_per_game, len(positions))
+    return schedule_validate.check_grid(rules, grid, game_days)
+
+
+def export_schedule(fmt, positions, player_data, num_teams_per_game, game_days, solution_assignments, objective=None):
+    # fmt: 'json' / 'csv' / 'parquet' -> 바이트. 선수는 이름으로 기록
+    (_, _, _, _, _, _, _, id_to_player_f, _, _, _, _, _, _, _) = process_player_data(player_data)
+    grid = schedule_validate.grid_from_assignments(solution_assignments, len(game_days), num_teams_per_game, len(positions))
+    return schedule_validate.dump_schedule(fmt, positions, id_to_player_f, game_days, grid, objective)
+
+
+def import_schedule(fmt, data, positions, player_data, num_teams_per_game=num_teams_per_game):
+    # export_schedule 의 반대 -> (game_days(0부터), solution_assignments). 선수는 이름 또는 "별명(이름)" 표시 이름, 게임당 팀 수가 다르면 ValueError
+    (_, _, _, _, _, _, player_to_id_f, _, _, _, _, _, _, display_to_name_map_f, _) = process_player_data(player_data)
+    name_to_id = dict(player_to_id_f, **{disp: player_to_id_f[name] for disp, name in display_to_name_map_f.items()})
+    game_days, grid = schedule_validate.load_schedule(fmt, data, positions, name_to_id, num_teams_per_game)
+    return game_days, schedule_validate.assignments_from_grid(grid)
+
+
+HEURISTIC_TIME_LIMIT = 1.0 # 구성적 휴리스틱 최대 시간 (전체 시간 제한의 10% 이하)
+
+
+def build_heuristic_schedule(positions, player_data, num_teams_per_game, players_per_team, banned_players_by_day,
+                             games_per_day, fixed_day_layout, time_limit):
+    # schedule_heuristic 으로 하드 제약을 모두 만족하는 스케줄 구성. 지원하지 않는 구성이거나 못 만들면 None
+    if num_teams_per_game != 2 or EXACT_TIER1_PER_TEAM_FIXED != 1: return None
+    index = get_player_index(player_data, positions)
+    target = get_target_play_count(index.non_tier1_ids, games_per_day, num_teams_per_game, players_per_team)
+    heuristic = schedule_heuristic.construct_schedule(
+        index.pos_player_ids, set(index.tier1_ids), games_per_day, get_banned_player_ids_by_day(player_data, banned_players_by_day),
+        target_plays=target, num_players=index.num_players, fixed_day_layout=fixed_day_layout, time_limit=time_limit)
+    if heuristic is not None:
+        grid = schedule_validate.grid_from_assignments(heuristic['solution_assignments'], sum(games_per_day), num_teams_per_game, len(positions))
+        heuristic['objective'] = schedule_validate.count_zero_matchups(index, grid)
+    return heuristic
+
+
+def solve_schedule(positions, player_data,
+                   num_teams_per_game, players_per_team,
+                   banned_players_by_day,
+                   time_limit_seconds,
+                   model_mode=DEFAULT_MODEL_MODE,
+                   symmetry_breaking=False,
+                   cache=None,
+                   control=None,
+                   num_workers=DEFAULT_NUM_WORKERS,
+                   games_per_day=GAMES_PER_DAY,
+                   stop_criteria=None,
+                   solver_params=None,
+                   use_heuristic=True,
+                   num_alternatives=1,
+                   alternative_tolerance=ALTERNATIVE_TOLERANCE,
+                   alternative_min_distance=ALTERNATIVE_MIN_DISTANCE,
+                   templates=None,
+                   diagnose_infeasible=True):
+    # solver_params: CP-SAT 파라미터 {이름: 값}. None 이면 크기가 가장 가까운 튜닝 프로필 사용, {} 이면 기본값
+    # num_alternatives > 1 이면 한 번의 호출로 서로 다른 준최적 스케줄을 최대 그 수만큼 SolveResult.alternatives 에 반환
+    # templates: 구조 모델 템플릿 캐시 (None = 프로세스 공용, False = 매번 새로 빌드)
+    # diagnose_infeasible: 솔버가 INFEASIBLE 을 증명하면 충돌하는 최소 출전 금지/규칙 묶음을 진단해 infeasibility_core 에 담음
+    num_games = sum(games_per_day)
+    slot_keys = get_slot_keys(num_games, num_teams_per_game, len(positions))
+    update_status = StatusLog(control)
+    banned_players_by_day = normalize_banned_players_by_day(player_data, banned_players_by_day, len(games_per_day))
+    solve_start = time.time()
+
+    update_status(f"\n=== {num_games} 게임 스케줄 생성 시작 (0회 매치업 최소화, 시간 제한: {time_limit_seconds}초) ===")
+
+    # --- 출전 금지 사전 점검: 확실히 불가능하면 모델을 만들지 않고 병목과 함께 즉시 반환 ---
+    precheck_start = time.time()
+    precheck_issues = precheck_bans(positions, player_data, num_teams_per_game, players_per_team, banned_players_by_day,
+                                    games_per_day, fixed_day_layout=symmetry_breaking)
+    if precheck_issues:
+        for issue in precheck_issues: update_status(f"[사전 점검] {issue}")
+        update_status(f"[사전 점검] 출전 금지 조합으로는 스케줄을 만들 수 없습니다 ({(time.time() - precheck_start) * 1000:.1f}ms).")
+        return make_result(cp_model.INFEASIBLE, update_status, num_teams_per_game,
+                           wall_time=time.time() - solve_start, precheck_issues=precheck_issues)
+    update_status(f"[사전 점검] 통과 ({(time.time() - precheck_start) * 1000:.1f}ms).")
+
+    # --- 스케줄 캐시 조회 ---
+    cache_key = None; cached = None; report = None
+    if cache is not None:
+        cache_key = make_cache_key(player_data, banned_players_by_day, len(games_per_day), games_per_day, fixed_day_layout=symmetry_breaking)
+        cached = cache.get(cache_key)
+        if cached:
+            # 저장 이후 규칙이 바뀌었을 수 있으므로 재검증 (1ms 미만). 위반이 있으면 캐시 항목을 쓰지 않음
+            report = validate_schedule(positions, player_data, num_teams_per_game, players_per_team, banned_players_by_day,
+                                       cached['game_days'], cached['solution_assignments'], games_per_day)
+            if not report.valid:
+                update_status(f"[캐시] 저장된 스케줄이 현재 제약을 위반해 삭제 ({len(report.violations)}건, 예: {report.violations[0][1]}).")
+                cache.discard(cache_key); cached = None
+            elif report.objective != cached['objective']:
+                update_status(f"[캐시] 저장된 목표 값 {cached['objective']} 를 재채점 값 {report.objective} 로 교체.")
+                cached['objective'] = report.objective
+        if cached and cached['status'] == STATUS_OPTIMAL:
+            update_status(f"[캐시] 최적 스케줄 발견 (목표 값 {cached['objective']}) - 해 찾기 없이 즉시 반환.")
+            return make_result(cp_model.OPTIMAL, update_status, num_teams_per_game,
+                               game_days=cached['game_days'], solution_assignments=cached['solution_assignments'],
+                               objective=round(cached['objective']), bound=cached['bound'],
+                               wall_time=time.time() - solve_start, from_cache=True)
+        elif cached:
+            update_status(f"[캐시] 이전 실행 가능 스케줄 (목표 값 {cached['objective']}, 하한 {cached['bound']}) 을 힌트로 사용.")
+        elif report is None:
+            update_status("[캐시] 저장된 스케줄 없음.")
+    built = build_schedule_model(positions, player_data, num_teams_per_game, players_per_team,
+                                 banned_players_by_day, model_mode=model_mode,
+                                 symmetry_breaking=symmetry_breaking, update_status=update_status,
+                                 games_per_day=games_per_day, templates=templates)
+    if built is None: return make_result(cp_model.MODEL_INVALID, update_status, num_teams_per_game)
+    if cached: add_solution_hints(built, cached['solution_assignments'], cached['game_days'])
+
+    # --- 구성적 휴리스틱 초기 해: 힌트로 넘기고, CP-SAT 이 시간 안에 해를 못 찾으면 그대로 반환 ---
+    heuristic = None
+    if use_heuristic and not cached:
+        heuristic_start = time.time()
+        heuristic = build_heuristic_schedule(positions, player_data, num_teams_per_game, players_per_team, banned_players_by_day,
+                                             games_per_day, symmetry_breaking, min(HEURISTIC_TIME_LIMIT, 0.1 * time_limit_seconds))
+        if heuristic is None:
+            update_status(f"[휴리스틱] 초기 스케줄을 만들지 못했습니다 ({time.time() - heuristic_start:.2f}초).")
+        else:
+            update_status(f"[휴리스틱] 초기 스케줄 구성 ({(time.time() - heuristic_start) * 1000:.0f}ms, 0회 매치업 {heuristic['objective']}개) - 힌트로 사용.")
+            add_solution_hints(built, heuristic['solution_assignments'], heuristic['game_days'])
+            if control is not None:
+                control.publish({'objective': heuristic['objective'], 'bound': built['objective_lower_bound'] or None, 'elapsed': time.time() - solve_start,
+                                 'game_days': heuristic['game_days'], 'solution_assignments': heuristic['solution_assignments']})
+            if heuristic['objective'] <= built['objective_lower_bound']: # 분석 하한에 도달했으면 CP-SAT 없이 최적 증명 끝
+                update_status(f"[하한] 휴리스틱 스케줄이 하한 {built['objective_lower_bound']} 에 도달 - 최적해로 반환.")
+                return make_result(cp_model.OPTIMAL, update_status, num_teams_per_game, built,
+                                   game_days=heuristic['game_days'], solution_assignments=heuristic['solution_assignments'],
+                                   objective=heuristic['objective'], bound=built['objective_lower_bound'],
+                                   wall_time=time.time() - solve_start)
+    if control is not None and control.stop_requested:
+        update_status("[중단] 해 찾기 시작 전에 중단 요청됨.")
+        return make_result(cp_model.UNKNOWN, update_status, num_teams_per_game, built)
+    if solver_params is None:
+        profile = get_solver_profile(sum(len(ranks) for ranks in player_data.values()), num_games)
+        if profile is not None:
+            solver_params = profile['params']
+            update_status(f"[솔버 설정] 튜닝 프로필 적용 ({profile['num_players']}명 / {profile['num_games']}게임): {solver_params}")
+
+    # --- 솔버 실행 --- (대안을 찾을 때는 시간 일부를 추가 해 찾기 몫으로 남기고, 개선 해를 모두 후보로 모음)
+    pool = None; main_time_limit = time_limit_seconds
+    if num_alternatives > 1:
+        pool = [heuristic] if heuristic is not None else []
+        main_time_limit = time_limit_seconds * (1 - ALTERNATIVE_TIME_SHARE)
+    try:
+        solver, status = run_cp_sat(built, main_time_limit, slot_keys, update_status, control, num_workers=num_workers,
+                                    stop_criteria=stop_criteria, solver_params=solver_params, pool=pool)
+    except Exception as e:
+        update_status(f"[솔버 오류] {e}");
+        return make_result(cp_model.UNKNOWN, update_status, num_teams_per_game, built)
+
+    def cached_result(reason):
+        update_status(f"[캐시] {reason} 캐시된 스케줄 (목표 값 {cached['objective']}) 반환.")
+        cached_status = cp_model.OPTIMAL if cached['status'] == STATUS_OPTIMAL else cp_model.FEASIBLE
+        return make_result(cached_status, update_status, num_teams_per_game, built,
+                           game_days=cached['game_days'], solution_assignments=cached['solution_assignments'],
+                           objective=round(cached['objective']), bound=max(cached['bound'], solver.BestObjectiveBound()),
+                           wall_time=time.time() - solve_start, from_cache=True)
+
+    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+        objective_value = round(solver.ObjectiveValue()) # 0회 매치업 수: 엔진과 상관없이 정수
+        update_status(f"[솔버 결과] 목표 값 (0회 매치업 수): {objective_value}")
+    elif status == cp_model.INFEASIBLE:
+         update_status("[솔버 결과] 모델이 비현실적입니다 (제약 조건을 만족하는 해 없음). 제약 조건을 확인하거나 완화해 보세요.")
+    elif status == cp_model.MODEL_INVALID:
+         update_status("[솔버 결과] 모델 정의에 오류가 있습니다.")
+
+    # --- 결과 처리 ---
+    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+        update_status("[결과 처리] 성공! 스케줄 데이터 추출 중...")
+        try:
+            solution_game_days, solution_assignments = extract_solution(built, solver.Value, slot_keys)
+            update_status("[결과 처리] 스케줄 데이터 추출 완료.")
+        except Exception as e:
+             update_status(f"[결과 처리 오류] 값 추출 중 예외 발생: {e}")
+             return make_result(status, update_status, num_teams_per_game, built, wall_time=solver.WallTime())
+
+        wall_time = solver.WallTime(); alternatives = None
+        if num_alternatives > 1:
+            best = {'objective': objective_value, 'game_days': solution_game_days, 'solution_assignments': solution_assignments}
+            alternatives = find_alternatives(built, slot_keys, best, pool, num_alternatives, alternative_tolerance, alternative_min_distance,
+                                             time_limit_seconds - (time.time() - solve_start), update_status, control,
+                                             num_workers=num_workers, solver_params=solver_params)
+            wall_time = time.time() - solve_start
+            if alternatives[0]['objective'] < objective_value:
+                update_status(f"[대안] 대안 탐색에서 더 좋은 스케줄 (목표 값 {alternatives[0]['objective']}) 을 찾아 최종 해로 사용.")
+                objective_value = alternatives[0]['objective']
+                solution_game_days = alternatives[0]['game_days']; solution_assignments = alternatives[0]['solution_assignments']
+
+        if cache is not None:
+            cache_status = cache.put(cache_key, STATUS_OPTIMAL if status == cp_model.OPTIMAL else STATUS_FEASIBLE,
+                                     objective_value, solver.BestObjectiveBound(), solution_game_days,
+                                     solution_assignments, wall_time)
+            update_status(f"[캐시] 결과 저장 (캐시 상태: {cache_status}).")
+            if cached and cached['objective'] < objective_value: return cached_result("이번 실행보다 좋은")
+        return make_result(status, update_status, num_teams_per_game, built,
+                           game_days=solution_game_days, solution_assignments=solution_assignments,
+                           objective=objective_value, bound=solver.BestObjectiveBound(), wall_time=wall_time, alternatives=alternatives)
+
+    elif cached and status != cp_model.INFEASIBLE:
+        return cached_result("이번 실행에서 해를 찾지 못해")
+    elif heuristic is not None and status != cp_model.INFEASIBLE:
+        update_status(f"[휴리스틱] CP-SAT 이 해를 찾지 못해 휴리스틱 스케줄 (0회 매치업 {heuristic['objective']}개) 반환.")
+        return make_result(cp_model.FEASIBLE, update_status, num_teams_per_game, built,
+                           game_days=heuristic['game_days'], solution_assignments=heuristic['solution_assignments'],
+                           objective=heuristic['objective'], bound=built['objective_lower_bound'],
+                           wall_time=time.time() - solve_start)
+    else:
+        update_status("[결과 처리] 실패.")
+        core = None
+        # 진단도 사용자 시간 제한 안에서: 남은 시간 (최대 DIAGNOSE_TIME_LIMIT) 만 씀
+        diagnose_budget = min(DIAGNOSE_TIME_LIMIT, time_limit_seconds - (time.time() - solve_start))
+        if status == cp_model.INFEASIBLE and diagnose_infeasible and diagnose_budget < 1:
+            update_status("[진단] 시간 제한 안에 남은 시간이 없어 원인 진단을 생략합니다.")
+        elif status == cp_model.INFEASIBLE and diagnose_infeasible and not (control is not None and control.stop_requested):
+            core = diagnose_infeasibility(positions, player_data, num_teams_per_game, players_per_team, banned_players_by_day,
+                                          symmetry_breaking=symmetry_breaking, time_limit_seconds=diagnose_budget, games_per_day=games_per_day,
+                                          num_workers=num_workers, update_status=update_status, control=control).to_dict()
+        return make_result(status, update_status, num_teams_per_game, built, wall_time=time.time() - solve_start, infeasibility_core=core)
+
+
+# --- 출전 금지 변경 시 기존 스케줄 수리 ---
+def find_games_touched_by_bans(previous_game_days, previous_assignments, banned_player_ids_by_day):
+    # 새 출전 금지 조건에 걸리는 선수가 배정된 게임 번호
+    return sorted({g for (g, t, p_idx), p_id in previous_assignments.items()
+                   if p_id in banned_player_ids_by_day.get(previous_game_days[g], ())})
+
+
+def count_changed_slots(previous_assignments, solution_assignments):
+    return sum(1 for key, p_id in solution_assignments.items() if previous_assignments.get(key) != p_id)
+
+
+def slot_equals_literal(built, key, p_id):
+    # 슬롯 key 에 p_id 가 배정되었는지 나타내는 리터럴 (boolean 모드는 x 그대로, legacy 모드는 리파이 변수 생성)
+    if built['model_mode'] == MODEL_MODE_LEGACY:
+        model = built['model']; lit = model.NewBoolVar(f'keep_{key}_{p_id}')
+        model.Add(built['assignment'][key] == p_id).OnlyEnforceIf(lit)
+        model.Add(built['assignment'][key] != p_id).OnlyEnforceIf(lit.Not())
+        return lit
+    return next(lit for cand_id, lit in built['slot_literals'][key] if cand_id == p_id)
+
+
+def plan_repair_neighbourhoods(touched_games, previous_game_days, num_games, seed=0):
+    # 1) 금지에 걸린 게임만 → 2) 해당 날짜 전체 → 3) 나머지 게임을 무작위로 두 배씩 추가(LNS) → 전체
+    rng = np.random.default_rng(seed)
+    free = set(touched_games); plans = [sorted(free)]
+    affected_days = {previous_game_days[g] for g in touched_games}
+    day_games = {g for g in range(num_games) if previous_game_days[g] in affected_days}
+    if day_games - free:
+        free |= day_games; plans.append(sorted(free))
+    extra = max(1, len(free))
+    while len(free) < num_games:
+        rest = sorted(set(range(num_games)) - free)
+        free |= set(rng.choice(rest, size=min(extra, len(rest)), replace=False).tolist())
+        plans.append(sorted(free)); extra *= 2
+    return plans
+
+
+def repair_schedule(positions, player_data,
+                    num_teams_per_game, players_per_team,
+                    banned_players_by_day,
+                    time_limit_seconds,
+                    previous_game_days, previous_assignments,
+                    model_mode=DEFAULT_MODEL_MODE,
+                    control=None,
+                    num_workers=DEFAULT_NUM_WORKERS,
+                    games_per_day=GAMES_PER_DAY,
+                    templates=None):
+    # 기존 스케줄을 최대한 유지한 채 새 출전 금지 조건을 만족하도록 영향받은 게임만 다시 최적화.
+    # 게임 날짜는 모두 유지하고, 목표는 (바뀐 슬롯 수) 우선, 그 다음 0회 매치업 수
+    num_games = sum(games_per_day)
+    slot_keys = get_slot_keys(num_games, num_teams_per_game, len(positions))
+    update_status = StatusLog(control)
+    banned_players_by_day = normalize_banned_players_by_day(player_data, banned_players_by_day, len(games_per_day))
+    solve_start = time.time()
+    update_status(f"\n=== 기존 스케줄 수리 시작 (시간 제한: {time_limit_seconds}초) ===")
+
+    banned_player_ids_by_day = get_banned_player_ids_by_day(player_data, banned_players_by_day)
+    touched_games = find_games_touched_by_bans(previous_game_days, previous_assignments, banned_player_ids_by_day)
+    if not touched_games:
+        update_status("[수리] 새 출전 금지에 걸리는 게임 없음 - 기존 스케줄 그대로 유지 (변경 슬롯 0개).")
+        return make_result(cp_model.FEASIBLE, update_status, num_teams_per_game,
+                           game_days=previous_game_days, solution_assignments=dict(previous_assignments), changed_slots=0)
+    update_status(f"[수리] 출전 금지에 걸린 게임: {[g + 1 for g in touched_games]}")
+
+    deadline = time.time() + time_limit_seconds
+    plans = plan_repair_neighbourhoods(touched_games, previous_game_days, num_games)
+    status = cp_model.UNKNOWN; built = None
+    for round_idx, free_games in enumerate(plans):
+        remaining = deadline - time.time()
+        if remaining <= 0 or (control is not None and control.stop_requested): break
+        is_last = round_idx == len(plans) - 1
+        round_limit = remaining if is_last else max(1.0, remaining / 2)
+        update_status(f"\n[수리 {round_idx + 1}/{len(plans)}] 재최적화 게임 {len(free_games)}개: {[g + 1 for g in free_games]}")
+
+        built = build_schedule_model(positions, player_data, num_teams_per_game, players_per_team,
+                                     banned_players_by_day, model_mode=model_mode, games_per_day=games_per_day, templates=templates)
+        if built is None: return make_result(cp_model.MODEL_INVALID, update_status, num_teams_per_game)
+        model = built['model']
+        for g, day_idx in enumerate(previous_game_days): model.Add(built['game_day'][g] == day_idx)
+        keep_lits = []
+        for key in slot_keys:
+            keep = slot_equals_literal(built, key, previous_assignments[key])
+            if key[0] in free_games: keep_lits.append(keep)
+            else: model.Add(keep == 1)
+        add_solution_hints(built, previous_assignments, previous_game_days)
+        zero_matchups = sum(built['never_enemies_vars']) + sum(built['never_allies_vars'])
+        churn_weight = len(built['never_enemies_vars']) + len(built['never_allies_vars']) + 1
+        model.ClearObjective()
+        model.Minimize(churn_weight * (len(keep_lits) - sum(keep_lits)) + zero_matchups)
+
+        solver, status = run_cp_sat(built, round_limit, slot_keys, update_status, control, report_bound=False,
+                                    num_workers=num_workers)
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            solution_game_days, solution_assignments = extract_solution(built, solver.Value, slot_keys)
+            changed = count_changed_slots(previous_assignments, solution_assignments)
+            zero_count = sum(solver.Value(v) for v in built['never_enemies_vars'] + built['never_allies_vars'])
+            update_status(f"[수리 완료] 변경된 슬롯 {changed}개 / {len(slot_keys)}개, 0회 매치업 {zero_count}개.")
+            # 일부 게임만 풀었으면 CP-SAT 의 OPTIMAL 은 그 이웃 안에서만 최적 -> 모든 게임을 푼 마지막 범위가 아니면 FEASIBLE
+            if len(free_games) < num_games: status = cp_model.FEASIBLE
+            return make_result(status, update_status, num_teams_per_game, built,
+                               game_days=solution_game_days, solution_assignments=solution_assignments,
+                               objective=zero_count, wall_time=time.time() - solve_start, changed_slots=changed)
+        update_status("[수리] 이 범위로는 해를 찾지 못해 재최적화 범위를 넓힙니다.")
+
+    update_status("[수리 실패] 시간 안에 수리된 스케줄을 찾지 못했습니다.")
+    return make_result(status, update_status, num_teams_per_game, built, wall_time=time.time() - solve_start)
+
+
+# --- 예열: 새 프로세스의 첫 해 찾기가 OR-Tools 네이티브 초기화 / 구조 모델 빌드 비용을 치르지 않도록 미리 실행 ---
+def warm_up(positions=positions, player_data=player_data, num_teams_per_game=num_teams_per_game,
+            games_per_day=GAMES_PER_DAY, model_modes=(DEFAULT_MODEL_MODE,), symmetry_options=(False,)):
+    # 명단의 구조 모델 템플릿을 공용 캐시(메모리 + 디스크)에 만들어 두고, 아주 작은 모델을 한 번 풀어 CP-SAT 을 초기화. 걸린 시간(초) 반환
+    start = time.perf_counter()
+    for model_mode in model_modes:
+        for symmetry_breaking in symmetry_options:
+            build_schedule_model(positions, player_data, num_teams_per_game, len(positions), {}, model_mode=model_mode,
+                                 symmetry_breaking=symmetry_breaking, games_per_day=games_per_day, templates=None)
+    model = cp_model.CpModel(); x = model.NewBoolVar('warm_up'); model.Maximize(x)
+    solver = cp_model.CpSolver(); solver.parameters.num_search_workers = 1; solver.Solve(model)
+    return time.perf_counter() - start
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# 구조 모델 템플릿 캐시: 출전 금지와 무관한 CP-SAT 구조 모델(변수 1만여 개)을 명단/게임 구성마다 한 번만 빌드
+#
+# 키: player_data / 포지션 / 팀 구성 / 모델 모드 / 날짜 고정 배치 / GAMES_PER_DAY + 빌더 코드 지문 + OR-Tools 버전의 해시
+# 값: CpModelProto + build 결과의 변수 핸들 (변수는 proto 인덱스로 저장하고 복제한 모델에서 다시 만듦)
+# 메모리: CpModel.clone() 으로 복제 (기본 인스턴스 약 10ms). 디스크: 이름을 지운 proto 텍스트 형식 + 핸들 JSON 을 zlib 압축
+# (파이썬 proto 바인딩이 바이너리 파싱을 지원하지 않아 텍스트 형식, 약 300KB / 읽기 약 0.1초) - 프로세스를 다시 띄워도 재사용.
+# 빌더 코드가 바뀌면 지문이 달라지므로 오래된 템플릿은 자동으로 무시됨.
+# OR-Tools 는 복제/저장/읽기 때만 불러옴 (UI 첫 화면은 템플릿 수 표시/비우기만 하므로 솔버 스택 없이 import 가능)
+import hashlib
+import json
+import os
+import threading
+import zlib
+from collections import OrderedDict
+
+from ortools import __version__ as ortools_version
+
+from schedule_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_TEMPLATE_DIR = os.path.join(DEFAULT_CACHE_DIR, "templates")
+DEFAULT_MEMORY_ENTRIES = 8
+DEFAULT_DISK_ENTRIES = 32
+TEMPLATE_FORMAT_VERSION = 1
+
+SOURCE_MEMORY = 'memory'
+SOURCE_DISK = 'disk'
+
+
+def make_template_key(player_data, positions, num_teams_per_game, players_per_team, model_mode, symmetry_breaking,
+                      games_per_day, code_version=''):
+    canonical = {
+        'player_data': [[pos, [[rank, alias, name] for rank, (alias, name) in sorted(ranks.items())]]
+                        for pos, ranks in player_data.items()],
+        'positions': list(positions), 'num_teams_per_game': num_teams_per_game, 'players_per_team': players_per_team,
+        'model_mode': model_mode, 'symmetry_breaking': bool(symmetry_breaking), 'games_per_day': list(games_per_day),
+        'code_version': code_version, 'ortools': ortools_version, 'format': TEMPLATE_FORMAT_VERSION,
+    }
+    payload = json.dumps(canonical, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# --- 변수 핸들 <-> JSON (변수 = {"v": proto 인덱스}, 튜플 키 dict 도 보존) ---
+def encode_handles(obj):
+    from ortools.sat.python import cp_model
+    if isinstance(obj, cp_model.IntVar): return {'v': obj.index}
+    if isinstance(obj, dict): return {'d': [[encode_handles(k), encode_handles(v)] for k, v in obj.items()]}
+    if isinstance(obj, tuple): return {'t': [encode_handles(v) for v in obj]}
+    if isinstance(obj, list): return [encode_handles(v) for v in obj]
+    if obj is None or isinstance(obj, (bool, int, float, str)): return obj
+    raise TypeError(f"템플릿에 저장할 수 없는 값: {type(obj).__name__}")
+
+
+def decode_handles(obj, model):
+    from ortools.sat.python import cp_model
+    # IntVar 를 proto 인덱스로 직접 생성 (GetIntVarFromProtoIndex 는 호출마다 경계 검사 + 폐기 예정 경고 래퍼라 3만 번이면 느림)
+    proto = model.Proto(); made = {}
+    def var(index):
+        v = made.get(index)
+        if v is None: v = made[index] = cp_model.IntVar(proto, index)
+        return v
+    def decode(o):
+        if isinstance(o, list): return [decode(v) for v in o]
+        if not isinstance(o, dict): return o
+        if 'v' in o: return var(o['v'])
+        if 't' in o: return tuple(decode(v) for v in o['t'])
+        return {decode(k): decode(v) for k, v in o['d']}
+    return decode(obj)
+
+
+class ModelTemplateCache:
+    # get(key) -> (복제된 build 결과, 출처) 또는 (None, None). 돌려준 모델은 호출자 소유 (제약/힌트를 추가해도 템플릿은 그대로)
+    def __init__(self, template_dir=DEFAULT_TEMPLATE_DIR, memory_entries=DEFAULT_MEMORY_ENTRIES, disk_entries=DEFAULT_DISK_ENTRIES):
+        self.template_dir = template_dir # None 이면 메모리만 사용
+        self.memory_entries = memory_entries; self.disk_entries = disk_entries
+        self._memory = OrderedDict() # key -> (CpModel, 인코딩된 핸들)
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.template_dir, f"{key}.cpmodel.z")
+
+    def get(self, key):
+        with self._lock:
+            entry = self._memory.get(key); source = SOURCE_MEMORY
+            if entry is not None: self._memory.move_to_end(key)
+        if entry is None:
+            entry = self._load(key); source = SOURCE_DISK
+            if entry is None: return None, None
+            self._remember(key, entry)
+        template_model, handles = entry
+        model = template_model.clone()
+        built = decode_handles(handles, model); built['model'] = model
+        return built, source
+
+    def put(self, key, built):
+        # 출전 금지 제약을 추가하기 전에 호출 (build 결과의 모델을 복제해 보관하므로 이후 변경과 무관)
+        handles = encode_handles({k: v for k, v in built.items() if k != 'model'})
+        entry = (built['model'].clone(), handles)
+        self._remember(key, entry)
+        if self.template_dir: # 디스크 쓰기(약 0.2초)는 첫 실행을 늦추지 않게 백그라운드로
+            threading.Thread(target=self._save, args=(key, entry), daemon=True).start()
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry; self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries: self._memory.popitem(last=False)
+
+    def _save(self, key, entry):
+        # 이름을 지운 복제본의 텍스트 형식 (이름은 디버깅용일 뿐 해 찾기와 무관). 임시 파일에 쓴 뒤 교체해 동시 읽기에 안전
+        template_model, handles = entry
+        stripped = template_model.clone(); stripped.remove_all_names()
+        payload = json.dumps(handles, separators=(',', ':')).encode('utf-8') + b'\n' + str(stripped.Proto()).encode('utf-8')
+        os.makedirs(self.template_dir, exist_ok=True)
+        tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f: f.write(zlib.compress(payload, 1))
+        os.replace(tmp_path, self._path(key))
+        self._prune()
+
+    def _load(self, key):
+        if not self.template_dir: return None
+        try:
+            with open(self._path(key), 'rb') as f: payload = zlib.decompress(f.read())
+            os.utime(self._path(key)) # 최근 사용 순서 (정리 기준)
+        except (OSError, zlib.error):
+            return None
+        from ortools.sat.python import cp_model
+        header, _, proto_text = payload.partition(b'\n')
+        model = cp_model.CpModel()
+        model.Proto().parse_text_format(proto_text.decode('utf-8')); model.rebuild_constant_map()
+        return model, json.loads(header)
+
+    def _prune(self):
+        # 최근에 쓰지 않은 파일부터 disk_entries 를 넘는 만큼 삭제
+        paths = [os.path.join(self.template_dir, name) for name in os.listdir(self.template_dir) if name.endswith('.cpmodel.z')]
+        paths.sort(key=os.path.getmtime, reverse=True)
+        for path in paths[self.disk_entries:]:
+            try: os.remove(path)
+            except OSError: pass
+
+    def clear(self):
+        with self._lock: self._memory.clear()
+        if self.template_dir and os.path.isdir(self.template_dir):
+            for name in os.listdir(self.template_dir):
+                if name.endswith('.cpmodel.z'): os.remove(os.path.join(self.template_dir, name))
+
+    def __len__(self):
+        on_disk = set()
+        if self.template_dir and os.path.isdir(self.template_dir):
+            on_disk = {name[:-len('.cpmodel.z')] for name in os.listdir(self.template_dir) if name.endswith('.cpmodel.z')}
+        with self._lock: return len(on_disk | set(self._memory))
+
+
+_default_templates = None; _default_templates_lock = threading.Lock()
+
+
+def get_default_templates():
+    # 프로세스 공용 구조 모델 템플릿 캐시 (메모리 + 스케줄 캐시 폴더 아래 templates/)
+    global _default_templates
+    with _default_templates_lock:
+        if _default_templates is None: _default_templates = ModelTemplateCache()
+        return _default_templates
@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+# 스케줄 검증/채점기: CP-SAT 없이 NumPy 로 모든 하드 제약과 목표 값(0회 매치업 수), 아군/적군 만남 행렬을 계산
+#
+# 스케줄 = grid[g, t, p] (게임 x 팀 x 포지션 선수 ID, 빈 슬롯 -1) + 게임별 날짜 game_days[g] (0부터).
+# build_rules 로 선수 인덱스(schedule_roster.PlayerIndex 의 쌍 마스크)/출전 금지에서 상수 배열을 한 번 만들고, check_grid 가 스케줄마다 행렬 연산 몇 번으로 검사:
+#   만남 행렬: 팀 one-hot M (게임*팀 x 선수) -> 아군 = M^T M, 같은 게임 = P^T P (P = 게임 x 선수 출전), 적군 = 같은 게임 - 아군
+#   (C2) 게임 내 중복, (C3) 팀당 1티어 수, 1티어 맞대결 횟수, (C5) 같은 포지션 적군 1회 이상, (C8) 비1티어 출전 수,
+#   날짜별 게임 수, (C7) 출전 금지, 같은 날 연속 출전 금지 - 위반이 없으면 메시지를 만들지 않아 기본 명단은 1ms 미만.
+# 결과 화면 분석용: zero_matchup_pairs (목표가 남긴 0회 쌍 목록), plays_per_day (선수 x 날짜 출전 수).
+# 손으로 고친 스케줄이나 캐시에 저장된 스케줄을 바로 다시 채점할 수 있게 JSON / CSV / Parquet 가져오기/내보내기도 제공
+# (선수는 ID 대신 이름으로 저장하므로 명단 순서가 바뀌어도 읽을 수 있음).
+#
+#   python schedule_validate.py schedule.json --bans '{"1": ["T1"]}' [--player-data roster.json] [--matrices]
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+SCHEDULE_FORMAT = 'lol-schedule'
+SCHEDULE_FORMAT_VERSION = 1
+FRAME_COLUMNS = ['Game', 'Day', 'Team', 'Position', 'Player'] # CSV / Parquet: 슬롯 하나당 한 행 (게임/날짜 1부터, 팀 A/B/...)
+
+
+def grid_from_assignments(solution_assignments, num_games, num_teams, num_positions):
+    grid = np.full((num_games, num_teams, num_positions), -1, dtype=np.int64)
+    for (g, t, p_idx), p_id in solution_assignments.items(): grid[g, t, p_idx] = p_id
+    return grid
+
+
+def assignments_from_grid(grid):
+    return {(g, t, p_idx): int(grid[g, t, p_idx]) for g, t, p_idx in np.ndindex(*grid.shape) if grid[g, t, p_idx] >= 0}
+
+
+def team_label(t):
+    return chr(ord('A') + t)
+
+
+def build_rules(index, games_per_day, banned_ids_by_day, labels=None, target_plays=None, tier1_per_team=1, min_enemy_same_pos=1):
+    # 검증에 필요한 상수 배열. index: schedule_roster.PlayerIndex (배열/쌍 마스크를 그대로 씀), banned_ids_by_day: {day_idx(0부터): {p_id}}
+    n = index.num_players; num_days = len(games_per_day)
+    banned = np.zeros((n, num_days), dtype=bool)
+    for d, ids in banned_ids_by_day.items():
+        if ids and 0 <= d < num_days: banned[sorted(ids), d] = True
+    num_tier1_pairs = int(index.both_tier1.sum()); num_games = sum(games_per_day)
+    return {
+        'num_players': n, 'num_positions': len(index.positions), 'games_per_day': np.asarray(games_per_day, dtype=np.int64),
+        'pos_of': index.pos_of, 'is_tier1': index.is_tier1, 'banned': banned, 'pair_i': index.pair_i, 'pair_j': index.pair_j,
+        'same_pos': index.same_pos, 'both_tier1': index.both_tier1, 'ally_pair': index.ally_pair,
+        'target_plays': target_plays, 'tier1_per_team': tier1_per_team, 'min_enemy_same_pos': min_enemy_same_pos,
+        'min_t1_match': num_games // num_tier1_pairs if num_tier1_pairs else 0,
+        'max_t1_match': -(-num_games // num_tier1_pairs) if num_tier1_pairs else 0,
+        'labels': labels or {},
+    }
+
+
+def meeting_matrices(grid, num_players):
+    # 팀 one-hot M (게임*팀 x 선수) -> (게임 x 선수 출전 수 (중복이면 2 이상), 아군 = M^T M, 적군 = 같은 게임 - 아군). 대각선 0
+    num_games, num_teams, num_positions = grid.shape
+    team_rows = grid.reshape(num_games * num_teams, num_positions)
+    onehot = np.zeros((num_games * num_teams, num_players), dtype=np.int64)
+    np.add.at(onehot, (np.arange(len(team_rows))[:, None], team_rows), 1)
+    plays = onehot.reshape(num_games, num_teams, num_players).sum(axis=1)
+    ally = onehot.T @ onehot; enemy = plays.T @ plays - ally
+    np.fill_diagonal(ally, 0); np.fill_diagonal(enemy, 0)
+    return plays, ally, enemy
+
+
+def zero_matchup_pairs(index, ally, enemy):
+    # 목표가 세는 0회 쌍: (적군 0회 쌍 번호, 아군 0회 쌍 번호) - 번호 k 는 (index.pair_i[k], index.pair_j[k])
+    i, j = index.pair_i, index.pair_j
+    return np.flatnonzero(enemy[i, j] == 0), np.flatnonzero((ally[i, j] == 0) & index.ally_pair)
+
+
+def count_zero_matchups(index, grid):
+    # 목표 값만 (빈 슬롯 없는 스케줄): 적군 0회 쌍 + 아군 0회 쌍 (index = schedule_roster.PlayerIndex 의 쌍 마스크)
+    _, ally, enemy = meeting_matrices(np.asarray(grid, dtype=np.int64), index.num_players)
+    never_enemies, never_allies = zero_matchup_pairs(index, ally, enemy)
+    return len(never_enemies) + len(never_allies)
+
+
+def plays_per_day(grid, game_days, num_players, num_days):
+    # 선수 x 날짜 출전 수 (게임 x 선수 출전 수를 날짜 one-hot 으로 합침)
+    plays, _, _ = meeting_matrices(np.asarray(grid, dtype=np.int64), num_players)
+    return plays.T @ np.eye(num_days, dtype=np.int64)[np.asarray(game_days, dtype=np.int64)]
+
+
+@dataclass
+class ValidationReport:
+    # check_grid 의 반환값. 행렬은 선수 ID 순서 (대각선 0), 목표 값은 구조가 잘못된 스케줄(빈 슬롯 등)이면 None
+    violations: list = field(default_factory=list) # [(규칙, 메시지)]
+    objective: int = None
+    never_enemies: int = None
+    never_allies: int = None
+    play_counts: np.ndarray = None
+    ally_counts: np.ndarray = None
+    enemy_counts: np.ndarray = None
+    seconds: float = 0.0
+
+    @property
+    def valid(self):
+        return not self.violations
+
+    def to_dict(self):
+        return {
+            'valid': self.valid, 'violations': [list(v) for v in self.violations], 'objective': self.objective,
+            'never_enemies': self.never_enemies, 'never_allies': self.never_allies,
+            'play_counts': None if self.play_counts is None else self.play_counts.tolist(),
+            'ally_counts': None if self.ally_counts is None else self.ally_counts.tolist(),
+            'enemy_counts': None if self.enemy_counts is None else self.enemy_counts.tolist(),
+            'seconds': self.seconds,
+        }
+
+
+def check_grid(rules, grid, game_days):
+    # 스케줄 하나의 하드 제약 위반 목록 + 목표 값 + 만남 행렬
+    start = time.perf_counter()
+    grid = np.asarray(grid, dtype=np.int64); day_of = np.asarray(game_days, dtype=np.int64)
+    n = rules['num_players']; labels = rules['labels']; label = lambda p: labels.get(int(p), int(p))
+    num_games, num_teams, num_positions = grid.shape
+    report = ValidationReport(); violations = report.violations
+
+    # --- 구조: 모양, 빈 슬롯, 모르는 선수, 날짜 범위 (여기서 걸리면 행렬을 만들 수 없으므로 중단) ---
+    if num_positions != rules['num_positions'] or len(day_of) != num_games:
+        violations.append(('구조', f"스케줄 모양 {grid.shape} / 날짜 {len(day_of)}개가 포지션 {rules['num_positions']}개와 맞지 않음"))
+    for g, t, p_idx in np.argwhere((grid < 0) | (grid >= n)):
+        violations.append(('구조', f"{g + 1}게임 {team_label(t)}팀 {p_idx + 1}번 슬롯: 빈 슬롯 또는 모르는 선수 ID {grid[g, t, p_idx]}"))
+    num_days = len(rules['games_per_day'])
+    for g in np.flatnonzero((day_of < 0) | (day_of >= num_days)):
+        violations.append(('구조', f"{g + 1}게임: 잘못된 날짜 {day_of[g] + 1} (1~{num_days})"))
+    if violations:
+        report.seconds = time.perf_counter() - start; return report
+
+    # --- 만남 행렬 ---
+    plays, ally, enemy = meeting_matrices(grid, n)
+    report.play_counts = plays.sum(axis=0); report.ally_counts = ally; report.enemy_counts = enemy
+    i, j = rules['pair_i'], rules['pair_j']; enemy_pairs = enemy[i, j]; ally_pairs = ally[i, j]
+    report.never_enemies = int(np.sum(enemy_pairs == 0))
+    report.never_allies = int(np.sum((ally_pairs == 0) & rules['ally_pair']))
+    report.objective = report.never_enemies + report.never_allies
+
+    # --- 포지션 / (C2) / (C3) ---
+    for g, t, p_idx in np.argwhere(rules['pos_of'][grid] != np.arange(num_positions)):
+        violations.append(('포지션', f"{g + 1}게임 {team_label(t)}팀 {p_idx + 1}번 슬롯: {label(grid[g, t, p_idx])} 는 다른 포지션 선수"))
+    for g, p in np.argwhere(plays > 1):
+        violations.append(('C2', f"{g + 1}게임: {label(p)} 가 {plays[g, p]}번 배정됨"))
+    tier1_count = rules['is_tier1'][grid].sum(axis=2)
+    for g, t in np.argwhere(tier1_count != rules['tier1_per_team']):
+        violations.append(('C3', f"{g + 1}게임 {team_label(t)}팀: 1티어 {tier1_count[g, t]}명 (필요 {rules['tier1_per_team']}명)"))
+
+    # --- 1티어 맞대결 / (C5) / (C8) ---
+    t1 = rules['both_tier1'] & ((enemy_pairs < rules['min_t1_match']) | (enemy_pairs > rules['max_t1_match']))
+    for k in np.flatnonzero(t1):
+        violations.append(('1티어 맞대결', f"{label(i[k])} vs {label(j[k])}: {enemy_pairs[k]}번 "
+                                           f"(필요 {rules['min_t1_match']}~{rules['max_t1_match']}번)"))
+    for k in np.flatnonzero(rules['same_pos'] & (enemy_pairs < rules['min_enemy_same_pos'])):
+        violations.append(('C5', f"{label(i[k])} vs {label(j[k])}: 같은 포지션 적군 {enemy_pairs[k]}번 "
+                                 f"(최소 {rules['min_enemy_same_pos']}번)"))
+    if rules['target_plays'] is not None:
+        for p in np.flatnonzero(~rules['is_tier1'] & (report.play_counts != rules['target_plays'])):
+            violations.append(('C8', f"{label(p)}: {report.play_counts[p]}경기 출전 (목표 {rules['target_plays']}경기)"))
+
+    # --- 날짜별 게임 수 / (C7) / 같은 날 연속 출전 ---
+    day_counts = np.bincount(day_of, minlength=num_days)
+    for d in np.flatnonzero(day_counts != rules['games_per_day']):
+        violations.append(('날짜 분배', f"{d + 1}일차: {day_counts[d]}게임 (필요 {rules['games_per_day'][d]}게임)"))
+    played = plays > 0
+    for g, p in np.argwhere(played & rules['banned'][:, day_of].T):
+        violations.append(('C7', f"{g + 1}게임 ({day_of[g] + 1}일차): 출전 금지 선수 {label(p)} 출전"))
+    back_to_back = played[:-1] & played[1:] & (day_of[:-1] == day_of[1:])[:, None]
+    for g, p in np.argwhere(back_to_back):
+        violations.append(('연속 출전', f"{g + 1}~{g + 2}게임 ({day_of[g] + 1}일차): {label(p)} 같은 날 연속 출전"))
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+# --- 가져오기 / 내보내기 ---
+def schedule_to_json(positions, id_to_name, game_days, grid, objective=None):
+    # 게임마다 {"day": 1부터, "teams": [[포지션 순서 선수 이름, ...], ...]} 인 간결한 JSON
+    games = [{'day': int(day) + 1, 'teams': [[id_to_name.get(int(p_id)) if p_id >= 0 else None for p_id in team] for team in teams]}
+             for day, teams in zip(game_days, np.asarray(grid))]
+    payload = {'format': SCHEDULE_FORMAT, 'version': SCHEDULE_FORMAT_VERSION, 'positions': list(positions), 'games': games}
+    if objective is not None: payload['objective'] = int(objective)
+    return json.dumps(payload, ensure_ascii=False)
+
+
+def schedule_from_json(text, positions, name_to_id, num_teams=None):
+    # schedule_to_json 형식 -> (game_days(0부터), grid). 빈 슬롯(null)은 -1, 모르는 선수/포지션과 (num_teams 가 있으면) 팀 수가 다른 게임은 ValueError
+    payload = json.loads(text)
+    if not isinstance(payload, dict) or payload.get('format') != SCHEDULE_FORMAT:
+        raise ValueError(f"스케줄 JSON 이 아님 (format 이 '{SCHEDULE_FORMAT}' 이어야 함)")
+    if payload.get('version', SCHEDULE_FORMAT_VERSION) > SCHEDULE_FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 스케줄 형식 버전: {payload['version']}")
+    if list(payload.get('positions', positions)) != list(positions):
+        raise ValueError(f"포지션 순서가 다름: {payload['positions']} (현재 {list(positions)})")
+    games = payload.get('games') or []
+    for g, game in enumerate(games):
+        if num_teams is not None and len(game['teams']) != num_teams:
+            raise ValueError(f"{g + 1}게임: 팀 {len(game['teams'])}개 (게임당 {num_teams}팀)")
+    if num_teams is None: num_teams = max((len(game['teams']) for game in games), default=0)
+    grid = np.full((len(games), num_teams, len(positions)), -1, dtype=np.int64); game_days = []
+    for g, game in enumerate(games):
+        game_days.append(int(game['day']) - 1)
+        for t, team in enumerate(game['teams']):
+            if len(team) != len(positions): raise ValueError(f"{g + 1}게임 {team_label(t)}팀: 선수 {len(team)}명 (포지션 {len(positions)}개)")
+            for p_idx, name in enumerate(team):
+                if name is None: continue
+                if name not in name_to_id: raise ValueError(f"{g + 1}게임 {team_label(t)}팀: 알 수 없는 선수 '{name}'")
+                grid[g, t, p_idx] = name_to_id[name]
+    return game_days, grid
+
+
+def schedule_to_frame(positions, id_to_name, game_days, grid):
+    # 슬롯 하나당 한 행인 DataFrame (FRAME_COLUMNS)
+    grid = np.asarray(grid); g, t, p_idx = np.indices(grid.shape).reshape(3, -1)
+    return pd.DataFrame({
+        'Game': g + 1, 'Day': np.asarray(game_days, dtype=np.int64)[g] + 1, 'Team': [team_label(x) for x in t],
+        'Position': np.asarray(positions, dtype=object)[p_idx],
+        'Player': [id_to_name.get(int(p_id)) if p_id >= 0 else None for p_id in grid.ravel()],
+    }, columns=FRAME_COLUMNS)
+
+
+def schedule_from_frame(frame, positions, name_to_id, num_teams=None):
+    # schedule_to_frame 형식 DataFrame -> (game_days(0부터), grid). 행 순서는 상관없음, 없는 슬롯은 -1.
+    # num_teams 가 있으면 그 수만큼의 팀 (A, B, ...) 만 허용
+    missing = [col for col in FRAME_COLUMNS if col not in frame.columns]
+    if missing: raise ValueError(f"스케줄 표에 열이 없음: {missing}")
+    frame = frame.dropna(subset=['Game'])
+    if frame.empty: return [], np.zeros((0, 0, len(positions)), dtype=np.int64)
+    pos_index = {pos: p_idx for p_idx, pos in enumerate(positions)}
+    unknown_pos = sorted(set(frame['Position']) - set(pos_index))
+    if unknown_pos: raise ValueError(f"알 수 없는 포지션: {unknown_pos}")
+    players = frame['Player'].where(frame['Player'].notna(), None)
+    unknown = sorted({name for name in players if name is not None and name not in name_to_id})
+    if unknown: raise ValueError(f"알 수 없는 선수: {unknown}")
+    g = frame['Game'].astype(int).to_numpy() - 1
+    teams = [str(label).strip().upper() for label in frame['Team']]
+    bad_teams = sorted({label for label in teams if len(label) != 1 or not label.isalpha()})
+    if bad_teams: raise ValueError(f"팀은 A, B, ... 한 글자: {bad_teams}")
+    t = np.array([ord(label) - ord('A') for label in teams], dtype=np.int64)
+    if num_teams is not None and t.max() >= num_teams:
+        raise ValueError(f"팀은 A~{team_label(num_teams - 1)} (게임당 {num_teams}팀): {sorted({label for label in teams if ord(label) - ord('A') >= num_teams})}")
+    p_idx = frame['Position'].map(pos_index).to_numpy(dtype=np.int64)
+    if g.min() < 0: raise ValueError("게임 번호는 1부터")
+    grid = np.full((g.max() + 1, t.max() + 1 if num_teams is None else num_teams, len(positions)), -1, dtype=np.int64)
+    grid[g, t, p_idx] = [name_to_id[name] if name is not None else -1 for name in players]
+    days = frame.groupby(frame['Game'].astype(int) - 1)['Day'].agg(['min', 'max'])
+    conflict = days.index[days['min'] != days['max']]
+    if len(conflict): raise ValueError(f"게임마다 날짜가 하나여야 함: {[int(x) + 1 for x in conflict]}게임")
+    game_days = [int(days['min'].get(x, 0)) - 1 for x in range(grid.shape[0])]
+    return game_days, grid
+
+
+def schedule_format_of(path):
+    ext = os.path.splitext(str(path))[1].lower().lstrip('.')
+    if ext not in ('json', 'csv', 'parquet'): raise ValueError(f"지원하지 않는 스케줄 파일 형식: .{ext} (json / csv / parquet)")
+    return ext
+
+
+def dump_schedule(fmt, positions, id_to_name, game_days, grid, objective=None):
+    # 형식별 바이트 (다운로드 버튼 / 파일 저장 공용). Parquet 은 pyarrow 또는 fastparquet 필요
+    if fmt == 'json': return schedule_to_json(positions, id_to_name, game_days, grid, objective).encode('utf-8')
+    frame = schedule_to_frame(positions, id_to_name, game_days, grid)
+    if fmt == 'csv': return frame.to_csv(index=False).encode('utf-8-sig') # 엑셀에서 한글이 깨지지 않게 BOM
+    if fmt == 'parquet':
+        buffer = io.BytesIO(); frame.to_parquet(buffer, index=False); return buffer.getvalue()
+    raise ValueError(f"지원하지 않는 스케줄 파일 형식: {fmt}")
+
+
+def load_schedule(fmt, data, positions, name_to_id, num_teams=None):
+    # dump_schedule 의 반대. data: 바이트 -> (game_days(0부터), grid)
+    if fmt == 'json': return schedule_from_json(data.decode('utf-8-sig'), positions, name_to_id, num_teams)
+    if fmt == 'csv': frame = pd.read_csv(io.BytesIO(data), encoding='utf-8-sig')
+    elif fmt == 'parquet': frame = pd.read_parquet(io.BytesIO(data))
+    else: raise ValueError(f"지원하지 않는 스케줄 파일 형식: {fmt}")
+    return schedule_from_frame(frame, positions, name_to_id, num_teams)
+
+
+def main(argv=None):
+    # 파일 하나를 기본 명단(또는 --player-data) + 출전 금지 조건으로 검증해 JSON 으로 출력. 위반이 있으면 종료 코드 1
+    import schedule_config as config
+    import schedule_solver as solver_core
+    from schedule_roster import load_roster_file
+    parser = argparse.ArgumentParser(description="스케줄 파일 검증 / 채점 (CP-SAT 없음)")
+    parser.add_argument('schedule', help="JSON / CSV / Parquet 스케줄 파일")
+    parser.add_argument('--bans', default='{}', help='날짜별 출전 금지 JSON, 예: \'{"1": ["T1"]}\'')
+    parser.add_argument('--player-data', help="선수 명단 파일 JSON / CSV / Parquet (schedule_roster, 기본: schedule_config.player_data)")
+    parser.add_argument('--games-per-day', type=int, nargs='+', default=config.GAMES_PER_DAY)
+    parser.add_argument('--matrices', action='store_true', help="아군/적군 만남 행렬과 출전 수도 출력")
+    args = parser.parse_args(argv)
+
+    p_data = config.player_data
+    if args.player_data: p_data = load_roster_file(args.player_data)
+    positions = list(p_data)
+    with open(args.schedule, 'rb') as f: data = f.read()
+    try:
+        game_days, solution_assignments = solver_core.import_schedule(schedule_format_of(args.schedule), data, positions, p_data,
+                                                                      num_teams_per_game=config.num_teams_per_game)
+    except ValueError as e:
+        sys.exit(f"스케줄을 읽지 못했습니다: {e}")
+    report = solver_core.validate_schedule(positions, p_data, config.num_teams_per_game, len(positions), json.loads(args.bans),
+                                           game_days, solution_assignments, games_per_day=args.games_per_day)
+    output = report.to_dict()
+    if not args.matrices:
+        for key in ('play_counts', 'ally_counts', 'enemy_counts'): output.pop(key)
+    print(json.dumps(output, ensure_ascii=False, indent=2))
+    return 0 if report.valid else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
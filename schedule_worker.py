@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# 예열된 해 찾기 작업 프로세스: OR-Tools/솔버 스택을 미리 불러 두고 (schedule_solver.warm_up) 작업을 기다림
+#
+#   worker = SolverWorker()                  # 프로세스 시작 + 백그라운드 예열
+#   worker.wait_ready(timeout=30)            # (선택) 예열이 끝날 때까지 대기
+#   result = worker.run('schedule_solver:solve_schedule', solve_kwargs, control)
+#
+# 작업은 한 번에 하나. 자식 프로세스의 로그/개선 해/하한은 이벤트 큐로 부모의 SolveControl 에 그대로 옮기고,
+# 부모에서 control.stop() 하면 공유 Event 로 자식의 해 찾기를 멈춤. 결과(SolveResult)는 피클로 돌려받음.
+# 부모 쪽은 이 모듈만 불러서는 OR-Tools 를 import 하지 않음 (UI 프로세스를 가볍게 유지).
+import importlib
+import multiprocessing
+import queue
+import threading
+import time
+
+EVENT_POLL_SECONDS = 0.2
+
+
+def resolve_solve_fn(spec):
+    # 'module:function' 문자열 또는 함수 -> 함수
+    if callable(spec): return spec
+    module_name, _, fn_name = spec.partition(':')
+    return getattr(importlib.import_module(module_name), fn_name)
+
+
+def solve_fn_path(spec):
+    # 함수 -> 'module:function' (프로세스 사이로 넘기고 요청 키를 만들 때 사용)
+    return spec if isinstance(spec, str) else f"{spec.__module__}:{spec.__name__}"
+
+
+def worker_main(jobs, events, stop_event, warm_up):
+    # 자식 프로세스 본체: 솔버 스택 import + 예열 후 작업 루프 (None 을 받으면 종료)
+    started = time.perf_counter()
+    import schedule_solver
+    from schedule_config import SolveControl
+
+    class ForwardingControl(SolveControl):
+        # 로그/개선 해/하한을 부모로 전달하고, 부모의 중단 요청(stop_event)을 감시
+        def __init__(self):
+            super().__init__()
+            self._watching = True
+            threading.Thread(target=self._watch, daemon=True).start()
+
+        def _watch(self):
+            while self._watching:
+                if stop_event.wait(0.1): self.stop(); return
+
+        def log(self, msg):
+            super().log(msg); events.put(('log', msg))
+
+        def publish(self, incumbent):
+            super().publish(incumbent); events.put(('incumbent', incumbent))
+
+        def update_bound(self, bound):
+            super().update_bound(bound); events.put(('bound', bound))
+
+    warm_up_seconds = schedule_solver.warm_up() if warm_up else 0.0
+    events.put(('ready', {'import_seconds': time.perf_counter() - started - warm_up_seconds, 'warm_up_seconds': warm_up_seconds}))
+    while True:
+        job = jobs.get()
+        if job is None: return
+        fn_spec, solve_kwargs = job
+        control = ForwardingControl()
+        try:
+            events.put(('result', resolve_solve_fn(fn_spec)(**solve_kwargs, control=control)))
+        except Exception as e:
+            events.put(('error', f"{type(e).__name__}: {e}"))
+        finally:
+            control._watching = False
+
+
+class SolverWorker:
+    # 부모 쪽 핸들. run() 은 호출한 스레드에서 작업이 끝날 때까지 이벤트를 옮기며 블록
+    def __init__(self, warm_up=True):
+        ctx = multiprocessing.get_context('spawn')
+        self._jobs = ctx.Queue(); self._events = ctx.Queue(); self._stop = ctx.Event()
+        self.started_at = time.time(); self.ready_info = None; self.jobs_run = 0
+        self.process = ctx.Process(target=worker_main, args=(self._jobs, self._events, self._stop, warm_up),
+                                   name="schedule-solver-worker", daemon=True)
+        self.process.start()
+
+    @property
+    def ready(self):
+        return self.ready_info is not None
+
+    def alive(self):
+        return self.process.is_alive()
+
+    def wait_ready(self, timeout=None):
+        # 예열 완료 이벤트를 기다림 (작업 실행 중이 아닐 때만 호출). 시간 안에 끝나면 True
+        deadline = None if timeout is None else time.time() + timeout
+        while not self.ready:
+            if not self.alive(): return False
+            remaining = EVENT_POLL_SECONDS if deadline is None else min(EVENT_POLL_SECONDS, deadline - time.time())
+            try: kind, payload = self._events.get(timeout=max(remaining, 0)) # timeout=0 이면 이미 온 이벤트만 확인
+            except queue.Empty:
+                if remaining <= 0: return False
+                continue
+            if kind == 'ready': self.ready_info = payload
+        return True
+
+    def run(self, fn_spec, solve_kwargs, control):
+        self._stop.clear()
+        self._jobs.put((solve_fn_path(fn_spec), solve_kwargs))
+        self.jobs_run += 1
+        while True:
+            if control.stop_requested and not self._stop.is_set(): self._stop.set()
+            try: kind, payload = self._events.get(timeout=EVENT_POLL_SECONDS)
+            except queue.Empty:
+                if not self.alive(): raise RuntimeError(f"해 찾기 작업 프로세스가 종료되었습니다 (exit code {self.process.exitcode}).")
+                continue
+            if kind == 'ready': self.ready_info = payload
+            elif kind == 'log': control.log(payload)
+            elif kind == 'incumbent': control.publish(payload)
+            elif kind == 'bound': control.update_bound(payload)
+            elif kind == 'result': return payload
+            elif kind == 'error': raise RuntimeError(payload)
+
+    def close(self):
+        if self.alive():
+            self._jobs.put(None); self.process.join(timeout=5)
+            if self.alive(): self.process.terminate()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# schedule_queue 회귀 테스트: 중단된 작업과 같은 키로 다시 낸 요청이 서로를 덮어쓰지 않는지, 중단이 세션별로 적용되는지
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schedule_queue import SolveScheduler
+
+GATE = threading.Event() # 닫혀 있으면 중단된 작업이 끝나지 않고 붙잡혀 있음
+
+
+def hold_solve(control, name, num_teams_per_game=2, time_limit_seconds=5, num_workers=1):
+    # 중단될 때까지 실행 + 중단 뒤에도 GATE 가 열릴 때까지 "실행 중" 으로 남음
+    while not control.stop_requested: time.sleep(0.01)
+    GATE.wait(5)
+    return name
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "시간 안에 조건이 만족되지 않음"
+        time.sleep(0.01)
+
+
+def make_scheduler(max_concurrent):
+    GATE.clear()
+    return SolveScheduler(max_concurrent=max_concurrent, max_workers=max_concurrent, backend='thread')
+
+
+def test_finished_stopped_entry_does_not_remove_resubmitted_one():
+    scheduler = make_scheduler(max_concurrent=2)
+    a = scheduler.submit({'name': 'x'}, solve_fn=hold_solve)
+    a.stop()
+    b = scheduler.submit({'name': 'x'}, solve_fn=hold_solve)
+    assert not b.merged
+    wait_until(lambda: scheduler.stats()['running'] == 2)
+    GATE.set(); wait_until(a.done)
+    assert scheduler.stats()['running'] == 1 # b 는 계속 실행 중으로 집계
+    c = scheduler.submit({'name': 'x'}, solve_fn=hold_solve)
+    assert c.merged and c.control is b.control
+    b.stop(); c.stop(); wait_until(c.done)
+    assert b.done() and c.result == 'x' and scheduler.stats()['running'] == 0
+
+
+def test_requests_behind_stopped_entry_merge_and_start():
+    scheduler = make_scheduler(max_concurrent=1)
+    a = scheduler.submit({'name': 'x'}, solve_fn=hold_solve)
+    a.stop()
+    b = scheduler.submit({'name': 'x'}, solve_fn=hold_solve)
+    c = scheduler.submit({'name': 'x'}, solve_fn=hold_solve)
+    assert b.queued() and c.merged and c.control is b.control
+    GATE.set(); wait_until(a.done)
+    wait_until(lambda: not b.queued()) # a 가 끝난 뒤 대기열에서 시작됨 (KeyError 로 멈추지 않음)
+    b.stop(); c.stop(); wait_until(c.done)
+    assert c.result == 'x' and scheduler.stats()['queued'] == 0
+
+
+def test_stop_detaches_session_while_others_still_wait():
+    scheduler = make_scheduler(max_concurrent=1)
+    GATE.set()
+    first = scheduler.submit({'name': 'y'}, solve_fn=hold_solve)
+    second = scheduler.submit({'name': 'y'}, solve_fn=hold_solve)
+    wait_until(lambda: not first.queued())
+    first.stop()
+    assert first.done() and first.error is None and not first.result.found # 개선 해가 아직 없으면 UNKNOWN
+    assert not second.done() and not second.control.stop_requested and second.subscribers == 1
+    second.stop(); wait_until(second.done)
+    assert second.result == 'y'
+
+
+def test_stop_cancels_queued_entry_without_subscribers():
+    scheduler = make_scheduler(max_concurrent=1)
+    running = scheduler.submit({'name': 'a'}, solve_fn=hold_solve)
+    queued = scheduler.submit({'name': 'b'}, solve_fn=hold_solve)
+    queued.stop()
+    assert queued.done() and scheduler.stats()['queued'] == 0
+    GATE.set(); running.stop(); wait_until(running.done)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# schedule_validate 테스트: 내보내기 -> 가져오기 왕복, 잘못된 파일, 규칙마다 위반 하나씩 (기본 명단 + 휴리스틱 스케줄 기준)
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import schedule_solver as solver_core
+from schedule_config import GAMES_PER_DAY, num_teams_per_game, player_data, positions, process_player_data
+
+PLAYERS_PER_TEAM = len(positions)
+(_, _, PLAYER_POS, _, _, TIER1, _, ID_TO_NAME, _, _, _, _, _, _, NAME_TO_DISPLAY) = process_player_data(player_data)
+
+
+def make_schedule():
+    # 하드 제약을 모두 만족하는 스케줄 (휴리스틱, 수 ms) -> (game_days, solution_assignments)
+    heuristic = solver_core.build_heuristic_schedule(positions, player_data, num_teams_per_game, PLAYERS_PER_TEAM, {},
+                                                     GAMES_PER_DAY, False, 1.0)
+    return list(heuristic['game_days']), dict(heuristic['solution_assignments'])
+
+
+def validate(game_days, assignments, bans=None, **rule_overrides):
+    rules = solver_core.make_validation_rules(positions, player_data, num_teams_per_game, PLAYERS_PER_TEAM, bans or {}, GAMES_PER_DAY)
+    rules.update(rule_overrides)
+    return solver_core.validate_schedule(positions, player_data, num_teams_per_game, PLAYERS_PER_TEAM, bans or {},
+                                         game_days, assignments, rules=rules)
+
+
+def violated_rules(report):
+    return {rule for rule, _ in report.violations}
+
+
+def export(fmt, game_days, assignments):
+    return solver_core.export_schedule(fmt, positions, player_data, num_teams_per_game, game_days, assignments)
+
+
+def load(fmt, data):
+    return solver_core.import_schedule(fmt, data, positions, player_data)
+
+
+def players_in(assignments, g):
+    return {p_id for (gg, _, _), p_id in assignments.items() if gg == g}
+
+
+def test_schedule_fixture_is_valid():
+    report = validate(*make_schedule())
+    assert report.valid and report.objective is not None
+
+
+@pytest.mark.parametrize('fmt', ['json', 'csv', 'parquet'])
+def test_export_import_round_trip(fmt):
+    if fmt == 'parquet': pytest.importorskip('pyarrow')
+    game_days, assignments = make_schedule()
+    loaded_days, loaded_assignments = load(fmt, export(fmt, game_days, assignments))
+    assert loaded_days == game_days and loaded_assignments == assignments
+
+
+def test_import_accepts_display_names():
+    game_days, assignments = make_schedule()
+    payload = json.loads(export('json', game_days, assignments))
+    payload['games'][0]['teams'][0][0] = NAME_TO_DISPLAY[payload['games'][0]['teams'][0][0]]
+    assert load('json', json.dumps(payload, ensure_ascii=False).encode('utf-8')) == (game_days, assignments)
+
+
+def test_missing_and_extra_game_are_reported():
+    game_days, assignments = make_schedule()
+    payload = json.loads(export('json', game_days, assignments))
+    for games in (payload['games'][:-1], payload['games'] + payload['games'][:1]):
+        report = validate(*load('json', json.dumps(dict(payload, games=games), ensure_ascii=False).encode('utf-8')))
+        assert '날짜 분배' in violated_rules(report)
+    # CSV 에서 중간 게임 행이 빠지면 빈 슬롯
+    lines = export('csv', game_days, assignments).decode('utf-8-sig').splitlines()
+    kept = [line for line in lines if not line.startswith('3,')]
+    assert '구조' in violated_rules(validate(*load('csv', "\n".join(kept).encode('utf-8'))))
+
+
+def test_extra_team_is_rejected():
+    game_days, assignments = make_schedule()
+    payload = json.loads(export('json', game_days, assignments))
+    payload['games'][0]['teams'].append(payload['games'][0]['teams'][0])
+    with pytest.raises(ValueError, match="팀 3개"):
+        load('json', json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+    lines = export('csv', game_days, assignments).decode('utf-8-sig').splitlines()
+    lines[1] = lines[1].replace(',A,', ',C,', 1)
+    with pytest.raises(ValueError, match="팀은 A~B"):
+        load('csv', "\n".join(lines).encode('utf-8'))
+
+
+def test_assignment_outside_team_count_is_a_structure_violation():
+    game_days, assignments = make_schedule()
+    assignments[(0, num_teams_per_game, 0)] = 0
+    assert violated_rules(validate(game_days, assignments)) == {'구조'}
+
+
+def test_unknown_player_is_rejected():
+    game_days, assignments = make_schedule()
+    payload = json.loads(export('json', game_days, assignments))
+    payload['games'][0]['teams'][0][0] = '없는선수'
+    with pytest.raises(ValueError, match="알 수 없는 선수"):
+        load('json', json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+    lines = export('csv', game_days, assignments).decode('utf-8-sig').splitlines()
+    lines[1] = lines[1].rsplit(',', 1)[0] + ',없는선수'
+    with pytest.raises(ValueError, match="알 수 없는 선수"):
+        load('csv', "\n".join(lines).encode('utf-8'))
+
+
+def test_out_of_range_day_is_a_structure_violation():
+    game_days, assignments = make_schedule()
+    game_days[0] = len(GAMES_PER_DAY)
+    report = validate(game_days, assignments)
+    assert violated_rules(report) == {'구조'} and report.objective is None
+
+
+def test_c2_same_player_twice_in_a_game():
+    game_days, assignments = make_schedule()
+    assignments[(0, 1, 1)] = assignments[(0, 0, 1)]
+    assert 'C2' in violated_rules(validate(game_days, assignments))
+
+
+def test_c3_team_without_tier1():
+    game_days, assignments = make_schedule()
+    t1_slot = next((0, 0, p_idx) for p_idx in range(PLAYERS_PER_TEAM) if ID_TO_NAME[assignments[(0, 0, p_idx)]] in TIER1)
+    pos = positions[t1_slot[2]]
+    substitute = next(p_id for p_id, name in ID_TO_NAME.items()
+                      if name not in TIER1 and PLAYER_POS[name] == pos and p_id not in players_in(assignments, 0))
+    assignments[t1_slot] = substitute
+    assert 'C3' in violated_rules(validate(game_days, assignments))
+
+
+def test_c5_same_position_enemy_minimum():
+    assert 'C5' in violated_rules(validate(*make_schedule(), min_enemy_same_pos=99))
+
+
+def test_c7_banned_player_plays():
+    game_days, assignments = make_schedule()
+    banned = ID_TO_NAME[assignments[(0, 0, 1)]]
+    report = validate(game_days, assignments, bans={game_days[0] + 1: [banned]})
+    assert violated_rules(report) == {'C7'}
+
+
+def test_c8_unequal_non_tier1_play_counts():
+    game_days, assignments = make_schedule()
+    p_idx = next(p for p in range(PLAYERS_PER_TEAM) if ID_TO_NAME[assignments[(0, 0, p)]] not in TIER1)
+    substitute = next(p_id for p_id, name in ID_TO_NAME.items()
+                      if name not in TIER1 and PLAYER_POS[name] == positions[p_idx] and p_id not in players_in(assignments, 0))
+    assignments[(0, 0, p_idx)] = substitute
+    assert 'C8' in violated_rules(validate(game_days, assignments))
+
+
+def test_tier1_head_to_head_count():
+    game_days, assignments = make_schedule()
+    # 두 게임의 A팀을 통째로 바꾸면 두 1티어 맞대결이 다른 쌍으로 바뀜 (쌍마다 정확히 한 번이므로 원래 쌍은 0번)
+    for p_idx in range(PLAYERS_PER_TEAM):
+        assignments[(0, 0, p_idx)], assignments[(1, 0, p_idx)] = assignments[(1, 0, p_idx)], assignments[(0, 0, p_idx)]
+    assert '1티어 맞대결' in violated_rules(validate(game_days, assignments))
+
+
+def test_back_to_back_games_on_the_same_day():
+    game_days, assignments = make_schedule()
+    g = next(g for g in range(len(game_days) - 1) if players_in(assignments, g) & players_in(assignments, g + 1))
+    game_days[g + 1] = game_days[g]
+    assert '연속 출전' in violated_rules(validate(game_days, assignments))